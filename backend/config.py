@@ -4,6 +4,33 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     nas_media_path: str = "/mnt/qq" # 기본 경로
     opensubtitles_api_key: str = ""  # OpenSubtitles API 키 추가
+    media_index_path: str = "media_index.db"  # 미디어 인덱스 SQLite 파일 (상대 경로는 프로젝트 루트 기준)
+    media_index_max_age: int = 600  # 인덱스 결과를 재스캔 없이 사용할 최대 시간(초)
+    media_watch_mode: str = "auto"  # 파일 감시 방식: auto | inotify | polling | off
+    media_watch_poll_interval: int = 60  # polling 모드에서 증분 재스캔 주기(초)
+    scan_workers: int = 8  # 디렉토리를 동시에 읽는 스캔 스레드 수 (NAS 부하 상한, 1이면 순차 스캔)
+    io_workers: int = 16  # API 핸들러의 블로킹 I/O(스캔·인덱스·파일·외부 API)를 실행하는 스레드 수
+    cpu_workers: int = 2  # Whisper/ffmpeg 등 연산 위주 작업을 동시에 실행할 수 있는 수
+    whisper_device: str = "auto"  # Whisper 실행 장치: auto | cpu | cuda
+    whisper_model_cache_mb: int = 4096  # 메모리에 유지할 Whisper 모델 총 크기 상한(MB), 넘으면 오래 안 쓴 모델부터 해제
+    whisper_warmup_models: str = ""  # 서버 시작 시 미리 로드할 모델 (쉼표 구분, 예: "base,tiny")
+    whisper_engine: str = "openai"  # 기본 변환 엔진: openai | faster-whisper (작업별로 선택 가능)
+    faster_whisper_compute_type: str = "int8"  # faster-whisper(CTranslate2) 연산 타입: int8 | int8_float32 | float32 | auto
+    transcription_workers: int = 2  # Whisper 변환 워커 프로세스 수 (0이면 웹 서버 프로세스 안에서 실행)
+    transcription_threads_per_worker: int = 4  # 워커 프로세스마다 사용할 torch 연산 스레드 수
+    long_form_min_duration: int = 1200  # 이 길이(초) 이상인 파일은 VAD 청크 병렬 변환(long-form) 사용
+    long_form_chunk_seconds: int = 240  # long-form 청크 최대 길이(초)
+    audio_cache_dir: str = "audio_cache"  # 추출한 16kHz mono 오디오 캐시 폴더 (로컬 NVMe 권장, 상대 경로는 프로젝트 루트 기준)
+    audio_cache_max_mb: int = 20480  # 오디오 캐시 총 크기 상한(MB), 넘으면 오래 안 쓴 파일부터 삭제 (2시간 영화 약 230MB)
+    job_store_path: str = "jobs.db"  # Whisper 작업 저장소 SQLite 파일 (재시작 후 이어서 실행, 상대 경로는 프로젝트 루트 기준)
+    job_lease_seconds: int = 60  # 실행 중 작업 임대 시간(초). 담당 프로세스가 이 시간 동안 갱신하지 않으면 다른 프로세스가 이어받음
+    job_max_attempts: int = 3  # 서버 중단으로 끊긴 작업을 다시 시도하는 최대 횟수
+    job_max_running_per_client: int = 1  # 클라이언트 하나가 동시에 실행하는 작업 수 상한 (다른 클라이언트가 기다릴 때만 적용, 0이면 제한 없음)
+    job_sjf_aging: float = 1.0  # 짧은 파일 우선 정렬에서 대기 1초마다 길이를 이만큼(초) 짧게 간주 (긴 파일은 자기 길이만큼 기다려야 새 짧은 파일을 앞지름)
+    language_probe_enabled: bool = True  # 언어 자동 감지 시 전체 변환 전에 샘플 몇 구간으로 언어를 먼저 판정
+    language_probe_samples: int = 3  # 언어 사전 감지에 쓰는 샘플 구간 수
+    language_probe_sample_seconds: int = 30  # 샘플 구간 길이(초, Whisper 한 윈도우)
+    language_probe_min_confidence: float = 0.6  # 이 확률 이상이면 사전 감지 결과로 건너뜀/언어 고정, 아니면 전체 변환 후 판정
 
     class Config:
         env_file = '.env'
@@ -0,0 +1,81 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Optional, TypeVar
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 블로킹 작업 실행 풀 (이벤트 루프에서 직접 호출하면 WebSocket 진행률 전송과 다른 요청이 모두 멈춤)
+# - io: NAS 디렉토리 탐색, 인덱스 DB, 자막 파일 읽기/쓰기, 외부 API 호출 등 대기 위주 작업
+# - cpu: Whisper/ffmpeg/NumPy 등 연산 위주 작업. 스레드 풀이지만 torch·NumPy·ffmpeg 자식 프로세스는
+#   GIL을 놓고 실행되므로 코어 수만큼 실제로 병렬 실행되며, 동시 실행 수를 작게 제한해 io 풀이 밀리지 않게 한다.
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _pool_size(kind: str) -> int:
+    return max(1, settings.io_workers if kind == "io" else settings.cpu_workers)
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    """kind('io' | 'cpu')에 해당하는 공유 풀을 반환한다 (처음 호출 시 생성)."""
+    if kind not in ("io", "cpu"):
+        raise ValueError(f"알 수 없는 실행 풀 종류입니다: {kind}")
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=_pool_size(kind), thread_name_prefix=f"{kind}-worker")
+            _executors[kind] = executor
+        return executor
+
+
+async def _run_in(kind: str, func: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    # asyncio.to_thread와 같이 contextvars를 그대로 넘겨 로깅 컨텍스트 등이 유지되도록 함
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(kind), call)
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """대기 위주 블로킹 함수를 io 풀에서 실행하고 결과를 기다린다."""
+    return await _run_in("io", func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args, **kwargs) -> T:
+    """연산 위주 블로킹 함수를 cpu 풀에서 실행하고 결과를 기다린다."""
+    return await _run_in("cpu", func, *args, **kwargs)
+
+
+async def iterate_io(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """동기 이터레이터(제너레이터)를 io 풀에서 한 항목씩 꺼내는 비동기 이터레이터로 감싼다 (StreamingResponse용)."""
+    iterator = iter(iterable)
+    sentinel = object()
+    try:
+        while True:
+            item = await run_io(next, iterator, sentinel)
+            if item is sentinel:
+                break
+            yield item
+    finally:
+        # 클라이언트 연결이 끊겨 중단되면 제너레이터도 닫아 스캔 스레드를 정리
+        close: Optional[Callable[[], None]] = getattr(iterator, "close", None)
+        if close is not None:
+            await run_io(close)
+
+
+def shutdown_executors(wait: bool = True):
+    """서버 종료 시 풀을 정리한다. 이후 호출에서는 새 풀이 생성된다."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    logger.info("[executors] 실행 풀 종료")
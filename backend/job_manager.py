@@ -1,84 +1,444 @@
+import json
+import sqlite3
 import threading
 import uuid
-from typing import Dict, List, Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 import time
 
+from backend.config import settings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# 작업 상태 (UI에 그대로 표시되는 문자열)
+STATUS_QUEUED = '대기'
+STATUS_RUNNING = '진행중'
+STATUS_PAUSED = '일시정지'
+STATUS_COMPLETED = '완료'
+STATUS_SKIPPED = 'skipped'
+STATUS_ERROR = '오류'
+STATUS_CANCELLED = '취소'
+STATUS_STOPPED = '중단됨'
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING, STATUS_PAUSED)
+FINAL_STATUSES = (STATUS_COMPLETED, STATUS_SKIPPED, STATUS_ERROR, STATUS_CANCELLED, STATUS_STOPPED)
+
+# 완료된 작업을 목록에 남겨 두는 시간 (3일)
+COMPLETED_JOB_TTL = 259200
+
+# 작업 저장소 스키마 버전. 작업 목록은 캐시가 아니므로 버전이 바뀌면 버리지 않고 마이그레이션한다.
+SCHEMA_VERSION = 4
+# 이전 버전 저장소에 없을 수 있는 컬럼 (없으면 ALTER TABLE로 추가)
+MIGRATION_COLUMNS = {
+    'priority': "INTEGER NOT NULL DEFAULT 0",  # v2: 높을수록 먼저 실행
+    'duration': "REAL",  # v2: 미디어 길이(초), 짧은 파일 우선 정렬에 사용 (모르면 NULL)
+    'checkpoint': "TEXT",  # v3: 일시정지한 위치까지의 변환 결과 (JSON), 재개하면 여기서부터 이어서 변환
+    'stopping': "INTEGER NOT NULL DEFAULT 0",  # v4: 실행 중에 일시정지했지만 담당 프로세스의 워커가 아직 멈추지 않음
+}
+
+# update_job으로 바꿀 수 있는 컬럼
+UPDATABLE_COLUMNS = {'filename', 'language', 'model', 'engine', 'status', 'progress', 'log', 'client_id', 'file_path', 'completed_at', 'priority', 'duration'}
+
+
+def _resolve_db_path(db_path: str) -> Path:
+    """상대 경로는 프로젝트 루트 기준으로 해석한다."""
+    path = Path(db_path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def select_next_job(candidates: List[dict], clients: Dict[Any, dict], now: float, max_running_per_client: int = 0,
+                    sjf_aging: float = 0.0) -> Optional[dict]:
+    """
+    대기 작업 중 다음에 실행할 작업을 고른다.
+    candidates: [{'id', 'client_id', 'priority', 'duration', 'created_at'}]
+    clients: client_id -> {'running': 실행 중 작업 수, 'last_started': 마지막으로 작업을 시작한 시각}
+    1. 우선순위(priority)가 높은 작업 먼저
+    2. 같은 우선순위에서는 클라이언트 간 라운드로빈: 실행 중인 작업이 적고, 가장 오래전에 작업을 시작한 클라이언트
+    3. 클라이언트 안에서는 짧은 파일 먼저 (기다린 시간 × sjf_aging만큼 짧게 간주해 긴 파일도 결국 실행, 길이 모름은 마지막)
+    동시 실행 상한(max_running_per_client)에 걸린 클라이언트는 다른 클라이언트의 대기 작업이 없을 때만 고른다 (워커를 놀리지 않음).
+    """
+    if not candidates:
+        return None
+
+    def stats(client_id) -> dict:
+        return clients.get(client_id) or {}
+
+    eligible = candidates
+    if max_running_per_client > 0:
+        eligible = [job for job in candidates if stats(job['client_id']).get('running', 0) < max_running_per_client] or candidates
+    top_priority = max(job['priority'] for job in eligible)
+    eligible = [job for job in eligible if job['priority'] == top_priority]
+
+    first_created: Dict[Any, float] = {}
+    for job in eligible:
+        first_created[job['client_id']] = min(first_created.get(job['client_id'], job['created_at']), job['created_at'])
+    client_id = min(first_created, key=lambda client: (
+        stats(client).get('running', 0), stats(client).get('last_started') or 0.0, first_created[client]))
+
+    def job_key(job: dict):
+        if job['duration'] is None:
+            return (1, 0.0, job['created_at'])
+        return (0, job['duration'] - (now - job['created_at']) * sjf_aging, job['created_at'])
+
+    return min((job for job in eligible if job['client_id'] == client_id), key=job_key)
+
+
 class JobManager:
-    def __init__(self):
-        self.jobs: Dict[str, dict] = {}
+    """
+    Whisper 작업 저장소 (SQLite, WAL). 서버가 재시작(--reload, 비정상 종료)돼도 대기/실행 중이던 작업이 남는다.
+    실행 중인 작업은 담당 프로세스(lease_owner)가 lease_expires까지 임대하고 주기적으로 연장(heartbeat)한다.
+    임대가 만료된 작업은 다른(또는 재시작한) 프로세스가 가져가 다시 실행한다 (adopt_expired).
+    """
+
+    def __init__(self, db_path: str, lease_seconds: int = 60, max_attempts: int = 3, max_running_per_client: int = 0,
+                 sjf_aging: float = 0.0):
+        self.db_path = _resolve_db_path(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.max_running_per_client = max_running_per_client
+        self.sjf_aging = sjf_aging
         self.lock = threading.Lock()
-        self.jobid_to_clientid: Dict[str, str] = {}
-        self.jobid_to_filepath: Dict[str, str] = {}
+        # isolation_level=None: 트랜잭션을 직접 BEGIN IMMEDIATE로 열어 여러 프로세스 사이에서도 작업을 한 번만 가져가게 함
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self.lock:
+            self.conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    batch_id TEXT,
+                    client_id TEXT,
+                    filename TEXT NOT NULL,
+                    file_path TEXT,
+                    language TEXT,
+                    model TEXT,
+                    engine TEXT,
+                    options TEXT NOT NULL DEFAULT '{{}}',
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    duration REAL,
+                    checkpoint TEXT,
+                    stopping INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    log TEXT NOT NULL DEFAULT '',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL NOT NULL DEFAULT 0,
+                    heartbeat_at REAL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    completed_at REAL,
+                    result TEXT
+                );
+            """)
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            for column, definition in MIGRATION_COLUMNS.items():
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            self.conn.executescript(f"""
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs(lease_owner, status);
+                CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id);
+                CREATE INDEX IF NOT EXISTS idx_jobs_client ON jobs(client_id, status);
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job['options'] = json.loads(job['options'] or '{}')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['checkpoint'] = json.loads(job['checkpoint']) if job['checkpoint'] else None
+        return job
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE 트랜잭션 (쓰기 잠금을 먼저 잡아 조회-갱신 사이에 다른 프로세스가 끼어들지 못하게 함)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
 
-    def add_job(self, filename: str, language: str, model: str, client_id: str = None, file_path: str = None) -> str:
+    # --- 기존 API (작업 목록/상태) --- #
+
+    def add_job(self, filename: str, language: str, model: str, client_id: str = None, file_path: str = None, engine: str = None,
+                batch_id: str = None, options: Optional[Dict[str, Any]] = None, owner: str = None, priority: int = 0,
+                duration: Optional[float] = None) -> str:
+        """작업을 대기 상태로 등록한다. owner를 주면 그 프로세스가 임대한 상태로 등록 (다른 프로세스가 가져가지 않음)."""
         job_id = str(uuid.uuid4())
+        now = time.time()
         with self.lock:
-            self.jobs[job_id] = {
-                'id': job_id,
-                'filename': filename,
-                'language': language,
-                'model': model,
-                'progress': 0,
-                'status': '대기',
-                'log': '',
-                'client_id': client_id,
-                'file_path': file_path,
-                'completed_at': None
-            }
-            if client_id:
-                self.jobid_to_clientid[job_id] = client_id
-            if file_path:
-                self.jobid_to_filepath[job_id] = file_path
+            self.conn.execute(
+                "INSERT INTO jobs (id, batch_id, client_id, filename, file_path, language, model, engine, options, priority, duration,"
+                " status, lease_owner, lease_expires, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, batch_id, client_id, filename, file_path, language, model, engine,
+                 json.dumps(options or {}, ensure_ascii=False), priority, duration, STATUS_QUEUED,
+                 owner, now + self.lease_seconds if owner else 0, now),
+            )
         return job_id
 
     def get_jobs(self) -> List[dict]:
-        now = time.time()
-        expired = []
         with self.lock:
-            for job_id, job in list(self.jobs.items()):
-                if job.get('completed_at') and now - job['completed_at'] > 259200:
-                    expired.append(job_id)
             # 3일 경과된 job 자동 삭제
-            for job_id in expired:
-                del self.jobs[job_id]
-        with self.lock:
-            return list(self.jobs.values())
+            self.conn.execute("DELETE FROM jobs WHERE completed_at IS NOT NULL AND completed_at < ?", (time.time() - COMPLETED_JOB_TTL,))
+            return [self._row_to_job(row) for row in self.conn.execute("SELECT * FROM jobs ORDER BY created_at, rowid")]
 
     def get_job(self, job_id: str) -> Optional[dict]:
         with self.lock:
-            return self.jobs.get(job_id)
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
 
     def update_job(self, job_id: str, **kwargs):
+        columns = [key for key in kwargs if key in UPDATABLE_COLUMNS]
+        if not columns:
+            return
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id].update(kwargs)
+            self.conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{key} = ?' for key in columns)} WHERE id = ?",
+                [kwargs[key] for key in columns] + [job_id],
+            )
 
     def delete_job(self, job_id: str):
         with self.lock:
-            if job_id in self.jobs:
-                del self.jobs[job_id]
+            self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
 
     def set_status(self, job_id: str, status: str):
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]['status'] = status
-                if status in ['완료', 'skipped', '오류', '취소', '중단됨']:
-                    self.jobs[job_id]['completed_at'] = time.time()
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, completed_at = CASE WHEN ? THEN ? ELSE completed_at END WHERE id = ?",
+                (status, status in FINAL_STATUSES, time.time(), job_id),
+            )
 
     def set_progress(self, job_id: str, progress: int):
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]['progress'] = progress
+            self.conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (progress, job_id))
 
     def append_log(self, job_id: str, log_line: str):
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]['log'] += log_line + '\n'
+            self.conn.execute("UPDATE jobs SET log = log || ? WHERE id = ?", (log_line + '\n', job_id))
 
     def get_client_id(self, job_id: str) -> str:
-        return self.jobid_to_clientid.get(job_id)
+        job = self.get_job(job_id)
+        return job['client_id'] if job else None
 
     def get_file_path(self, job_id: str) -> str:
-        return self.jobid_to_filepath.get(job_id)
+        job = self.get_job(job_id)
+        return job['file_path'] if job else None
+
+    # --- 임대(lease) 기반 실행 --- #
+
+    def claim_next(self, owner: str) -> Optional[dict]:
+        """
+        owner가 임대한 대기 작업 중 스케줄 정책(select_next_job)으로 고른 작업을 실행 상태로 바꾸고 반환한다 (시도 횟수 +1).
+        클라이언트별 실행 중 작업 수는 모든 프로세스의 작업을 합쳐 센다.
+        """
+        now = time.time()
+        with self.lock, self._transaction() as conn:
+            candidates = [dict(row) for row in conn.execute(
+                "SELECT id, client_id, priority, duration, created_at FROM jobs WHERE status = ? AND lease_owner = ?",
+                (STATUS_QUEUED, owner),
+            )]
+            if not candidates:
+                return None
+            client_ids = list({job['client_id'] for job in candidates if job['client_id'] is not None})
+            clients = {row['client_id']: {'running': row['running'], 'last_started': row['last_started']} for row in conn.execute(
+                f"SELECT client_id, SUM(status = ?) AS running, MAX(started_at) AS last_started FROM jobs"
+                f" WHERE client_id IN ({','.join('?' * len(client_ids))}) GROUP BY client_id",
+                (STATUS_RUNNING, *client_ids),
+            )}
+            job = select_next_job(candidates, clients, now, self.max_running_per_client, self.sjf_aging)
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ?, lease_expires = ? WHERE id = ?",
+                (STATUS_RUNNING, now, now, now + self.lease_seconds, job['id']),
+            )
+            return self._row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job['id'],)).fetchone())
+
+    def heartbeat(self, owner: str) -> int:
+        """owner가 임대한 진행 중(대기/실행/일시정지) 작업의 임대를 연장한다. 연장한 작업 수를 반환."""
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ?, lease_expires = ? WHERE lease_owner = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                (now, now + self.lease_seconds, owner, *ACTIVE_STATUSES),
+            )
+            return cursor.rowcount
+
+    def adopt_expired(self, owner: str) -> List[dict]:
+        """
+        임대가 만료된 진행 중 작업(담당 프로세스가 죽었거나 재시작됨)을 owner가 가져온다.
+        실행 중이던 작업은 대기로 되돌려 다시 실행하되, 이미 max_attempts번 시도했으면 오류로 끝낸다
+        (특정 파일이 매번 프로세스를 죽이는 경우 무한 반복 방지). 가져온 작업 목록을 반환.
+        """
+        now = time.time()
+        adopted = []
+        with self.lock, self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs WHERE lease_expires < ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))}) ORDER BY created_at, rowid",
+                (now, *ACTIVE_STATUSES),
+            ).fetchall()
+            for row in rows:
+                if row['status'] == STATUS_RUNNING and row['attempts'] >= self.max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, completed_at = ?, lease_owner = NULL, result = ? WHERE id = ?",
+                        (STATUS_ERROR, now, json.dumps({"status": "error", "message": f"재시도 횟수 초과 ({row['attempts']}회 중단됨)"}, ensure_ascii=False), row['id']),
+                    )
+                    continue
+                status = STATUS_QUEUED if row['status'] == STATUS_RUNNING else row['status']
+                conn.execute(
+                    "UPDATE jobs SET status = ?, stopping = 0, lease_owner = ?, lease_expires = ?, heartbeat_at = ? WHERE id = ?",
+                    (status, owner, now + self.lease_seconds, now, row['id']),
+                )
+                adopted.append(self._row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()))
+        return adopted
+
+    def finish(self, job_id: str, owner: str, status: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        owner가 실행한 작업을 끝낸다. 그 사이 사용자가 중단/삭제/일시정지했거나 임대를 잃었으면(다른 프로세스가 가져감)
+        무시하고 False (일시정지한 작업을 완료로 덮어쓰지 않음).
+        """
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, progress = CASE WHEN ? THEN 100 ELSE progress END, completed_at = ?,"
+                " lease_owner = NULL, result = ?, checkpoint = NULL WHERE id = ? AND lease_owner = ? AND status = ?",
+                (status, status in (STATUS_COMPLETED, STATUS_SKIPPED), time.time(),
+                 json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                 job_id, owner, STATUS_RUNNING),
+            )
+            return cursor.rowcount > 0
+
+    def pause_job(self, job_id: str) -> Optional[str]:
+        """
+        대기/실행 중인 작업을 일시정지 상태로 바꾸고 이전 상태를 반환한다 (바꿀 수 없으면 None).
+        실행 중이던 작업은 담당 프로세스가 (다른 프로세스에서 요청했으면 다음 임대 연장 때 paused_jobs로 확인하고)
+        워커를 멈추고 suspend로 체크포인트를 저장한다. 그때까지는 stopping으로 표시해 재개를 받지 않는다.
+        """
+        with self.lock, self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row['status'] not in (STATUS_QUEUED, STATUS_RUNNING):
+                return None
+            conn.execute("UPDATE jobs SET status = ?, stopping = ? WHERE id = ?", (STATUS_PAUSED, row['status'] == STATUS_RUNNING, job_id))
+            return row['status']
+
+    def suspend(self, job_id: str, owner: str, checkpoint: Optional[Dict[str, Any]]) -> bool:
+        """
+        owner가 실행하다 멈춘 작업을 일시정지 상태로 두고 체크포인트를 저장한다 (이제 재개할 수 있음).
+        일시정지는 실패가 아니므로 이번 시도는 횟수에서 뺀다.
+        """
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, stopping = 0, checkpoint = ?, attempts = MAX(attempts - 1, 0)"
+                " WHERE id = ? AND lease_owner = ? AND status IN (?, ?)",
+                (STATUS_PAUSED, json.dumps(checkpoint, ensure_ascii=False, default=str) if checkpoint else None,
+                 job_id, owner, STATUS_RUNNING, STATUS_PAUSED),
+            )
+            return cursor.rowcount > 0
+
+    def resume_job(self, job_id: str) -> bool:
+        """
+        일시정지한 작업을 다시 대기 상태로 (체크포인트가 있으면 다음 실행은 거기서부터 이어서).
+        담당 프로세스의 워커가 아직 멈추지 않은 작업(stopping, 임대 유효)은 재개하지 않고 False:
+        대기로 돌리면 실행 중인 변환의 완료 기록이 무시되고 처음부터 다시 실행되기 때문.
+        """
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ? WHERE id = ? AND status = ? AND NOT (stopping AND lease_expires >= ?)",
+                (STATUS_QUEUED, job_id, STATUS_PAUSED, time.time()),
+            )
+            return cursor.rowcount > 0
+
+    def release(self, owner: str) -> int:
+        """
+        정상 종료 시 owner의 임대를 즉시 반납한다. 실행 중이던 작업은 대기로 되돌리고 이번 시도는 횟수에서 뺀다
+        (재시작 후 바로 다시 실행됨). 반납한 작업 수를 반환.
+        """
+        with self.lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0) WHERE lease_owner = ? AND status = ?",
+                (STATUS_QUEUED, owner, STATUS_RUNNING),
+            )
+            released = cursor.rowcount
+            cursor = conn.execute(
+                f"UPDATE jobs SET lease_owner = NULL, lease_expires = 0 WHERE lease_owner = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                (owner, *ACTIVE_STATUSES),
+            )
+            return max(released, cursor.rowcount)
+
+    def cancel_queued(self, client_id: str) -> List[str]:
+        """클라이언트의 아직 시작하지 않은 작업을 취소 상태로 바꾸고 id 목록을 반환한다."""
+        with self.lock, self._transaction() as conn:
+            ids = [row['id'] for row in conn.execute(
+                "SELECT id FROM jobs WHERE client_id = ? AND status = ?", (client_id, STATUS_QUEUED))]
+            conn.executemany(
+                "UPDATE jobs SET status = ?, completed_at = ?, lease_owner = NULL WHERE id = ?",
+                [(STATUS_CANCELLED, time.time(), job_id) for job_id in ids],
+            )
+        return ids
+
+    def cancel_job(self, job_id: str, status: str = STATUS_CANCELLED) -> Optional[str]:
+        """
+        작업 하나를 취소(또는 중단) 상태로 바꾸고 이전 상태를 반환한다 (이미 끝났거나 없는 작업이면 None).
+        실행 중이던 작업은 담당 프로세스가 lost_jobs로 확인하고 워커에서 내린다. 체크포인트는 버린다.
+        """
+        with self.lock, self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row['status'] not in ACTIVE_STATUSES:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, completed_at = ?, lease_owner = NULL, lease_expires = 0, checkpoint = NULL WHERE id = ?",
+                (status, time.time(), job_id),
+            )
+            return row['status']
+
+    def lost_jobs(self, owner: str, job_ids: List[str]) -> List[str]:
+        """
+        owner가 실행 중인 작업 중 더 이상 owner가 실행할 작업이 아닌 것의 id 목록
+        (다른 프로세스에서 취소/삭제되었거나, 임대가 만료돼 다른 프로세스가 이어받음).
+        """
+        if not job_ids:
+            return []
+        with self.lock:
+            owned = {row['id'] for row in self.conn.execute(
+                f"SELECT id FROM jobs WHERE id IN ({','.join('?' * len(job_ids))}) AND lease_owner = ? AND status IN (?, ?)",
+                (*job_ids, owner, STATUS_RUNNING, STATUS_PAUSED),
+            )}
+        return [job_id for job_id in job_ids if job_id not in owned]
+
+    def paused_jobs(self, owner: str, job_ids: List[str]) -> List[str]:
+        """owner가 실행 중인 작업 중 저장소에서 일시정지된 것의 id 목록 (다른 프로세스에서 일시정지를 요청함)."""
+        if not job_ids:
+            return []
+        with self.lock:
+            return [row['id'] for row in self.conn.execute(
+                f"SELECT id FROM jobs WHERE id IN ({','.join('?' * len(job_ids))}) AND lease_owner = ? AND status = ?",
+                (*job_ids, owner, STATUS_PAUSED),
+            )]
+
+    def has_active_jobs(self, client_id: str) -> bool:
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT 1 FROM jobs WHERE client_id = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))}) LIMIT 1",
+                (client_id, *ACTIVE_STATUSES),
+            ).fetchone()
+        return row is not None
+
+    def batch_summary(self, batch_id: str) -> Dict[str, int]:
+        """배치의 상태별 작업 수"""
+        with self.lock:
+            return {row['status']: row['count'] for row in self.conn.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs WHERE batch_id = ? GROUP BY status", (batch_id,))}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
 
-job_manager = JobManager() 
\ No newline at end of file
+job_manager = JobManager(settings.job_store_path, settings.job_lease_seconds, settings.job_max_attempts,
+                         settings.job_max_running_per_client, settings.job_sjf_aging)
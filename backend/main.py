@@ -2,7 +2,7 @@ import os
 import sys
 import uuid # client_id 생성을 위해 추가
 from fastapi import FastAPI, Request, BackgroundTasks, WebSocket, WebSocketDisconnect, HTTPException, Query, Body, APIRouter
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse # JSONResponse 추가
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse # JSONResponse 추가
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import logging
@@ -16,12 +16,20 @@ import shutil
 from backend.services.file_scanner import extract_embedded_subtitles, convert_and_save_subtitle
 from backend.services.subtitle_downloader import download_subtitle_from_opensubtitles, download_and_save_subtitle, search_and_download_subtitle, load_download_stats, get_cache_key, check_subtitle_cache, MAX_DAILY_DOWNLOADS, OPENSUBTITLES_DEV_MODE, fallback_search_subtitle
 from backend.services.sync_checker import check_subtitle_sync, advanced_sync_and_save
+from backend.services.sync_batch import sync_batch_runner, find_sync_pairs
 from fastapi import status
 from backend.config import settings
 from backend.connection_manager import ConnectionManager
-from backend.job_manager import job_manager
-from backend.services.file_scanner import scan_media_files, list_subdirectories, VIDEO_EXTENSIONS, AUDIO_EXTENSIONS, list_subdirectories_with_media_counts
-from backend.services.whisper_runner import run_whisper_batch
+from backend.job_manager import job_manager, STATUS_STOPPED
+from backend.services.file_scanner import scan_media_files, list_subdirectories, VIDEO_EXTENSIONS, AUDIO_EXTENSIONS, list_subdirectories_with_media_counts, folder_count_cache
+from backend.services.job_dispatcher import job_dispatcher
+from backend.services.media_index import media_index, MAX_PAGE_SIZE
+from backend.services.media_watcher import media_watcher
+from backend.executors import run_io, run_cpu, iterate_io, shutdown_executors
+from backend.services.model_registry import whisper_models
+from backend.services.transcription_pool import transcription_pool
+from backend.services.whisper_engines import get_engine, list_engines
+from backend.services.audio_cache import audio_cache
 
 # 현재 디렉토리를 가져와서 import 경로 설정
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -60,6 +68,47 @@ if not NAS_BASE_PATH.is_dir():
 # WebSocket 연결 관리자
 manager = ConnectionManager()
 
+@app.on_event("startup")
+async def start_media_watcher():
+    """NAS 미디어 폴더 감시 시작 (생성/삭제/이름 변경을 미디어 인덱스와 폴더 개수 캐시에 실시간 반영)"""
+    # 감시 이벤트를 놓친 경우에 대비한 폴더 개수 캐시 유효 시간
+    folder_count_cache.max_age = settings.media_index_max_age
+    media_watcher.start()
+
+@app.on_event("startup")
+async def warm_up_whisper_models():
+    """변환 워커를 미리 띄워 설정된 Whisper 모델을 로드 (첫 작업의 모델 로드 대기 제거)"""
+    names = [name.strip() for name in settings.whisper_warmup_models.split(",") if name.strip()]
+    if not names:
+        return
+    if transcription_pool.in_process:
+        asyncio.create_task(run_cpu(whisper_models.warm_up, names))
+    else:
+        await run_io(transcription_pool.start)
+
+@app.on_event("startup")
+async def start_job_dispatcher():
+    """작업 저장소의 대기 작업 실행 시작 (이전 실행에서 남은 작업은 임대가 만료되면 이어받음)"""
+    await job_dispatcher.start(manager)
+
+@app.on_event("shutdown")
+async def stop_job_dispatcher():
+    """실행 중인 작업을 대기로 되돌리고 임대 반납 (변환 워커 정지 전)"""
+    await job_dispatcher.stop()
+
+@app.on_event("shutdown")
+async def stop_transcription_pool():
+    await run_io(transcription_pool.stop)
+
+@app.on_event("shutdown")
+async def stop_media_watcher():
+    await run_io(media_watcher.stop)
+
+@app.on_event("shutdown")
+async def stop_executors():
+    """블로킹 작업 실행 풀 정리 (media_watcher 정지 후)"""
+    shutdown_executors(wait=False)
+
 def is_safe_path(requested_path: Path) -> bool:
     """ 요청된 경로가 NAS_BASE_PATH 내에 있는지 확인 """
     try:
@@ -116,8 +165,28 @@ async def read_root(request: Request,
 @app.get("/api/files", response_class=JSONResponse)
 async def get_files_in_path(scan_path: Optional[str] = Query(""),
                              filter_video: bool = Query(True),
-                             filter_audio: bool = Query(True)):
-    """지정된 상대 경로의 자막 없는 미디어 파일 목록을 JSON으로 반환합니다."""
+                             filter_audio: bool = Query(True),
+                             refresh: bool = Query(False),
+                             limit: Optional[int] = Query(None, ge=1, le=1000),
+                             cursor: Optional[str] = Query(None),
+                             sort: str = Query("path"),
+                             order: str = Query("asc"),
+                             kind: Optional[str] = Query(None, alias="type"),
+                             has_subtitle: Optional[bool] = Query(None),
+                             subtitle_lang: Optional[str] = Query(None),
+                             q: Optional[str] = Query(None),
+                             min_size: Optional[int] = Query(None, ge=0),
+                             max_size: Optional[int] = Query(None, ge=0),
+                             modified_after: Optional[float] = Query(None),
+                             modified_before: Optional[float] = Query(None)):
+    """
+    지정된 상대 경로의 미디어 파일 목록을 JSON으로 반환합니다. (미디어 인덱스 기반, refresh=true면 재스캔)
+    limit을 주면 커서 기반 페이지 응답({'files', 'next_cursor', 'total'})을 반환하고,
+    다음 페이지는 이전 응답의 next_cursor를 cursor로 넘겨 요청합니다. (total은 첫 페이지에만 포함)
+    필터: type(video|audio, 매개변수 이름은 kind), has_subtitle, subtitle_lang, q(파일명 부분 일치), min_size/max_size(바이트), modified_after/modified_before(epoch 초)
+    정렬: sort(path|name|size|mtime), order(asc|desc)
+    커서는 발급된 경로/정렬/필터에서만 유효하며, 조건을 바꿔 이어서 요청하면 400을 반환합니다.
+    """
     current_scan_path = NAS_BASE_PATH
     if scan_path:
         resolved_path = (NAS_BASE_PATH / scan_path).resolve()
@@ -128,11 +197,29 @@ async def get_files_in_path(scan_path: Optional[str] = Query(""),
             # 안전하지 않거나 없는 경로면 빈 목록 반환 또는 오류
             return {"files": [], "error": "Invalid or unsafe path"}
 
-    logger.info(f"API 파일 목록 요청: {current_scan_path} (Video: {filter_video}, Audio: {filter_audio})")
+    if kind is not None and kind not in ("video", "audio"):
+        raise HTTPException(status_code=400, detail=f"type은 video 또는 audio여야 합니다: {kind}")
+    types = [kind] if kind else [t for t, enabled in (("video", filter_video), ("audio", filter_audio)) if enabled]
+
+    logger.info(f"API 파일 목록 요청: {current_scan_path} (Video: {filter_video}, Audio: {filter_audio}, limit: {limit}, sort: {sort} {order})")
     try:
-        media_files_data = scan_media_files(str(current_scan_path), filter_video, filter_audio)
-        # scan_media_files가 이미 필요한 {'name': ..., 'path': ..., 'type': ...} 형식으로 반환한다고 가정
-        return {"files": media_files_data}
+        await run_io(media_index.ensure_fresh, str(current_scan_path), refresh=refresh)
+        query = dict(sort=sort, order=order, types=types, has_subtitle=has_subtitle, subtitle_lang=subtitle_lang,
+                     name_contains=q, min_size=min_size, max_size=max_size,
+                     modified_after=modified_after, modified_before=modified_before)
+        if limit is not None:
+            return await run_io(media_index.query_page, str(current_scan_path), limit=limit, cursor=cursor, **query)
+        # limit이 없으면 기존처럼 전체 목록을 반환 (페이지를 끝까지 이어 붙임)
+        files, cursor = [], None
+        while True:
+            page = await run_io(media_index.query_page, str(current_scan_path), limit=MAX_PAGE_SIZE, cursor=cursor, **query)
+            files.extend(page["files"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        return {"files": files}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"API 파일 목록 검색 중 오류 ({scan_path}): {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"파일 목록 검색 중 오류 발생: {e}")
@@ -161,7 +248,7 @@ async def browse_directories(request: Request, current_path: Optional[str] = Que
     logger.info(f"[/browse] 실제 탐색 경로: {base_lookup_path}")
 
     # 디렉토리 목록 + 미디어 개수 가져오기
-    subdirs_info = list_subdirectories_with_media_counts(str(base_lookup_path))
+    subdirs_info = await run_io(list_subdirectories_with_media_counts, str(base_lookup_path))
     logger.info(f"[/browse] list_subdirectories_with_media_counts 결과: {subdirs_info}")
 
     # 부모 경로 계산
@@ -194,7 +281,9 @@ async def browse_directories(request: Request, current_path: Optional[str] = Que
                 "name": info['name'],
                 "path": rel_path,
                 "video_count": info['video_count'],
-                "audio_count": info['audio_count']
+                "audio_count": info['audio_count'],
+                "with_subtitle_count": info['with_subtitle_count'],
+                "without_subtitle_count": info['without_subtitle_count']
             })
         except ValueError:
             logger.warning(f"상대 경로 계산 실패: {dir_path}는 NAS_BASE_PATH와 관계가 없습니다")
@@ -215,31 +304,27 @@ async def run_whisper_endpoint(request: Request, background_tasks: BackgroundTas
     client_id = data.get('client_id')
     model_size = data.get('model_size', 'base') # 모델 크기 받기 (기본값 'base')
     language = data.get('language', 'auto')
+    engine = data.get('engine') or settings.whisper_engine  # openai | faster-whisper
+    long_form = data.get('long_form', 'auto')  # true | false | "auto" (길이 기준 자동)
+    priority = data.get('priority') or 0  # 높을수록 먼저 실행 (같은 우선순위는 클라이언트 간 번갈아, 짧은 파일 먼저)
 
     if not files_to_process or not client_id:
         logger.warning(f"Whisper 실행 요청 오류: 파일 목록 또는 클라이언트 ID 누락 (Client: {client_id})")
         raise HTTPException(status_code=400, detail="파일 목록과 클라이언트 ID가 필요합니다.")
 
-    # 이미 해당 클라이언트 ID로 실행 중인 작업이 있는지 확인
-    if manager.is_task_active(client_id):
-        logger.warning(f"이미 실행 중인 작업이 있습니다 (Client: {client_id})")
-        raise HTTPException(status_code=409, detail="이미 처리 중인 작업이 있습니다. 이전 작업을 완료하거나 중지해주세요.")
-
-    logger.info(f"Whisper 실행 요청 받음 (Client: {client_id}): {len(files_to_process)}개 파일, 모델: {model_size}, 언어: {language}")
+    try:
+        get_engine(engine)
+        priority = int(priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Whisper 작업 등록 (job_manager)
-    for file_path in files_to_process:
-        filename = os.path.basename(file_path)
-        job_manager.add_job(filename, language, model_size, client_id=client_id, file_path=file_path)
+    logger.info(f"Whisper 실행 요청 받음 (Client: {client_id}): {len(files_to_process)}개 파일, 모델: {model_size}, 엔진: {engine}, 언어: {language}")
 
-    # 백그라운드 작업 정의
-    async def batch_task():
-        await run_whisper_batch(manager, client_id, files_to_process, model_size, language)
-    task = asyncio.create_task(batch_task())
-    manager.add_task(client_id, task)
+    # Whisper 작업 등록 (작업 저장소에 기록 후 디스패처가 스케줄 순서대로 실행, 같은 클라이언트의 여러 배치도 함께 대기)
+    batch = await job_dispatcher.submit(client_id, files_to_process, model_size, language, engine, long_form, priority)
 
     # 응답 즉시 반환
-    return {"message": f"{len(files_to_process)}개 파일에 대한 처리 작업을 시작했습니다.", "client_id": client_id}
+    return {"message": f"{len(files_to_process)}개 파일에 대한 처리 작업을 시작했습니다.", "client_id": client_id, "batch_id": batch["batch_id"]}
 
 @app.get("/download")
 async def download_file(file_path: str):
@@ -287,7 +372,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                 message = json.loads(data)
                 if message.get("type") == "stop_processing":
                     logger.info(f"Whisper 작업 중지 요청 수신 (Client: {client_id})")
-                    await manager.cancel_task(client_id)
+                    await job_dispatcher.cancel_client(client_id)
                     await websocket.send_text(json.dumps({"type": "stop_acknowledged"}))
                 # 다른 메시지 유형 처리 (필요한 경우)
                 # else:
@@ -299,8 +384,6 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket 연결 끊김: {client_id}")
-        # 연결이 끊겼을 때 관련 작업 취소 시도 (선택 사항)
-        # await manager.cancel_task(client_id)
     except Exception as e:
         logger.error(f"WebSocket 오류 발생 (Client: {client_id}): {e}", exc_info=True)
     finally:
@@ -313,34 +396,49 @@ def get_all_jobs():
     """현재 등록된 모든 Whisper 작업 목록을 반환합니다."""
     return {"jobs": job_manager.get_jobs()}
 
+@app.get("/api/whisper/models")
+def get_whisper_models():
+    """메모리에 캐시된 Whisper 모델 목록과 사용량(예산, 로드/재사용/해제 횟수)을 반환합니다."""
+    return whisper_models.stats()
+
+@app.get("/api/whisper/engines")
+def get_whisper_engines():
+    """선택 가능한 변환 엔진 목록 (설치 여부, 기본 엔진 표시)"""
+    return {"engines": list_engines()}
+
+@app.get("/api/audio-cache")
+async def audio_cache_stats():
+    """추출된 오디오 캐시 상태 (파일 수, 용량, 적중/추출/삭제 횟수)"""
+    return await run_io(audio_cache.stats)
+
+@app.get("/api/whisper/workers")
+def get_whisper_workers():
+    """변환 워커 프로세스 상태(실행 중인 파일)와 대기 중인 작업 수를 반환합니다."""
+    return transcription_pool.stats()
+
 @app.post("/api/job/{job_id}/action")
-def job_action(job_id: str, action: str = Body(..., embed=True)):
-    """특정 작업에 대해 일시정지/중단/재개/삭제 명령을 처리합니다."""
-    job = job_manager.get_job(job_id)
+async def job_action(job_id: str, action: str = Body(..., embed=True)):
+    """특정 작업에 대해 일시정지/중단/재개/삭제 명령을 처리합니다. (작업 저장소 SQLite 호출은 I/O 스레드에서)"""
+    job = await run_io(job_manager.get_job, job_id)
     if not job:
         return {"error": "Job not found"}
-    client_id = job_manager.get_client_id(job_id)
     if action == "pause":
-        job_manager.set_status(job_id, "일시정지")
+        # 실행 중이면 워커가 윈도우 경계에서 체크포인트를 남기고 멈춤 (CPU 반환)
+        await job_dispatcher.pause(job_id)
     elif action == "stop":
-        job_manager.set_status(job_id, "중단됨")
-        job_manager.set_progress(job_id, 0)
-        # 실제 실행 중인 작업도 중단
-        if client_id:
-            loop = asyncio.get_event_loop()
-            loop.create_task(manager.cancel_task(client_id))
+        # 이 작업만 중단 (같은 배치의 다른 파일은 계속 변환). 실행 중이면 워커가 다음 윈도우 경계에서 멈춤
+        await job_dispatcher.cancel(job_id, STATUS_STOPPED)
+        await run_io(job_manager.set_progress, job_id, 0)
     elif action == "resume":
-        job_manager.set_status(job_id, "진행중")
+        # 체크포인트가 있으면 멈춘 위치부터 이어서 변환
+        await job_dispatcher.resume(job_id)
     elif action == "delete":
-        job_manager.delete_job(job_id)
-        # 실제 실행 중인 작업도 중단
-        if client_id:
-            loop = asyncio.get_event_loop()
-            loop.create_task(manager.cancel_task(client_id))
+        await job_dispatcher.cancel(job_id)
+        await run_io(job_manager.delete_job, job_id)
         return {"result": "deleted"}
     else:
         return {"error": "Unknown action"}
-    return {"result": "ok", "job": job_manager.get_job(job_id)}
+    return {"result": "ok", "job": await run_io(job_manager.get_job, job_id)}
 
 @app.post("/api/extract_subtitles")
 async def api_extract_subtitles(request: Request):
@@ -349,7 +447,7 @@ async def api_extract_subtitles(request: Request):
     if not media_path:
         raise HTTPException(status_code=400, detail="media_path 파라미터가 필요합니다.")
     try:
-        result = extract_embedded_subtitles(media_path)
+        result = await run_cpu(extract_embedded_subtitles, media_path)
         return JSONResponse(content={"tracks": result})
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
@@ -363,7 +461,7 @@ async def api_convert_subtitle(request: Request):
     if not input_path or not output_path:
         raise HTTPException(status_code=400, detail="input_path, output_path 파라미터가 필요합니다.")
     try:
-        result = convert_and_save_subtitle(input_path, output_path, target_format)
+        result = await run_cpu(convert_and_save_subtitle, input_path, output_path, target_format)
         return JSONResponse(content=result)
     except Exception as e:
         return JSONResponse(content={"success": False, "error": str(e)}, status_code=500)
@@ -376,11 +474,61 @@ async def api_download_subtitle(request: Request):
     if not filename:
         raise HTTPException(status_code=400, detail="filename 파라미터가 필요합니다.")
     try:
-        result = download_subtitle_from_opensubtitles(filename, language)
+        result = await run_io(download_subtitle_from_opensubtitles, filename, language)
         return JSONResponse(content=result)
     except Exception as e:
         return JSONResponse(content={"success": False, "error": str(e)}, status_code=500)
 
+@app.post("/api/sync/batch")
+async def api_sync_batch(request: Request):
+    """
+    여러 미디어/자막 쌍의 싱크를 한 번에 검사합니다. folder(NAS 기준 상대 경로, 하위 폴더의 같은 이름 자막 포함) 또는
+    pairs([{media_path, subtitle_path}], folder와 같이 NAS 기준 상대 경로 또는 NAS 안의 절대 경로)를 받아
+    변환 워커들이 나눠 검사하고, 쌍마다 결과를 WebSocket(sync_result)으로 보냅니다.
+    model_size를 주면 워커에 로드된 모델로 샘플 구간 텍스트도 대조합니다 (text_score).
+    """
+    data = await request.json()
+    client_id = data.get("client_id")
+    folder = data.get("folder")
+    model_size = data.get("model_size")
+    engine = data.get("engine")
+    if not client_id or not (folder or data.get("pairs")):
+        raise HTTPException(status_code=400, detail="client_id와 folder 또는 pairs가 필요합니다.")
+    try:
+        if engine or model_size:
+            get_engine(engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if folder:
+        folder_path = (NAS_BASE_PATH / folder).resolve()
+        if not is_safe_path(folder_path) or not folder_path.is_dir():
+            raise HTTPException(status_code=400, detail=f"안전하지 않거나 존재하지 않는 폴더입니다: {folder}")
+        pairs = await run_io(find_sync_pairs, str(folder_path))
+    else:
+        pairs = []
+        for pair in data["pairs"]:
+            if not pair.get("media_path") or not pair.get("subtitle_path"):
+                raise HTTPException(status_code=400, detail=f"잘못된 미디어/자막 쌍입니다: {pair}")
+            # folder와 같은 기준으로 해석 (상대 경로는 서버 작업 디렉토리가 아닌 NAS 기준)
+            media_path = (NAS_BASE_PATH / pair["media_path"]).resolve()
+            subtitle_path = (NAS_BASE_PATH / pair["subtitle_path"]).resolve()
+            if not is_safe_path(media_path) or not is_safe_path(subtitle_path):
+                raise HTTPException(status_code=400, detail=f"잘못된 미디어/자막 쌍입니다: {pair}")
+            pairs.append((str(media_path), str(subtitle_path)))
+    if not pairs:
+        return {"batch_id": None, "total": 0}
+
+    batch_id = sync_batch_runner.start(manager, client_id, pairs, model_size, engine)
+    return {"batch_id": batch_id, "total": len(pairs)}
+
+@app.post("/api/sync/batch/{batch_id}/cancel")
+async def api_cancel_sync_batch(batch_id: str):
+    """진행 중인 일괄 싱크 검사를 취소합니다 (대기 중인 쌍은 바로 빠지고, 검사 중인 쌍은 다음 단계 전에 멈춤)."""
+    if not sync_batch_runner.cancel(batch_id):
+        raise HTTPException(status_code=404, detail="진행 중인 배치가 없습니다.")
+    return {"result": "cancelled"}
+
 @app.post("/api/auto_download_and_sync_subtitle")
 async def api_auto_download_and_sync_subtitle(request: Request):
     """
@@ -399,7 +547,7 @@ async def api_auto_download_and_sync_subtitle(request: Request):
         logger.info(f"자동 자막 다운로드 및 동기화 요청: {filename}, 언어: {language}")
         
         # 1단계: 자막 다운로드
-        download_result = download_subtitle_from_opensubtitles(filename, language)
+        download_result = await run_io(download_subtitle_from_opensubtitles, filename, language)
         
         if not download_result.get("success") or not download_result.get("subtitle_path"):
             return JSONResponse(content={
@@ -410,21 +558,18 @@ async def api_auto_download_and_sync_subtitle(request: Request):
         subtitle_path = download_result.get("subtitle_path")
         
         # 2단계: 자막 싱크 확인 및 조정
-        sync_result = check_subtitle_sync(media_path, subtitle_path)
+        sync_result = await run_cpu(check_subtitle_sync, media_path, subtitle_path)
         
         # 싱크가 좋지 않은 경우 보정 시도
         if not sync_result.get("in_sync", False) and sync_result.get("score", 0) < 0.7:
             logger.info(f"자막 싱크가 좋지 않음 (점수: {sync_result.get('score')}), 보정 시도 중...")
             
-            # 고급 싱크 조정 및 저장
-            advanced_result = advanced_sync_and_save(
-                media_path, 
-                subtitle_path, 
-                avg_offset=sync_result.get("avg_offset", 0)
-            )
+            # 고급 싱크 조정 및 저장 (발화/자막 포락선 상호상관으로 오프셋 추정)
+            advanced_result = await run_cpu(advanced_sync_and_save, media_path, subtitle_path)
             
-            final_subtitle_path = advanced_result.get("output_path", subtitle_path)
-            sync_applied = True
+            final_subtitle_path = advanced_result.get("save_path") or subtitle_path
+            sync_applied = advanced_result.get("success", False)
+            sync_result["avg_offset"] = advanced_result.get("avg_offset", 0)
         else:
             # 싱크가 좋은 경우 원본 사용
             final_subtitle_path = subtitle_path
@@ -479,8 +624,7 @@ async def update_subtitle(request: Request):
             return {"success": False, "error": "지원하지 않는 자막 파일 형식입니다."}
         if not is_safe_path(target_path):
             return {"success": False, "error": "허용되지 않은 경로입니다."}
-        with open(target_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        await run_io(target_path.write_text, content, encoding="utf-8")
         return {"success": True, "message": "자막 파일이 성공적으로 수정되었습니다."}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -499,7 +643,8 @@ async def delete_subtitle(request: Request):
             return {"success": False, "error": "지원하지 않는 자막 파일 형식입니다."}
         if not is_safe_path(target_path):
             return {"success": False, "error": "허용되지 않은 경로입니다."}
-        target_path.unlink()
+        await run_io(target_path.unlink)
+        await run_io(media_index.update_paths, [str(target_path)])
         return {"success": True, "message": "자막 파일이 성공적으로 삭제되었습니다."}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -515,13 +660,13 @@ async def api_download_and_save_subtitle(request: Request):
         target_path = Path(save_path).resolve()
         if not is_safe_path(target_path):
             return {"success": False, "error": "허용되지 않은 경로입니다."}
-        result = download_and_save_subtitle(download_url, str(target_path))
+        result = await run_io(download_and_save_subtitle, download_url, str(target_path))
         return result
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 @app.get("/api/list_directory", response_class=JSONResponse)
-async def list_directory(path: Optional[str] = Query("")):
+async def list_directory(path: Optional[str] = Query(""), refresh: bool = Query(False)):
     """디렉토리 탐색기를 위한 endpoint - 지정된 경로의 디렉토리와 파일 목록을 반환합니다."""
     current_scan_path = NAS_BASE_PATH
     if path:
@@ -539,7 +684,7 @@ async def list_directory(path: Optional[str] = Query("")):
     logger.info(f"API 디렉토리 목록 요청: {current_scan_path}")
     try:
         # 디렉토리 목록 가져오기
-        subdirs_paths = list_subdirectories(str(current_scan_path))
+        subdirs_paths = await run_io(list_subdirectories, str(current_scan_path))
         # 디렉토리 경로를 딕셔너리 형식으로 변환
         directories = []
         for dir_path in subdirs_paths:
@@ -553,7 +698,7 @@ async def list_directory(path: Optional[str] = Query("")):
                 logger.warning(f"상대 경로 계산 실패: {dir_path}")
         
         # 파일 목록 가져오기 (필요한 경우)
-        files = scan_media_files(str(current_scan_path), True, True)
+        files = await run_io(media_index.get_media_files, str(current_scan_path), True, True, refresh=refresh)
         
         return {
             "directories": directories,
@@ -568,7 +713,7 @@ async def list_directory(path: Optional[str] = Query("")):
         )
 
 @app.get("/api/scan_directory", response_class=JSONResponse)
-async def scan_directory(path: Optional[str] = Query("")):
+async def scan_directory(path: Optional[str] = Query(""), refresh: bool = Query(False)):
     """현재 디렉토리의 미디어 파일을 모두 스캔하여 반환합니다."""
     current_scan_path = NAS_BASE_PATH
     if path:
@@ -585,7 +730,7 @@ async def scan_directory(path: Optional[str] = Query("")):
     logger.info(f"API 디렉토리 스캔 요청: {current_scan_path}")
     try:
         # 모든 미디어 파일 스캔 (비디오 + 오디오)
-        files = scan_media_files(str(current_scan_path), True, True)
+        files = await run_io(media_index.get_media_files, str(current_scan_path), True, True, refresh=refresh)
         
         return {
             "files": files,
@@ -598,12 +743,72 @@ async def scan_directory(path: Optional[str] = Query("")):
             content={"error": f"디렉토리 스캔에 실패했습니다: {str(e)}"}
         )
 
+@app.get("/api/scan_directory/stream")
+async def scan_directory_stream(path: Optional[str] = Query(""),
+                                filter_video: bool = Query(True),
+                                filter_audio: bool = Query(True),
+                                refresh: bool = Query(False)):
+    """
+    디렉토리 스캔 결과를 NDJSON으로 스트리밍합니다. 디렉토리를 읽는 즉시 한 줄씩 전송하므로
+    첫 파일이 바로 표시되고, 서버는 전체 목록을 메모리에 모으지 않습니다 (결과는 미디어 인덱스에도 반영).
+    각 줄: {"type": "file", "file": {...}} ... 마지막 줄: {"type": "summary", ...} (오류 시 {"type": "error", ...})
+    """
+    current_scan_path = NAS_BASE_PATH
+    if path:
+        resolved_path = (NAS_BASE_PATH / path).resolve()
+        if is_safe_path(resolved_path) and resolved_path.is_dir():
+            current_scan_path = resolved_path
+        else:
+            logger.warning(f"스트리밍 스캔 요청: 안전하지 않거나 존재하지 않는 경로 - {path}")
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"error": "유효하지 않은 경로입니다."}
+            )
+
+    allowed_types = {t for t, enabled in (("video", filter_video), ("audio", filter_audio)) if enabled}
+    current_relative_path = str(current_scan_path.relative_to(NAS_BASE_PATH)) if current_scan_path != NAS_BASE_PATH else ""
+    logger.info(f"API 스트리밍 스캔 요청: {current_scan_path} (Video: {filter_video}, Audio: {filter_audio}, refresh: {refresh})")
+
+    def generate():
+        # io 풀에서 한 줄씩 꺼내므로 (iterate_io) 스캔이 이벤트 루프를 막지 않음
+        start_time = time.time()
+        total = video_count = with_subtitle_count = directory_count = 0
+        # 이미 인덱싱된 경로는 증분 스캔 (바뀐 디렉토리만 다시 읽고 나머지는 인덱스에서 전송)
+        incremental = not refresh and media_index.last_scanned(str(current_scan_path)) is not None
+        try:
+            for _, entries in media_index.iter_refresh(str(current_scan_path), incremental=incremental, include_reused=True):
+                directory_count += 1
+                for entry in entries:
+                    if entry["type"] not in allowed_types:
+                        continue
+                    total += 1
+                    video_count += entry["type"] == "video"
+                    with_subtitle_count += entry["has_subtitle"]
+                    yield json.dumps({"type": "file", "file": entry}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"스트리밍 스캔 중 오류 ({path}): {e}", exc_info=True)
+            yield json.dumps({"type": "error", "error": f"디렉토리 스캔에 실패했습니다: {e}"}, ensure_ascii=False) + "\n"
+            return
+        yield json.dumps({
+            "type": "summary",
+            "current_path": current_relative_path,
+            "total": total,
+            "video_count": video_count,
+            "audio_count": total - video_count,
+            "with_subtitle_count": with_subtitle_count,
+            "without_subtitle_count": total - with_subtitle_count,
+            "directory_count": directory_count,
+            "elapsed": round(time.time() - start_time, 3)
+        }, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(iterate_io(generate()), media_type="application/x-ndjson")
+
 @app.get("/api/opensubtitles/status", response_class=JSONResponse)
 async def api_opensubtitles_status():
     """
     OpenSubtitles API의 상태(일일 사용량 등)를 확인합니다.
     """
-    download_stats = load_download_stats()
+    download_stats = await run_io(load_download_stats)
     
     # 오늘 날짜 확인
     today = time.strftime('%Y-%m-%d')
@@ -656,7 +861,7 @@ async def api_multilingual_subtitle_search(request: Request):
         save_path = str(target_path.with_suffix('.srt'))
         
         # 다국어 자막 검색 실행
-        result = fallback_search_subtitle(filename, save_path, languages, min_similarity)
+        result = await run_io(fallback_search_subtitle, filename, save_path, languages, min_similarity)
         
         if result.get('success'):
             logger.info(f"다국어 자막 검색 성공: {result.get('language', '알 수 없음')} 언어로 찾음")
@@ -666,7 +871,7 @@ async def api_multilingual_subtitle_search(request: Request):
             
             # 자막 싱크 체크 시도
             try:
-                sync_result = check_subtitle_sync(str(target_path), save_path)
+                sync_result = await run_cpu(check_subtitle_sync, str(target_path), save_path)
                 result['sync_info'] = sync_result
             except Exception as sync_err:
                 logger.warning(f"자막 싱크 체크 실패: {str(sync_err)}")
@@ -0,0 +1,200 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000  # Whisper 입력 형식 (16kHz mono)
+BYTES_PER_SAMPLE = 2  # s16le로 저장 (float32의 절반 크기, 읽을 때 float32로 변환)
+PCM_SUFFIX = ".s16"
+
+# 내용 지문: 파일 크기 + 앞/가운데/끝 1MB. 이름이 바뀌거나 다른 폴더로 복사돼도 같은 캐시를 사용
+FINGERPRINT_BLOCK = 1024 * 1024
+FINGERPRINT_MEMO_SIZE = 4096
+# 최근 이 시간(초) 안에 사용한 파일은 예산을 넘어도 지우지 않음 (다른 워커 프로세스가 읽는 중일 수 있음)
+EVICTION_MIN_IDLE = 600
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def read_pcm(pcm_path: str, start: float = 0.0, end: Optional[float] = None, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """캐시 파일(s16le)의 [start, end) 구간을 float32 배열로 읽는다 (memory-map, 필요한 구간만 디스크에서 읽음)."""
+    AudioCache._touch(pcm_path)  # LRU 사용 시각 갱신 (워커 프로세스에서 읽는 경우 포함)
+    audio = np.memmap(pcm_path, dtype=np.int16, mode="r")
+    stop = None if end is None else int(end * sample_rate)
+    return audio[int(start * sample_rate):stop].astype(np.float32) / 32768.0
+
+
+def open_pcm(pcm_path: str) -> np.ndarray:
+    """캐시 파일 전체를 int16 memory-map으로 연다 (VAD 등 블록 단위로 처리하는 쪽에서 사용)."""
+    return np.memmap(pcm_path, dtype=np.int16, mode="r")
+
+
+def pcm_duration(pcm_path: str, sample_rate: int = SAMPLE_RATE) -> float:
+    return os.path.getsize(pcm_path) / BYTES_PER_SAMPLE / sample_rate
+
+
+class AudioCache:
+    """
+    미디어 파일의 오디오를 한 번만 16kHz mono PCM으로 추출해 로컬 디스크에 저장하는 캐시.
+    키는 파일 내용 지문이라 경로와 무관하고, Whisper 변환·언어 감지·싱크 검사가 같은 파일을 공유한다.
+    읽는 쪽은 memory-map으로 필요한 구간만 읽으므로 구간마다 ffmpeg를 다시 띄우지 않는다.
+    전체 크기가 max_mb를 넘으면 가장 오래 사용하지 않은 파일부터 지운다 (사용 시각은 파일 mtime).
+    """
+
+    def __init__(self, cache_dir: str, max_mb: int):
+        path = Path(cache_dir)
+        self.cache_dir = path if path.is_absolute() else PROJECT_ROOT / path
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._extracting: Dict[str, threading.Lock] = {}
+        self._fingerprints: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def fingerprint(self, media_path: str) -> str:
+        st = os.stat(media_path)
+        memo_key = (os.path.realpath(media_path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            key = self._fingerprints.get(memo_key)
+            if key is not None:
+                self._fingerprints.move_to_end(memo_key)
+                return key
+        digest = hashlib.sha1(str(st.st_size).encode())
+        with open(media_path, "rb") as f:
+            for offset in sorted({0, max(0, st.st_size // 2 - FINGERPRINT_BLOCK // 2), max(0, st.st_size - FINGERPRINT_BLOCK)}):
+                f.seek(offset)
+                digest.update(f.read(FINGERPRINT_BLOCK))
+        key = digest.hexdigest()
+        with self._lock:
+            self._fingerprints[memo_key] = key
+            if len(self._fingerprints) > FINGERPRINT_MEMO_SIZE:
+                self._fingerprints.popitem(last=False)
+        return key
+
+    def _pcm_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{PCM_SUFFIX}"
+
+    @staticmethod
+    def _touch(path: Path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def cached_path(self, media_path: str) -> Optional[str]:
+        """이미 추출돼 있으면 캐시 파일 경로, 아니면 None (추출하지 않음)."""
+        try:
+            path = self._pcm_path(self.fingerprint(media_path))
+        except OSError:
+            return None
+        if not path.exists():
+            return None
+        self._touch(path)
+        return str(path)
+
+    def get(self, media_path: str) -> str:
+        """캐시 파일 경로를 반환한다. 없으면 ffmpeg로 한 번 추출 (같은 파일을 동시에 요청하면 한 번만 추출)."""
+        key = self.fingerprint(media_path)
+        path = self._pcm_path(key)
+        if path.exists():
+            self.hits += 1
+            self._touch(path)
+            return str(path)
+        with self._lock:
+            extract_lock = self._extracting.setdefault(key, threading.Lock())
+        with extract_lock:
+            if not path.exists():
+                self.misses += 1
+                self._extract(media_path, path)
+                self.evict(keep=path)
+            else:
+                self.hits += 1
+        with self._lock:
+            self._extracting.pop(key, None)
+        return str(path)
+
+    def _extract(self, media_path: str, path: Path):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 쓴 뒤 rename: 다른 프로세스(변환 워커)가 같은 파일을 동시에 추출해도 반쯤 쓴 파일을 읽지 않음
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        cmd = [
+            'ffmpeg', '-nostdin', '-y', '-threads', '0', '-i', media_path,
+            '-vn', '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE),
+            '-loglevel', 'error', str(tmp_path),
+        ]
+        start = time.time()
+        proc = subprocess.run(cmd, capture_output=True)
+        if proc.returncode != 0:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg 오디오 추출 오류: {proc.stderr.decode(errors='replace')}")
+        os.replace(tmp_path, path)
+        logger.info(f"[AudioCache] 오디오 추출: {media_path} ({pcm_duration(str(path)):.0f}초, {path.stat().st_size / 1024 / 1024:.0f}MB, {time.time() - start:.1f}초)")
+
+    def read(self, media_path: str, start: float = 0.0, end: Optional[float] = None) -> np.ndarray:
+        """미디어 파일의 [start, end) 구간 오디오 (float32, 16kHz mono). 필요하면 먼저 추출."""
+        return read_pcm(self.get(media_path), start, end)
+
+    def duration(self, media_path: str) -> float:
+        """오디오 길이(초). 추출된 PCM 크기로 계산하므로 ffprobe가 필요 없다."""
+        return pcm_duration(self.get(media_path))
+
+    def _entries(self):
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(PCM_SUFFIX):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        return sorted(entries)
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """예산을 넘으면 오래 사용하지 않은 파일부터 지운다. 지운 파일 수를 반환."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        evicted = 0
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep or now - mtime < EVICTION_MIN_IDLE:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+            self.evictions += 1
+            logger.info(f"[AudioCache] 용량 초과로 삭제: {path.name} ({size / 1024 / 1024:.0f}MB)")
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            "dir": str(self.cache_dir),
+            "files": len(entries),
+            "total_mb": round(sum(size for _, size, _ in entries) / 1024 / 1024, 1),
+            "budget_mb": round(self.max_bytes / 1024 / 1024, 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+audio_cache = AudioCache(settings.audio_cache_dir, settings.audio_cache_max_mb)
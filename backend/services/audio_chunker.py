@@ -0,0 +1,178 @@
+import json
+import logging
+import subprocess
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from backend.services.audio_cache import SAMPLE_RATE, audio_cache, open_pcm, pcm_duration
+
+logger = logging.getLogger(__name__)
+
+# 음성 구간 검출(VAD) 기본값
+VAD_FRAME_MS = 30
+VAD_MIN_SPEECH_MS = 250  # 이보다 짧은 소리는 잡음으로 보고 버림
+VAD_MIN_SILENCE_MS = 600  # 이보다 짧은 무음은 말 사이 쉼으로 보고 이어 붙임
+VAD_PAD_MS = 200  # 음성 구간 앞뒤 여유
+SPEECH_BAND_HZ = (300, 3400)  # 음성 주파수 대역 (음악의 저역/고역 에너지와 구분)
+VAD_BLOCK_FRAMES = 8192  # FFT를 이 프레임 수 단위로 나눠 계산 (긴 영화에서도 메모리 일정)
+
+
+class AudioChunk(NamedTuple):
+    start: float  # 초
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def probe_duration(media_path: str) -> float:
+    """ffprobe로 미디어 길이(초)를 구한다."""
+    cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', media_path]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe 오류: {proc.stderr}")
+    return float(json.loads(proc.stdout)['format']['duration'])
+
+
+def extract_audio(media_path: str, sample_rate: int = SAMPLE_RATE, start: Optional[float] = None,
+                  duration: Optional[float] = None) -> np.ndarray:
+    """
+    ffmpeg로 미디어의 오디오를 16kHz mono float32 배열로 디코딩한다 (whisper.load_audio와 같은 형식).
+    오디오 캐시를 거치지 않으므로 캐시에 없는 파일의 짧은 구간만 볼 때 사용 (언어 사전 감지 등).
+    start/duration을 주면 그 구간만 디코딩한다 (-ss를 입력 앞에 두어 앞부분은 디코딩하지 않고 건너뜀).
+    """
+    cmd = ['ffmpeg', '-nostdin', '-threads', '0']
+    if start:
+        cmd += ['-ss', f"{start:.3f}"]
+    cmd += ['-i', media_path]
+    if duration:
+        cmd += ['-t', f"{duration:.3f}"]
+    cmd += ['-vn', '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-loglevel', 'error', '-']
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 오디오 추출 오류: {proc.stderr.decode(errors='replace')}")
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def _frame_features(audio: np.ndarray, frame: int, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """프레임별 에너지(dBFS)와 음성 대역 에너지 비율을 계산한다. audio는 float 또는 int16(캐시 memory-map)."""
+    scale = 1.0 / 32768.0 if audio.dtype == np.int16 else 1.0
+    n_frames = len(audio) // frame
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    freqs = np.fft.rfftfreq(frame, 1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    energy_db = np.empty(n_frames)
+    band_ratio = np.empty(n_frames)
+    for start in range(0, n_frames, VAD_BLOCK_FRAMES):
+        block = frames[start:start + VAD_BLOCK_FRAMES].astype(np.float64) * scale
+        energy_db[start:start + len(block)] = 10 * np.log10(np.mean(block ** 2, axis=1) + 1e-12)
+        power = np.abs(np.fft.rfft(block, axis=1)) ** 2
+        band_ratio[start:start + len(block)] = power[:, band].sum(axis=1) / (power.sum(axis=1) + 1e-12)
+    return energy_db, band_ratio
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """불리언 배열에서 True 구간들의 [시작, 끝) 인덱스 목록"""
+    if not len(mask):
+        return []
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+
+def detect_speech_regions(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_ms: int = VAD_FRAME_MS,
+                          min_speech_ms: int = VAD_MIN_SPEECH_MS, min_silence_ms: int = VAD_MIN_SILENCE_MS,
+                          threshold_db: Optional[float] = None, min_band_ratio: float = 0.35) -> List[AudioChunk]:
+    """
+    가벼운 에너지 기반 VAD. 프레임 에너지가 배경 소음보다 충분히 크고, 에너지의 상당 부분이 음성 대역
+    (300~3400Hz)에 있는 프레임을 음성으로 본다. 짧은 쉼은 이어 붙이고 짧은 잡음은 버린다.
+    반환: 음성 구간 목록 (초)
+    """
+    frame = int(sample_rate * frame_ms / 1000)
+    if len(audio) < frame:
+        return []
+    energy_db, band_ratio = _frame_features(audio, frame, sample_rate)
+    if threshold_db is None:
+        # 하위 10% 프레임을 배경 소음으로 보고 그보다 12dB 이상 큰 프레임 (절대 하한 -50dBFS)
+        threshold_db = max(float(np.percentile(energy_db, 10)) + 12.0, -50.0)
+    active = (energy_db > threshold_db) & (band_ratio >= min_band_ratio)
+
+    # 짧은 무음 메우기
+    min_silence = max(1, min_silence_ms // frame_ms)
+    for start, end in _runs(~active):
+        if start > 0 and end < len(active) and end - start < min_silence:
+            active[start:end] = True
+    # 짧은 소리 버리기
+    min_speech = max(1, min_speech_ms // frame_ms)
+    frame_seconds = frame / sample_rate
+    return [AudioChunk(start * frame_seconds, end * frame_seconds)
+            for start, end in _runs(active) if end - start >= min_speech]
+
+
+def plan_chunks(regions: List[AudioChunk], total_duration: float, max_chunk_seconds: float = 240.0,
+                max_merge_gap: float = 3.0, pad: float = VAD_PAD_MS / 1000) -> List[AudioChunk]:
+    """
+    음성 구간들을 병렬 변환 단위(청크)로 묶는다. 청크 경계는 항상 무음 구간 안에 두고(문장 중간을 자르지 않음),
+    가까운 구간은 max_chunk_seconds까지 합친다. 한 구간이 그보다 길면 고정 길이로 나눈다.
+    """
+    groups: List[List[float]] = []
+    for region in regions:
+        if groups and region.start - groups[-1][1] <= max_merge_gap and region.end - groups[-1][0] <= max_chunk_seconds:
+            groups[-1][1] = region.end
+        else:
+            groups.append([region.start, region.end])
+
+    chunks: List[AudioChunk] = []
+    for i, (start, end) in enumerate(groups):
+        # 앞뒤 여유는 인접 청크와의 무음 구간 절반까지만
+        prev_end = groups[i - 1][1] if i > 0 else 0.0
+        next_start = groups[i + 1][0] if i + 1 < len(groups) else total_duration
+        start = max(start - pad, (prev_end + start) / 2 if i > 0 else 0.0)
+        end = min(end + pad, (end + next_start) / 2 if i + 1 < len(groups) else total_duration)
+        while end - start > max_chunk_seconds:
+            chunks.append(AudioChunk(start, start + max_chunk_seconds))
+            start += max_chunk_seconds
+        chunks.append(AudioChunk(start, end))
+    return chunks
+
+
+def offset_segments(segments: List[Dict[str, Any]], offset: float) -> List[Dict[str, Any]]:
+    """청크 기준 segment 시간을 원본 파일 기준으로 옮긴다."""
+    return [dict(segment, start=segment["start"] + offset, end=segment["end"] + offset) for segment in segments]
+
+
+def stitch_chunk_results(chunks: List[AudioChunk], results: List[Dict[str, Any]], language: Optional[str] = None) -> Dict[str, Any]:
+    """청크별 변환 결과를 시간 순서대로 이어 붙여 model.transcribe와 같은 형식의 결과 하나로 만든다."""
+    segments: List[Dict[str, Any]] = []
+    speech_by_language: Dict[str, float] = {}
+    for chunk, result in sorted(zip(chunks, results), key=lambda item: item[0].start):
+        chunk_segments = offset_segments(result.get("segments", []), chunk.start)
+        for segment in chunk_segments:
+            segment["end"] = min(segment["end"], chunk.end)
+            if segments and segment["start"] < segments[-1]["end"]:
+                segment["start"] = segments[-1]["end"]
+                segment["end"] = max(segment["end"], segment["start"])
+            segment["id"] = len(segments)
+            segments.append(segment)
+        if result.get("language"):
+            speech_by_language[result["language"]] = speech_by_language.get(result["language"], 0.0) + chunk.duration
+    if language is None:
+        # 청크마다 감지된 언어가 다르면 가장 긴 시간을 차지한 언어
+        language = max(speech_by_language, key=speech_by_language.get) if speech_by_language else "unk"
+    return {"text": "".join(segment["text"] for segment in segments), "segments": segments, "language": language}
+
+
+def prepare_long_form(media_path: str, max_chunk_seconds: float = 240.0) -> Tuple[str, List[AudioChunk], float]:
+    """
+    긴 파일 변환 준비: 오디오 캐시에서 추출된 오디오를 memory-map으로 열어 음성 구간을 청크로 나눈다.
+    워커들은 같은 캐시 파일에서 청크 구간만 읽는다. 반환: (캐시 파일 경로, 청크 목록, 전체 길이 초)
+    """
+    pcm_path = audio_cache.get(media_path)
+    total = pcm_duration(pcm_path)
+    regions = detect_speech_regions(open_pcm(pcm_path))
+    chunks = plan_chunks(regions, total, max_chunk_seconds=max_chunk_seconds)
+    speech = sum(chunk.duration for chunk in chunks)
+    logger.info(f"[long-form] {media_path}: 전체 {total:.0f}초 중 음성 {speech:.0f}초, 청크 {len(chunks)}개")
+    return pcm_path, chunks, total
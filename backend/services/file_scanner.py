@@ -1,9 +1,17 @@
 import os
+import re
+import time
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Set, Any
+from typing import List, Dict, Set, Any, Tuple, Optional, NamedTuple, Callable, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 import subprocess
 
+from backend.config import settings
+from backend.services.subtitle_io import convert_subtitle, is_supported_subtitle
+
 logger = logging.getLogger(__name__)
 
 # 지원하는 미디어 확장자 분류
@@ -12,70 +20,153 @@ AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".m4a"}
 # 지원하는 자막 파일 확장자
 SUBTITLE_EXTENSIONS = {".srt", ".vtt", ".smi", ".ass"}
 
-def scan_media_files(directory: str, filter_video: bool = True, filter_audio: bool = True) -> List[Dict[str, str]]:
+# 자막 파일명 끝의 언어 코드 (movie.en.srt, movie_ko.srt, movie_pt-BR.srt, movie-zh_TW.srt 등)
+SUBTITLE_LANG_SUFFIX_RE = re.compile(r'[._-]([A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,4})?)$')
+
+def match_subtitle_stem(subtitle_stem: str, media_stems: Set[str]) -> Optional[str]:
+    """자막 파일 stem이 속하는 미디어 파일 stem을 찾는다 (movie / movie.en / movie_pt-BR -> movie). 없으면 None."""
+    if subtitle_stem in media_stems:
+        return subtitle_stem
+    match = SUBTITLE_LANG_SUFFIX_RE.search(subtitle_stem)
+    if match and subtitle_stem[:match.start()] in media_stems:
+        return subtitle_stem[:match.start()]
+    return None
+
+def subtitle_language(media_stem: str, subtitle_name: str) -> Optional[str]:
+    """자막 파일명에서 언어 코드를 소문자로 추출한다 (movie_pt_BR.srt -> 'pt-br'). 언어 코드가 없으면 None."""
+    subtitle_stem = os.path.splitext(subtitle_name)[0]
+    if subtitle_stem == media_stem or not subtitle_stem.startswith(media_stem):
+        return None
+    return subtitle_stem[len(media_stem) + 1:].lower().replace("_", "-") or None
+
+def scan_directory_level(directory: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    지정된 디렉토리 한 단계만 스캔한다 (재귀 없음, 영상/오디오 모두).
+    os.scandir 목록 1회로 형제 파일을 stem 기준으로 묶어 자막을 찾으므로, 자막 확인에 추가 stat이 들지 않는다.
+    반환: (미디어 파일 목록, 하위 디렉토리 절대 경로 목록). 심볼릭 링크 디렉토리는 따라가지 않는다.
+    """
+    media_entries: List[os.DirEntry] = []
+    subtitle_names: List[str] = []
+    subdirs: List[str] = []
+    media_extensions = VIDEO_EXTENSIONS | AUDIO_EXTENSIONS
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext in media_extensions and entry.is_file():
+                        media_entries.append(entry)
+                    elif ext in SUBTITLE_EXTENSIONS and entry.is_file():
+                        subtitle_names.append(entry.name)
+                except OSError as e:
+                    logger.debug(f"[scan_directory_level] 항목 확인 실패: {entry.path} - {e}")
+    except Exception as e:
+        logger.warning(f"[scan_directory_level] '{directory}' 스캔 중 오류: {e}")
+        return [], []
+
+    # 같은 폴더의 자막을 미디어 stem 기준으로 묶기 (메모리 내 처리)
+    media_stems = {os.path.splitext(entry.name)[0] for entry in media_entries}
+    subtitles_by_stem: Dict[str, List[str]] = {}
+    for name in sorted(subtitle_names):
+        stem = match_subtitle_stem(os.path.splitext(name)[0], media_stems)
+        if stem is not None:
+            subtitles_by_stem.setdefault(stem, []).append(name)
+
+    media_files: List[Dict[str, Any]] = []
+    for entry in media_entries:
+        try:
+            stat_result = entry.stat()
+        except OSError as e:
+            logger.debug(f"[scan_directory_level] stat 실패: {entry.path} - {e}")
+            continue
+        stem, ext = os.path.splitext(entry.name)
+        subtitle_files = subtitles_by_stem.get(stem, [])
+        subtitle_languages = sorted({lang for lang in (subtitle_language(stem, name) for name in subtitle_files) if lang})
+        media_files.append({
+            "name": entry.name,
+            "path": entry.path,
+            "type": "video" if ext.lower() in VIDEO_EXTENSIONS else "audio",
+            "size": stat_result.st_size,
+            "mtime": stat_result.st_mtime,
+            "has_subtitle": len(subtitle_files) > 0,
+            "subtitle_files": subtitle_files,
+            "subtitle_languages": subtitle_languages
+        })
+    return media_files, subdirs
+
+_scan_executor: Optional[ThreadPoolExecutor] = None
+_scan_executor_lock = threading.Lock()
+
+def _get_scan_executor() -> ThreadPoolExecutor:
+    """모든 디렉토리 순회가 공유하는 스캔 스레드 풀 (NAS 동시 요청 수의 전역 상한)."""
+    global _scan_executor
+    with _scan_executor_lock:
+        if _scan_executor is None:
+            _scan_executor = ThreadPoolExecutor(max_workers=max(1, settings.scan_workers), thread_name_prefix="scan")
+        return _scan_executor
+
+def walk_parallel(root: str, visit: Callable[[str], Tuple[Any, List[str]]], max_workers: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    root부터 디렉토리를 순회하며 visit(디렉토리) -> (결과, 내려갈 하위 디렉토리 목록)을 호출하고 (디렉토리, 결과)를 생성한다.
+    네트워크 마운트에서는 디렉토리 목록 읽기가 지연 시간에 묶이므로, 서로 독립된 디렉토리를 스캔 스레드 풀에서
+    동시에 읽는다. 한 번의 순회가 동시에 읽는 디렉토리 수는 max_workers(기본 settings.scan_workers)로 제한된다.
+    결과는 끝난 순서대로 나오므로, 순서가 필요하면 호출하는 쪽에서 정렬한다.
+    """
+    max_workers = settings.scan_workers if max_workers is None else max_workers
+    if max_workers <= 1:
+        pending = [root]
+        while pending:
+            current = pending.pop()
+            result, children = visit(current)
+            yield current, result
+            pending.extend(children)
+        return
+
+    executor = _get_scan_executor()
+    to_visit = deque([root])
+    in_flight: Dict[Future, str] = {}
+    try:
+        while to_visit or in_flight:
+            while to_visit and len(in_flight) < max_workers:
+                current = to_visit.popleft()
+                in_flight[executor.submit(visit, current)] = current
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                current = in_flight.pop(future)
+                result, children = future.result()
+                to_visit.extend(children)
+                yield current, result
+    finally:
+        # 소비자가 중간에 멈추면(스트리밍 연결 종료 등) 아직 시작 안 한 작업은 취소
+        for future in in_flight:
+            future.cancel()
+
+def scan_media_files(directory: str, filter_video: bool = True, filter_audio: bool = True) -> List[Dict[str, Any]]:
     """지정된 디렉토리와 하위 디렉토리를 스캔하여 미디어 파일(자막 유무 포함) 전체를 반환합니다 (타입 필터링 적용)."""
-    media_files: List[Dict[str, str]] = []
-    processed_basenames: Set[str] = set()
-    allowed_extensions: Set[str] = set()
+    media_files: List[Dict[str, Any]] = []
+    allowed_types: Set[str] = set()
     if filter_video:
-        allowed_extensions.update(VIDEO_EXTENSIONS)
+        allowed_types.add("video")
     if filter_audio:
-        allowed_extensions.update(AUDIO_EXTENSIONS)
+        allowed_types.add("audio")
 
-    if not allowed_extensions:
+    if not allowed_types:
         logger.warning("스캔할 미디어 타입이 선택되지 않았습니다 (영상/오디오 모두 해제됨). 빈 목록을 반환합니다.")
         return []
 
     try:
-        target_path = Path(directory)
+        target_path = Path(directory).resolve()
         if not target_path.is_dir():
             logger.error(f"지정된 경로가 디렉토리가 아닙니다: {directory}")
             return []
 
         logger.info(f"디렉토리 스캔 시작: {directory} (Video: {filter_video}, Audio: {filter_audio})")
-        for item in target_path.rglob('*'):
-            if item.is_file():
-                file_ext = item.suffix.lower()
-                base_name = item.stem
-                full_path_str = str(item.resolve())
-
-                if base_name in processed_basenames:
-                    continue
-
-                # 1. 미디어 파일인지 확인 (선택된 필터 기준)
-                if file_ext in allowed_extensions:
-                    subtitle_files = []
-                    for sub_ext in SUBTITLE_EXTENSIONS:
-                        # 기본 자막 (movie.srt)
-                        subtitle_path = item.with_suffix(sub_ext)
-                        if subtitle_path.exists():
-                            subtitle_files.append(subtitle_path.name)
-                        # 언어 코드 포함 자막 (movie_en.srt)
-                        parent_dir = item.parent
-                        for lang_code in ['_en', '_ko', '_ja', '_zh']:
-                            lang_sub_name = f"{base_name}{lang_code}{sub_ext}"
-                            lang_sub_path = parent_dir / lang_sub_name
-                            if lang_sub_path.exists():
-                                subtitle_files.append(lang_sub_path.name)
-                    has_subtitle = len(subtitle_files) > 0
-                    media_files.append({
-                        "name": item.name,
-                        "path": full_path_str,
-                        "type": "video" if file_ext in VIDEO_EXTENSIONS else "audio",
-                        "has_subtitle": has_subtitle,
-                        "subtitle_files": subtitle_files
-                    })
-                    processed_basenames.add(base_name)
-                    logger.debug(f"미디어 파일: {item.name}, 자막: {subtitle_files if has_subtitle else '없음'}")
-
-                # 2. 자막 파일이면, 해당 파일명(언어코드 제외)을 처리된 것으로 간주
-                elif file_ext in SUBTITLE_EXTENSIONS:
-                    processed_basenames.add(base_name)
-                    for lang_code in ['_en', '_ko', '_ja', '_zh']:
-                        if base_name.endswith(lang_code):
-                            original_base_name = base_name[:-len(lang_code)]
-                            processed_basenames.add(original_base_name)
-                            break
+        # 디렉토리당 scandir 1회, 독립된 디렉토리는 스캔 스레드 풀에서 동시에 읽음
+        for _, entries in walk_parallel(str(target_path), scan_directory_level):
+            media_files.extend(e for e in entries if e["type"] in allowed_types)
 
         logger.info(f"디렉토리 스캔 완료: {len(media_files)}개의 미디어 파일 반환 (자막 유무 포함)")
 
@@ -119,30 +210,161 @@ def list_subdirectories(directory: str) -> List[str]:
         
     return subdirs
 
+class MediaCounts(NamedTuple):
+    """디렉토리(하위 포함)의 미디어 개수 집계"""
+    video: int = 0
+    audio: int = 0
+    with_subtitle: int = 0
+    without_subtitle: int = 0
+
+    def __add__(self, other: "MediaCounts") -> "MediaCounts":
+        return MediaCounts(*(a + b for a, b in zip(self, other)))
+
+def _count_entries(entries: List[Dict[str, Any]]) -> MediaCounts:
+    video = sum(1 for e in entries if e["type"] == "video")
+    with_subtitle = sum(1 for e in entries if e["has_subtitle"])
+    return MediaCounts(video, len(entries) - video, with_subtitle, len(entries) - with_subtitle)
+
+class FolderCountCache:
+    """
+    디렉토리별 미디어 개수(영상/오디오/자막 있음/자막 없음)를 하위 폴더까지 합산해 캐시한다.
+    - 디렉토리마다 한 단계 목록(자기 파일 개수 + 하위 디렉토리)을 한 번만 읽고, 합계는 아래에서 위로 한 번에 계산한다.
+      루트 하나를 계산하면 그 아래 모든 디렉토리의 합계가 함께 채워진다.
+    - 변경이 생기면 invalidate()로 해당 디렉토리 목록과 조상 디렉토리들의 합계만 무효화한다.
+      다음 조회 때는 무효화된 디렉토리만 다시 읽고, 조상 합계는 캐시된 자식 합계로 다시 더한다.
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = max_age  # 초 단위 안전장치 (None이면 무효화 전까지 계속 사용)
+        self.lock = threading.Lock()
+        # 디렉토리 -> (자기 파일 개수, 하위 디렉토리 목록, 목록 읽은 시각)
+        self._levels: Dict[str, Tuple[MediaCounts, List[str], float]] = {}
+        # 디렉토리 -> (하위 포함 합계, 하위 중 가장 오래된 목록 시각)
+        self._totals: Dict[str, Tuple[MediaCounts, float]] = {}
+
+    def _is_expired(self, listed_at: float, now: float) -> bool:
+        return self.max_age is not None and now - listed_at > self.max_age
+
+    def _ensure_levels(self, root: str, now: float):
+        """root 하위에서 합계가 없는 디렉토리를 찾아, 목록이 없거나 만료된 디렉토리만 읽는다."""
+        def visit(current: str) -> Tuple[None, List[str]]:
+            with self.lock:
+                total = self._totals.get(current)
+                if total is not None and not self._is_expired(total[1], now):
+                    return None, []
+                level = self._levels.get(current)
+            if level is None or self._is_expired(level[2], now):
+                entries, subdirs = scan_directory_level(current)
+                level = (_count_entries(entries), subdirs, time.time())
+                with self.lock:
+                    self._levels[current] = level
+            return None, level[1]
+
+        for _ in walk_parallel(root, visit):
+            pass
+
+    def _aggregate(self, root: str, now: float) -> MediaCounts:
+        """후위 순회로 합계를 계산해 root 하위 모든 디렉토리에 채운다 (재귀 없음)."""
+        stack = [(root, False)]
+        # 이번 순회 중 목록이 무효화된 하위가 있으면 그 조상 합계는 캐시하지 않는다
+        partial: Dict[str, Tuple[MediaCounts, float]] = {}
+        with self.lock:
+            while stack:
+                current, children_done = stack.pop()
+                total = self._totals.get(current)
+                if total is not None and not self._is_expired(total[1], now):
+                    continue
+                level = self._levels.get(current)
+                if level is None:
+                    # 목록을 읽는 사이 무효화됨: 이번 합계에서는 빈 디렉토리로 취급 (다음 조회 때 다시 읽음)
+                    continue
+                own, subdirs, listed_at = level
+                if not children_done:
+                    stack.append((current, True))
+                    stack.extend((child, False) for child in subdirs)
+                    continue
+                counts, oldest, complete = own, listed_at, True
+                for child in subdirs:
+                    child_total = self._totals.get(child)
+                    if child_total is None:
+                        complete = False
+                        child_total = partial.get(child)
+                    if child_total is not None:
+                        counts = counts + child_total[0]
+                        oldest = min(oldest, child_total[1])
+                if complete:
+                    self._totals[current] = (counts, oldest)
+                else:
+                    partial[current] = (counts, oldest)
+            total = self._totals.get(root) or partial.get(root)
+        return total[0] if total else MediaCounts()
+
+    def get(self, directory: str) -> MediaCounts:
+        """directory(하위 포함)의 미디어 개수. 캐시에 없으면 한 번의 순회로 하위 전체를 계산한다."""
+        directory = str(Path(directory).resolve())
+        now = time.time()
+        self._ensure_levels(directory, now)
+        return self._aggregate(directory, now)
+
+    def get_children(self, directory: str) -> List[Tuple[str, MediaCounts]]:
+        """directory의 하위 디렉토리별 (경로, 개수) 목록. 캐시가 채워져 있으면 O(하위 디렉토리 수)."""
+        directory = str(Path(directory).resolve())
+        self.get(directory)
+        with self.lock:
+            level = self._levels.get(directory)
+            subdirs = list(level[1]) if level else []
+            return [(child, self._totals[child][0] if child in self._totals else MediaCounts()) for child in subdirs]
+
+    def invalidate_directory(self, directory: str):
+        """directory의 한 단계 목록이 바뀌었음을 알린다. 그 목록과 조상 체인의 합계만 무효화한다 (O(깊이))."""
+        current = os.path.realpath(directory)
+        with self.lock:
+            self._levels.pop(current, None)
+            while True:
+                self._totals.pop(current, None)
+                next_parent = os.path.dirname(current)
+                if next_parent == current:
+                    break
+                current = next_parent
+
+    def update_level(self, directory: str, entries: List[Dict[str, Any]], subdirs: List[str]):
+        """다른 곳(미디어 인덱스 등)에서 방금 읽은 한 단계 목록을 반영한다. 조상 체인의 합계는 무효화된다."""
+        self.invalidate_directory(directory)
+        with self.lock:
+            self._levels[os.path.realpath(directory)] = (_count_entries(entries), list(subdirs), time.time())
+
+    def invalidate(self, path: str):
+        """
+        path(파일 또는 디렉토리)가 생성/삭제/변경됐음을 알린다.
+        상위 디렉토리의 목록과 조상 체인의 합계를 무효화하고, path가 캐시된 디렉토리였다면 그 하위 캐시도 지운다.
+        """
+        path = os.path.realpath(path)
+        prefix = path.rstrip(os.sep) + os.sep
+        with self.lock:
+            if path in self._levels or path in self._totals:
+                for key in [k for k in self._levels if k == path or k.startswith(prefix)]:
+                    del self._levels[key]
+                for key in [k for k in self._totals if k == path or k.startswith(prefix)]:
+                    del self._totals[key]
+        self.invalidate_directory(os.path.dirname(path))
+
+    def clear(self):
+        with self.lock:
+            self._levels.clear()
+            self._totals.clear()
+
+folder_count_cache = FolderCountCache()
+
 def count_media_recursive(directory: Path) -> (int, int):
-    """디렉토리 내 모든 하위 폴더까지 영상/오디오 파일 개수를 재귀적으로 합산"""
-    video_count = 0
-    audio_count = 0
-    try:
-        for item in directory.iterdir():
-            if item.is_file():
-                ext = item.suffix.lower()
-                if ext in VIDEO_EXTENSIONS:
-                    video_count += 1
-                elif ext in AUDIO_EXTENSIONS:
-                    audio_count += 1
-            elif item.is_dir():
-                v, a = count_media_recursive(item)
-                video_count += v
-                audio_count += a
-    except Exception as e:
-        logger.warning(f"[count_media_recursive] '{directory}' 내부 파일 개수 집계 중 오류: {e}")
-    return video_count, audio_count
+    """디렉토리 내 모든 하위 폴더까지 영상/오디오 파일 개수를 합산 (folder_count_cache 사용)"""
+    counts = folder_count_cache.get(str(directory))
+    return counts.video, counts.audio
 
 def list_subdirectories_with_media_counts(directory: str) -> list:
     """
-    지정된 디렉토리의 하위 디렉토리 목록(절대 경로)과 각 디렉토리 내 영상/오디오 파일 개수를 (하위폴더까지 포함하여) 반환합니다.
-    반환 예시: [{ 'name': 'Movies', 'path': '/mnt/qq/Movies', 'video_count': 3, 'audio_count': 1 }, ...]
+    지정된 디렉토리의 하위 디렉토리 목록(절대 경로)과 각 디렉토리 내 영상/오디오/자막 유무별 파일 개수를 (하위폴더까지 포함하여) 반환합니다.
+    개수는 folder_count_cache에서 한 번의 순회로 집계되며, 캐시된 뒤에는 하위 디렉토리 수만큼만 비용이 든다.
+    반환 예시: [{ 'name': 'Movies', 'path': '/mnt/qq/Movies', 'video_count': 3, 'audio_count': 1, 'with_subtitle_count': 2, 'without_subtitle_count': 2 }, ...]
     """
     subdirs_info = []
     logger.info(f"[list_subdirectories_with_media_counts] 시작: '{directory}'")
@@ -151,15 +373,15 @@ def list_subdirectories_with_media_counts(directory: str) -> list:
         if not base_path.exists() or not base_path.is_dir():
             logger.warning(f"[list_subdirectories_with_media_counts] '{directory}'는 디렉토리가 아님.")
             return subdirs_info
-        for item in base_path.iterdir():
-            if item.is_dir():
-                video_count, audio_count = count_media_recursive(item)
-                subdirs_info.append({
-                    'name': item.name,
-                    'path': str(item.resolve()),
-                    'video_count': video_count,
-                    'audio_count': audio_count
-                })
+        for child, counts in folder_count_cache.get_children(str(base_path)):
+            subdirs_info.append({
+                'name': os.path.basename(child),
+                'path': child,
+                'video_count': counts.video,
+                'audio_count': counts.audio,
+                'with_subtitle_count': counts.with_subtitle,
+                'without_subtitle_count': counts.without_subtitle
+            })
         subdirs_info.sort(key=lambda x: x['name'])
         logger.info(f"[list_subdirectories_with_media_counts] 결과: {subdirs_info}")
     except Exception as e:
@@ -219,13 +441,19 @@ def extract_embedded_subtitles(media_path: str) -> List[Dict[str, Any]]:
 
 def convert_and_save_subtitle(input_path: str, output_path: str, target_format: str = 'srt') -> dict:
     """
-    ffmpeg를 사용해 자막 파일을 SRT 등 표준 포맷으로 변환/저장한다.
+    자막 파일을 SRT 등 표준 포맷으로 변환/저장한다.
+    SUBTITLE_EXTENSIONS 형식끼리는 subtitle_io로 프로세스 안에서 변환하고 (ffmpeg 실행 없음, CP949/EUC-KR 자동 판별),
+    그 밖의 형식만 ffmpeg를 사용한다.
     input_path: 원본 자막 파일 경로
     output_path: 저장할 파일 경로
-    target_format: 변환할 포맷 (기본 srt)
+    target_format: 변환할 포맷 (기본 srt, output_path 확장자가 자막 형식이면 그 확장자를 따름)
     반환: {'success': bool, 'output_path': str, 'error': str|None}
     """
     try:
+        output_format = output_path if is_supported_subtitle(output_path) else target_format
+        if is_supported_subtitle(input_path) and is_supported_subtitle(output_format):
+            convert_subtitle(input_path, output_path, output_format)
+            return {'success': True, 'output_path': output_path, 'error': None}
         cmd = [
             'ffmpeg', '-y', '-i', input_path, output_path
         ]
@@ -0,0 +1,303 @@
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from backend.config import settings
+from backend.executors import run_io
+from backend.job_manager import (
+    JobManager, job_manager, STATUS_RUNNING, STATUS_COMPLETED, STATUS_SKIPPED, STATUS_ERROR, STATUS_CANCELLED, STATUS_STOPPED,
+    ACTIVE_STATUSES,
+)
+from backend.services.transcription_pool import transcription_pool
+from backend.services.whisper_runner import run_whisper_on_file, MAX_CONCURRENT_WHISPER_TASKS
+from backend.services.audio_cache import audio_cache, pcm_duration
+from backend.services.audio_chunker import probe_duration
+
+logger = logging.getLogger(__name__)
+
+# 이 프로세스의 작업 임대 식별자 (재시작하면 바뀌므로 이전 프로세스의 임대는 만료 후 이어받음)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# run_whisper_on_file 결과 → 작업 상태
+RESULT_STATUS = {
+    "completed": STATUS_COMPLETED,
+    "skipped": STATUS_SKIPPED,
+    "error": STATUS_ERROR,
+    "cancelled": STATUS_CANCELLED,
+}
+
+
+def _media_duration(file_path: str) -> Optional[float]:
+    """스케줄링(짧은 파일 우선)용 미디어 길이. 오디오 캐시에 있으면 ffprobe 없이 계산, 실패하면 None."""
+    try:
+        pcm_path = audio_cache.cached_path(file_path)
+        return pcm_duration(pcm_path) if pcm_path else probe_duration(file_path)
+    except Exception as e:
+        logger.warning(f"[JobDispatcher] 길이 확인 실패 ({file_path}): {e}")
+        return None
+
+
+class JobDispatcher:
+    """
+    작업 저장소(job_manager)의 대기 작업을 가져와 실행하는 디스패처 (프로세스당 하나).
+    - 등록된 작업은 저장소에 먼저 기록되므로, 서버가 재시작돼도 대기/실행 중이던 작업이 남는다.
+    - 주기적으로 자기 임대를 연장하고, 임대가 만료된 작업(죽은 프로세스의 작업)을 이어받아 다시 실행한다.
+    - 동시에 실행하는 작업 수는 max_running (변환 워커 수)으로 제한한다.
+    - 다음 작업은 저장소의 스케줄 정책으로 고른다 (우선순위 → 클라이언트 간 라운드로빈 → 짧은 파일 먼저).
+    - 일시정지한 작업은 워커를 비우고 체크포인트를 저장해 두었다가, 재개하면 대기열로 돌아가 거기서부터 이어서 변환한다.
+    """
+
+    def __init__(self, store: JobManager, max_running: int, owner: str = WORKER_ID):
+        self.store = store
+        self.max_running = max(1, max_running)
+        self.owner = owner
+        self.manager = None
+        self.running: Dict[str, asyncio.Task] = {}
+        self._running_jobs: Dict[str, Dict[str, Any]] = {}
+        self._notified_batches = set()  # 종료 알림을 보낸 배치 (중복 전송 방지)
+        self._pause_requested = set()  # 일시정지를 요청했지만 아직 워커가 멈추지 않은 작업
+        self._wake: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def tick_seconds(self) -> float:
+        # 임대 만료 전에 여러 번 연장하도록 임대 시간의 1/3마다 확인
+        return max(0.05, self.store.lease_seconds / 3)
+
+    # --- 수명 주기 --- #
+
+    async def start(self, manager):
+        """서버 시작 시 호출: 이전 프로세스가 남긴 작업을 이어받고 디스패치 루프를 시작한다."""
+        self.manager = manager
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._run())
+        logger.info(f"[JobDispatcher] 시작 (owner={self.owner}, 동시 실행 {self.max_running}개)")
+
+    async def stop(self):
+        """서버 종료 시 호출: 실행 중이던 작업은 대기로 돌려 놓고 임대를 반납한다 (재시작 후 바로 이어서 실행)."""
+        self._stopping = True
+        if self._loop_task:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        tasks = list(self.running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        released = await run_io(self.store.release, self.owner)
+        if released:
+            logger.info(f"[JobDispatcher] 작업 {released}개 임대 반납 (재시작 후 이어서 실행)")
+
+    def wake(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    # --- 작업 등록/취소 --- #
+
+    async def submit(self, client_id: str, files: List[str], model_size: str, language: str = "auto",
+                     engine: Optional[str] = None, long_form="auto", priority: int = 0) -> Dict[str, Any]:
+        """
+        파일마다 작업을 저장소에 등록하고 배치 시작을 알린다. 반환: {'batch_id', 'job_ids'}
+        같은 클라이언트가 여러 배치를 동시에 등록할 수 있다 (실행 순서는 스케줄러가 정함).
+        """
+        batch_id = str(uuid.uuid4())
+        # 짧은 파일 우선 정렬을 위해 등록 전에 길이를 구함 (파일별 ffprobe를 I/O 스레드에서 동시에 실행)
+        durations = await asyncio.gather(*(run_io(_media_duration, file_path) for file_path in files))
+
+        def add_jobs():
+            return [
+                self.store.add_job(os.path.basename(file_path), language, model_size, client_id=client_id, file_path=file_path,
+                                   engine=engine, batch_id=batch_id, options={"long_form": long_form}, owner=self.owner,
+                                   priority=priority, duration=duration)
+                for file_path, duration in zip(files, durations)
+            ]
+        job_ids = await run_io(add_jobs)
+        logger.info(f"[JobDispatcher] 배치 등록 (Client: {client_id}): {len(job_ids)}개 파일, 모델: {model_size}, 엔진: {engine or settings.whisper_engine}, 언어: {language}, 우선순위: {priority}")
+        if self.manager:
+            await self.manager.send_personal_message({"type": "batch_start", "batch_id": batch_id, "total_files": len(job_ids)}, client_id)
+        self.wake()
+        return {"batch_id": batch_id, "job_ids": job_ids}
+
+    async def cancel_client(self, client_id: str) -> int:
+        """클라이언트의 대기 작업을 취소하고 실행 중인 작업을 중단한다. 취소한 작업 수를 반환."""
+        cancelled = await run_io(self.store.cancel_queued, client_id)
+        running = [task for job_id, task in self.running.items() if self._running_jobs[job_id]["client_id"] == client_id]
+        for task in running:
+            task.cancel()
+        if cancelled or running:
+            logger.info(f"[JobDispatcher] 작업 취소 (Client: {client_id}): 대기 {len(cancelled)}개, 실행 중 {len(running)}개")
+        # 대기 작업만 있던 배치는 실행 중인 작업이 끝나지 않으므로 여기서 배치 종료를 알림
+        for batch_id in {job["batch_id"] for job in await run_io(self._jobs_by_ids, cancelled)}:
+            await self._notify_batch(batch_id, client_id)
+        return len(cancelled) + len(running)
+
+    async def cancel(self, job_id: str, status: str = STATUS_CANCELLED) -> bool:
+        """
+        작업 하나만 취소한다 (같은 배치의 다른 작업은 계속 진행). status는 취소 또는 중단(STATUS_STOPPED).
+        - 대기/일시정지 중이면 상태만 바꾼다 (체크포인트는 버림).
+        - 이 프로세스에서 실행 중이면 작업 태스크를 취소한다: 변환 중인 워커는 다음 디코딩 윈도우 경계에서 멈추고
+          바로 다음 작업을 받는다 (취소 요청 → 워커 반환 시간은 transcription_pool.stats()의 cancel_latency).
+        - 다른 프로세스에서 실행 중이면 그 프로세스가 다음 임대 연장 때 취소를 확인하고 멈춘다.
+        """
+        previous = await run_io(self.store.cancel_job, job_id, status)
+        task = self.running.get(job_id)
+        if previous is None and task is None:
+            return False
+        if task is not None:
+            task.cancel()
+        logger.info(f"[JobDispatcher] 작업 취소: {job_id} (이전 상태: {previous}, 이 프로세스에서 실행 중: {task is not None})")
+        job = await run_io(self.store.get_job, job_id)
+        if task is None and job and job.get("batch_id"):
+            # 실행 중이 아니던 작업은 _run_job이 배치 종료를 알리지 않으므로 여기서 확인
+            await self._notify_batch(job["batch_id"], job["client_id"])
+        return True
+
+    async def pause(self, job_id: str) -> bool:
+        """
+        작업을 일시정지한다. 대기 중이면 상태만 바꾸고, 이 프로세스에서 실행 중이면 워커가 다음 윈도우 경계에서
+        멈추며 체크포인트를 남긴다 (CPU는 다른 작업이나 대화형 작업이 사용).
+        다른 프로세스에서 실행 중이면 그 프로세스가 다음 임대 연장 때 일시정지를 확인하고 워커를 멈춘다.
+        """
+        previous = await run_io(self.store.pause_job, job_id)
+        if previous is None:
+            return False
+        if job_id in self.running:
+            self._pause_requested.add(job_id)
+            transcription_pool.pause(job_id)
+        logger.info(f"[JobDispatcher] 작업 일시정지 요청: {job_id} (이전 상태: {previous})")
+        return True
+
+    async def resume(self, job_id: str) -> bool:
+        """일시정지한 작업을 재개한다. 워커가 아직 멈추기 전이면 일시정지 요청만 거두고 그대로 계속 변환한다."""
+        if job_id in self._pause_requested:
+            self._pause_requested.discard(job_id)
+            transcription_pool.clear_pause(job_id)
+            await run_io(self.store.update_job, job_id, status=STATUS_RUNNING)
+            return True
+        resumed = await run_io(self.store.resume_job, job_id)
+        if resumed:
+            logger.info(f"[JobDispatcher] 작업 재개: {job_id}")
+            self.wake()
+        return resumed
+
+    def _jobs_by_ids(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        return [job for job in (self.store.get_job(job_id) for job_id in job_ids) if job]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "owner": self.owner,
+            "max_running": self.max_running,
+            "running": [
+                {"id": job_id, "file_path": job["file_path"], "client_id": job["client_id"], "priority": job["priority"],
+                 "duration": job["duration"], "attempts": job["attempts"]}
+                for job_id, job in self._running_jobs.items()
+            ],
+        }
+
+    # --- 디스패치 루프 --- #
+
+    async def _run(self):
+        while True:
+            try:
+                await run_io(self.store.heartbeat, self.owner)
+                await self._cancel_lost_jobs()
+                await self._pause_stored_pauses()
+                adopted = await run_io(self.store.adopt_expired, self.owner)
+                if adopted:
+                    logger.info(f"[JobDispatcher] 중단된 작업 {len(adopted)}개를 이어받음: {[job['filename'] for job in adopted]}")
+                await self._dispatch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[JobDispatcher] 디스패치 루프 오류: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _cancel_lost_jobs(self):
+        """다른 프로세스에서 취소/삭제했거나 임대를 잃은 작업은 이 프로세스에서도 멈춘다."""
+        for job_id in await run_io(self.store.lost_jobs, self.owner, list(self.running)):
+            task = self.running.get(job_id)
+            if task is not None:
+                logger.info(f"[JobDispatcher] 더 이상 이 프로세스의 작업이 아니므로 중단: {job_id}")
+                task.cancel()
+
+    async def _pause_stored_pauses(self):
+        """다른 프로세스에서 일시정지한 작업은 이 프로세스에서 실행 중이어도 워커를 멈춘다 (체크포인트는 _run_job이 저장)."""
+        for job_id in await run_io(self.store.paused_jobs, self.owner, list(self.running)):
+            if job_id in self.running and job_id not in self._pause_requested:
+                logger.info(f"[JobDispatcher] 다른 프로세스에서 일시정지한 작업을 멈춤: {job_id}")
+                self._pause_requested.add(job_id)
+                transcription_pool.pause(job_id)
+
+    async def _dispatch(self):
+        while len(self.running) < self.max_running and not self._stopping:
+            job = await run_io(self.store.claim_next, self.owner)
+            if job is None:
+                return
+            self._running_jobs[job["id"]] = job
+            self.running[job["id"]] = asyncio.create_task(self._run_job(job))
+
+    async def _run_job(self, job: Dict[str, Any]):
+        result: Dict[str, Any] = {"status": "error", "message": "실행되지 않음", "file_path": job["file_path"]}
+        try:
+            result = await run_whisper_on_file(
+                self.manager, job["client_id"], job["file_path"], job["model"], job["language"], job["engine"],
+                job["options"].get("long_form", "auto"), job_id=job["id"], checkpoint=job.get("checkpoint"),
+            )
+        except asyncio.CancelledError:
+            # 변환 시작 전(메시지 전송 중 등)에 취소된 경우
+            result = {"status": "cancelled", "message": "시작 전 취소됨", "file_path": job["file_path"]}
+        except Exception as e:
+            logger.error(f"[JobDispatcher] 작업 실행 오류 ({job['file_path']}): {e}", exc_info=True)
+            result = {"status": "error", "message": str(e), "file_path": job["file_path"]}
+        finally:
+            self.running.pop(job["id"], None)
+            self._running_jobs.pop(job["id"], None)
+            transcription_pool.clear_pause(job["id"])
+            pause_requested = job["id"] in self._pause_requested
+            self._pause_requested.discard(job["id"])
+            # 서버 종료 중에 끊긴 작업은 끝난 것으로 기록하지 않음 (release로 대기 상태로 돌아가 재시작 후 다시 실행)
+            if not self._stopping:
+                if result.get("status") == "paused":
+                    await run_io(self.store.suspend, job["id"], self.owner, result.get("checkpoint"))
+                    if not pause_requested:
+                        # 워커가 멈추는 사이에 재개 요청이 왔으면 체크포인트에서 바로 다시 실행
+                        await run_io(self.store.resume_job, job["id"])
+                elif not await run_io(self.store.finish, job["id"], self.owner, RESULT_STATUS.get(result.get("status"), STATUS_ERROR), result):
+                    # 일시정지 요청이 워커에 닿기 전에 변환이 끝났으면 일시정지 상태로 남기고 워커가 멈췄음을 기록 (재개하면 다시 실행)
+                    await run_io(self.store.suspend, job["id"], self.owner, None)
+                self.wake()
+        if not self._stopping and job.get("batch_id") and result.get("status") != "paused":
+            await self._notify_batch(job["batch_id"], job["client_id"])
+
+    async def _notify_batch(self, batch_id: str, client_id: str):
+        """배치의 모든 작업이 끝났으면 클라이언트에 배치 결과를 한 번 보낸다."""
+        if batch_id in self._notified_batches or not self.manager:
+            return
+        summary = await run_io(self.store.batch_summary, batch_id)
+        if any(summary.get(status) for status in ACTIVE_STATUSES):
+            return
+        self._notified_batches.add(batch_id)
+        cancelled_count = summary.get(STATUS_CANCELLED, 0) + summary.get(STATUS_STOPPED, 0)
+        message = {
+            "type": "batch_cancelled" if cancelled_count else "batch_complete",
+            "batch_id": batch_id,
+            "total_files": sum(summary.values()),
+            "completed_count": summary.get(STATUS_COMPLETED, 0),
+            "skipped_count": summary.get(STATUS_SKIPPED, 0),
+            "error_count": summary.get(STATUS_ERROR, 0),
+            "cancelled_count": cancelled_count,
+        }
+        logger.info(f"[JobDispatcher] 배치 종료 (Client: {client_id}): {message}")
+        await self.manager.send_personal_message(message, client_id)
+
+
+job_dispatcher = JobDispatcher(job_manager, MAX_CONCURRENT_WHISPER_TASKS)
@@ -0,0 +1,72 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.services.audio_cache import audio_cache, read_pcm, pcm_duration
+from backend.services.audio_chunker import extract_audio, probe_duration, detect_speech_regions
+from backend.services.whisper_engines import get_engine, TranscriptionCancelled
+
+logger = logging.getLogger(__name__)
+
+# 샘플 구간에 음성이 이보다 적으면 (무음/음악/효과음) 판정에 쓰지 않음
+MIN_SAMPLE_SPEECH_SECONDS = 2.0
+# 샘플 구간의 음성 판정 에너지 하한(dBFS). 짧은 구간은 배경 소음 추정이 어려워 고정값 사용
+SAMPLE_SPEECH_THRESHOLD_DB = -40.0
+TOP_LANGUAGES = 5
+
+
+def sample_windows(duration: float, count: int, sample_seconds: float) -> List[Tuple[float, float]]:
+    """
+    파일 전체에 고르게 퍼진 샘플 구간 목록 [(시작, 끝)] (초). 양 끝(오프닝/엔딩 크레딧)은 피하고
+    (i+1)/(count+1) 지점을 중심으로 잡는다. 파일이 샘플 하나보다 짧으면 파일 전체.
+    """
+    if duration <= sample_seconds:
+        return [(0.0, duration)]
+    windows = []
+    for i in range(count):
+        center = duration * (i + 1) / (count + 1)
+        start = min(max(0.0, center - sample_seconds / 2), duration - sample_seconds)
+        if windows and start < windows[-1][1]:
+            start = windows[-1][1]  # 짧은 파일에서 샘플이 겹치지 않게
+            if start + sample_seconds > duration:
+                break
+        windows.append((round(start, 3), round(start + sample_seconds, 3)))
+    return windows
+
+
+def detect_language_in_samples(media_path: str, model_size: str, engine: Optional[str] = None, samples: int = 3,
+                               sample_seconds: float = 30.0, should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """
+    전체를 변환하지 않고 샘플 구간 몇 개만 디코딩해 언어를 판정한다. 샘플마다 Whisper 언어 감지(윈도우 하나,
+    텍스트 디코딩 없음)를 돌리고, 언어별 확률을 샘플의 음성 길이로 가중 평균한다.
+    오디오 캐시에 이미 있으면 캐시에서 구간을 읽고, 없으면 전체를 추출하지 않고 ffmpeg로 샘플 구간만 디코딩한다.
+    반환: {'language': 가장 가능성 높은 언어 (음성 샘플이 없으면 None), 'probability', 'languages': 상위 언어별 확률,
+           'samples': 판정에 쓴 샘플 목록, 'duration': 파일 길이}
+    """
+    pcm_path = audio_cache.cached_path(media_path)
+    duration = pcm_duration(pcm_path) if pcm_path else probe_duration(media_path)
+    whisper_engine = get_engine(engine)
+    scores: Dict[str, float] = {}
+    used: List[Dict[str, Any]] = []
+    for start, end in sample_windows(duration, samples, sample_seconds):
+        if should_stop and should_stop():
+            raise TranscriptionCancelled("언어 감지 중 취소됨")
+        if pcm_path:
+            audio = read_pcm(pcm_path, start, end)
+        else:
+            audio = extract_audio(media_path, start=start, duration=end - start)
+        speech = sum(region.duration for region in detect_speech_regions(audio, threshold_db=SAMPLE_SPEECH_THRESHOLD_DB))
+        if speech < MIN_SAMPLE_SPEECH_SECONDS:
+            continue
+        probs = whisper_engine.detect_language(model_size, audio)
+        for language, probability in probs.items():
+            scores[language] = scores.get(language, 0.0) + probability * speech
+        used.append({"start": start, "end": end, "speech": round(speech, 2), "language": max(probs, key=probs.get)})
+
+    total_speech = sum(sample["speech"] for sample in used)
+    if not total_speech:
+        return {"language": None, "probability": 0.0, "languages": {}, "samples": used, "duration": duration}
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:TOP_LANGUAGES]
+    languages = {language: round(score / total_speech, 4) for language, score in ranked}
+    language = ranked[0][0]
+    logger.info(f"[LanguageProbe] {media_path}: {language} ({languages[language]:.2f}), 샘플 {len(used)}개")
+    return {"language": language, "probability": languages[language], "languages": languages, "samples": used, "duration": duration}
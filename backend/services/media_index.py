@@ -0,0 +1,486 @@
+import os
+import json
+import base64
+import hashlib
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+from backend.config import settings
+from backend.services.file_scanner import scan_directory_level, folder_count_cache, walk_parallel
+
+logger = logging.getLogger(__name__)
+
+# 스키마가 바뀌면 올려서 기존 인덱스를 버리고 새로 만든다 (인덱스는 캐시이므로 마이그레이션 불필요)
+SCHEMA_VERSION = 5
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# query_page 정렬 키 (동률은 항상 path로 정렬해 커서가 유일하게 정해지도록 함)
+SORT_KEYS = {"path", "name", "size", "mtime"}
+MAX_PAGE_SIZE = 1000
+
+# 스캔 중 이 개수의 디렉토리마다 인덱스에 기록 (스트리밍 스캔의 메모리 상한)
+REFRESH_BATCH_DIRS = 200
+
+
+def _resolve_db_path(db_path: str) -> Path:
+    """상대 경로는 프로젝트 루트 기준으로 해석한다."""
+    path = Path(db_path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _query_key(query: Dict[str, Any]) -> str:
+    """커서를 발급한 조회 조건(경로/정렬/필터)의 지문. 다른 조건으로 커서를 쓰면 행이 중복되거나 빠지므로 비교에 사용."""
+    return hashlib.sha1(json.dumps(query, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_cursor(values: list, query_key: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([*values, query_key], ensure_ascii=False).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, query_key: str) -> list:
+    """커서 → [마지막 정렬 값, 마지막 path]. 형식이 잘못됐거나 다른 정렬/필터로 발급된 커서면 ValueError."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+    if not isinstance(values, list) or len(values) != 3:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+    if values[2] != query_key:
+        raise ValueError("커서가 발급된 경로/정렬/필터와 요청 조건이 다릅니다. 첫 페이지부터 다시 요청하세요.")
+    return values[:2]
+
+
+def _subtree_range(directory: str) -> (str, str):
+    """directory 하위 경로 전체를 덮는 [lower, upper) 문자열 범위 (PRIMARY KEY 범위 스캔용)."""
+    prefix = directory.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class MediaIndex:
+    """
+    미디어 파일 스캔 결과를 SQLite(WAL 모드)에 영속 저장하는 인덱스.
+    /api/files 등은 인덱스에서 바로 응답하고, 파일시스템은 refresh 시에만 접근한다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = _resolve_db_path(db_path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        logger.info(f"미디어 인덱스 열림: {self.db_path}")
+
+    def _init_schema(self):
+        with self.lock:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                logger.info(f"미디어 인덱스 스키마 변경 ({version} -> {SCHEMA_VERSION}), 인덱스를 새로 만듭니다.")
+                self.conn.executescript("""
+                    DROP TABLE IF EXISTS media;
+                    DROP TABLE IF EXISTS dirs;
+                    DROP TABLE IF EXISTS scanned_roots;
+                    DROP TABLE IF EXISTS language_probes;
+                """)
+            self.conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS media (
+                    path TEXT PRIMARY KEY,
+                    dir TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    has_subtitle INTEGER NOT NULL,
+                    subtitle_files TEXT NOT NULL,
+                    subtitle_langs TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_media_dir ON media(dir);
+                CREATE INDEX IF NOT EXISTS idx_media_name ON media(name, path);
+                CREATE INDEX IF NOT EXISTS idx_media_size ON media(size, path);
+                CREATE INDEX IF NOT EXISTS idx_media_mtime ON media(mtime, path);
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    subdirs TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS scanned_roots (
+                    path TEXT PRIMARY KEY,
+                    scanned_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS language_probes (
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    model TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    probed_at REAL NOT NULL,
+                    PRIMARY KEY (path, model)
+                );
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+            self.conn.commit()
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "name": row["name"],
+            "path": row["path"],
+            "type": row["type"],
+            "size": row["size"],
+            "mtime": row["mtime"],
+            "has_subtitle": bool(row["has_subtitle"]),
+            "subtitle_files": json.loads(row["subtitle_files"]),
+            "subtitle_languages": [lang for lang in row["subtitle_langs"].split(",") if lang],
+        }
+
+    @staticmethod
+    def _entry_to_row(entry: Dict[str, Any], directory: str) -> tuple:
+        return (
+            entry["path"],
+            directory,
+            entry["name"],
+            entry["type"],
+            entry.get("size", 0),
+            entry.get("mtime", 0.0),
+            1 if entry["has_subtitle"] else 0,
+            json.dumps(entry["subtitle_files"], ensure_ascii=False),
+            # ',en,pt-br,' 형태로 저장해 LIKE '%,en,%'로 언어 필터링
+            "," + ",".join(entry.get("subtitle_languages", [])) + ",",
+        )
+
+    def last_scanned(self, directory: str) -> Optional[float]:
+        """directory 자신 또는 조상 디렉토리가 스캔된 가장 최근 시각. 인덱스에 없으면 None."""
+        directory = str(Path(directory).resolve())
+        candidates = [directory] + [str(p) for p in Path(directory).parents]
+        placeholders = ",".join("?" * len(candidates))
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT MAX(scanned_at) FROM scanned_roots WHERE path IN ({placeholders})", candidates
+            ).fetchone()
+        return row[0] if row else None
+
+    def refresh(self, directory: str, incremental: bool = False, mark_scanned: bool = True) -> Dict[str, int]:
+        """
+        directory 하위를 파일시스템에서 다시 스캔해 인덱스를 갱신한다.
+        incremental=True면 모든 디렉토리를 stat만 하고, 지난 스캔 이후 mtime/inode가 바뀐 디렉토리만
+        다시 목록을 읽는다. 바뀌지 않은 디렉토리는 기존 결과와 하위 디렉토리 목록을 재사용한다.
+        (디렉토리 mtime은 항목 추가/삭제/이름 변경에만 바뀌므로, 파일 내용만 바뀐 경우의 size/mtime은 전체 스캔에서 갱신된다)
+        mark_scanned=False면 scanned_roots(조회 시 최신성 판단용)는 건드리지 않는다.
+        반환: {'files': 인덱싱된 파일 수, 'dirs_listed': 다시 읽은 디렉토리 수, 'dirs_reused': 재사용한 디렉토리 수, 'dirs_removed': 사라진 디렉토리 수}
+        """
+        start_time = time.time()
+        stats: Dict[str, int] = {}
+        for _ in self.iter_refresh(directory, incremental=incremental, mark_scanned=mark_scanned, stats=stats):
+            pass
+        logger.info(f"미디어 인덱스 갱신 완료 ({'증분' if incremental else '전체'}): {directory} {stats} ({time.time() - start_time:.2f}초)")
+        return stats
+
+    def _store_listed(self, listed: Dict[str, List[Dict[str, Any]]], dir_rows: List[tuple]):
+        """다시 읽은 디렉토리들의 미디어 행과 디렉토리 행을 한 트랜잭션으로 교체한다."""
+        with self.lock:
+            with self.conn:
+                for path, entries in listed.items():
+                    self.conn.execute("DELETE FROM media WHERE dir = ?", (path,))
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [self._entry_to_row(e, path) for e in entries],
+                    )
+                self.conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)", dir_rows)
+
+    def _query_dir(self, directory: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM media WHERE dir = ? ORDER BY path", (directory,)).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def iter_refresh(self, directory: str, incremental: bool = False, mark_scanned: bool = True,
+                     stats: Optional[Dict[str, int]] = None, include_reused: bool = False) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        refresh()와 같은 순회를 하면서 디렉토리를 읽는 즉시 (디렉토리, 미디어 목록)을 생성한다 (스트리밍 스캔용).
+        결과는 REFRESH_BATCH_DIRS개 디렉토리마다 인덱스에 기록하므로 전체 목록을 메모리에 모아두지 않는다.
+        include_reused=True면 증분 스캔에서 재사용된 디렉토리의 기존 결과도 인덱스에서 읽어 생성한다.
+        순회가 끝나면 stats에 refresh()와 같은 집계를 채운다. 중간에 멈추면 그때까지 읽은 디렉토리만 반영된다.
+        """
+        directory = str(Path(directory).resolve())
+        stats = stats if stats is not None else {}
+        lower, upper = _subtree_range(directory)
+        with self.lock:
+            known_dirs = {
+                row["path"]: row for row in self.conn.execute(
+                    "SELECT * FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (directory, lower, upper)
+                )
+            }
+
+        def visit(current: str):
+            try:
+                # 목록보다 stat을 먼저 읽어야 그 사이의 변경이 다음 증분 스캔에서 잡힌다
+                stat_result = os.stat(current)
+            except OSError as e:
+                logger.warning(f"[MediaIndex.refresh] 디렉토리 stat 실패: {current} - {e}")
+                return None, []
+            known = known_dirs.get(current)
+            if (incremental and known is not None
+                    and known["mtime_ns"] == stat_result.st_mtime_ns and known["inode"] == stat_result.st_ino):
+                return "reused", json.loads(known["subdirs"])
+            entries, subdirs = scan_directory_level(current)
+            folder_count_cache.update_level(current, entries, subdirs)
+            return (entries, (current, stat_result.st_mtime_ns, stat_result.st_ino, json.dumps(subdirs, ensure_ascii=False))), subdirs
+
+        pending_listed: Dict[str, List[Dict[str, Any]]] = {}
+        pending_rows: List[tuple] = []
+        seen = set()
+        listed_count = 0
+        reused = 0
+        try:
+            # 독립된 디렉토리는 스캔 스레드 풀에서 동시에 stat/목록 읽기
+            for current, outcome in walk_parallel(directory, visit):
+                if outcome is None:
+                    continue
+                seen.add(current)
+                if outcome == "reused":
+                    reused += 1
+                    if include_reused:
+                        yield current, self._query_dir(current)
+                    continue
+                entries, dir_row = outcome
+                pending_listed[current] = entries
+                pending_rows.append(dir_row)
+                listed_count += 1
+                if len(pending_listed) >= REFRESH_BATCH_DIRS:
+                    self._store_listed(pending_listed, pending_rows)
+                    pending_listed, pending_rows = {}, []
+                yield current, entries
+        finally:
+            # 중간에 멈춰도 이미 읽은 디렉토리는 기록 (사라진 디렉토리 정리와 스캔 시각 기록은 끝까지 돈 경우에만)
+            if pending_listed:
+                self._store_listed(pending_listed, pending_rows)
+
+        removed = [path for path in known_dirs if path not in seen]
+        with self.lock:
+            with self.conn:
+                for path in removed:
+                    self.conn.execute("DELETE FROM media WHERE dir = ?", (path,))
+                    self.conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+                if mark_scanned:
+                    # 하위 루트 기록은 이번 스캔으로 대체된다
+                    self.conn.execute("DELETE FROM scanned_roots WHERE path >= ? AND path < ?", (lower, upper))
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO scanned_roots VALUES (?, ?)", (directory, time.time())
+                    )
+                total = self.conn.execute(
+                    "SELECT COUNT(*) FROM media WHERE path >= ? AND path < ?", (lower, upper)
+                ).fetchone()[0]
+        # 사라진 디렉토리는 /browse 폴더 개수 캐시에서도 제거 (다시 읽은 디렉토리는 visit에서 update_level로 반영됨)
+        for path in removed:
+            folder_count_cache.invalidate(path)
+        stats.update({"files": total, "dirs_listed": listed_count, "dirs_reused": reused, "dirs_removed": len(removed)})
+
+    def _delete_subtree_locked(self, directory: str):
+        """directory와 그 하위의 인덱스 항목을 모두 지운다 (self.lock과 트랜잭션 안에서 호출)."""
+        lower, upper = _subtree_range(directory)
+        self.conn.execute("DELETE FROM media WHERE dir = ? OR (path >= ? AND path < ?)", (directory, lower, upper))
+        self.conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (directory, lower, upper))
+
+    def relist_directory(self, directory: str) -> bool:
+        """
+        인덱싱된 디렉토리 하나만 다시 읽어 반영한다 (디렉토리 목록 1회).
+        사라진 하위 디렉토리는 인덱스에서 지우고, 새로 생긴 하위 디렉토리는 전체 스캔한다.
+        인덱스에 없는 디렉토리면 아무것도 하지 않고 False를 반환한다.
+        """
+        with self.lock:
+            known = self.conn.execute("SELECT * FROM dirs WHERE path = ?", (directory,)).fetchone()
+        if known is None:
+            return False
+        try:
+            stat_result = os.stat(directory)
+        except OSError:
+            # 디렉토리 자체가 사라짐
+            with self.lock:
+                with self.conn:
+                    self._delete_subtree_locked(directory)
+            logger.info(f"미디어 인덱스: 사라진 디렉토리 제거 - {directory}")
+            return True
+        entries, subdirs = scan_directory_level(directory)
+        folder_count_cache.update_level(directory, entries, subdirs)
+        old_subdirs = set(json.loads(known["subdirs"]))
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM media WHERE dir = ?", (directory,))
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._entry_to_row(e, directory) for e in entries],
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)",
+                    (directory, stat_result.st_mtime_ns, stat_result.st_ino, json.dumps(subdirs, ensure_ascii=False)),
+                )
+                for gone in old_subdirs - set(subdirs):
+                    self._delete_subtree_locked(gone)
+        for added in set(subdirs) - old_subdirs:
+            self.refresh(added, mark_scanned=False)
+        logger.debug(f"미디어 인덱스: 디렉토리 갱신 - {directory} ({len(entries)}개)")
+        return True
+
+    def update_paths(self, paths: Iterable[str]) -> int:
+        """
+        변경(생성/삭제/이름 변경)된 파일·디렉토리 경로들의 상위 디렉토리만 다시 읽어 인덱스에 반영한다.
+        파일 감시기와, 자막 파일을 저장/삭제한 직후의 코드에서 호출한다. 갱신된 디렉토리 수를 반환.
+        """
+        paths = list(paths)
+        for path in paths:
+            folder_count_cache.invalidate(path)
+        directories = {os.path.dirname(os.path.realpath(p)) for p in paths}
+        return sum(1 for d in sorted(directories) if self.relist_directory(d))
+
+    def cached_language(self, path: str, model: str) -> Optional[Dict[str, Any]]:
+        """model로 저장해 둔 언어 사전 감지 결과 (다른 모델의 결과는 쓰지 않음). 파일이 그 뒤로 바뀌었으면(size/mtime) None."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT size, mtime, result FROM language_probes WHERE path = ? AND model = ?", (path, model)).fetchone()
+        if row is None or row["size"] != st.st_size or row["mtime"] != st.st_mtime:
+            return None
+        return json.loads(row["result"])
+
+    def store_language(self, path: str, model: str, result: Dict[str, Any]):
+        """언어 사전 감지 결과를 파일·모델별로 저장한다 (디렉토리 재스캔과 무관하게 유지)."""
+        st = os.stat(path)
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO language_probes VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, st.st_size, st.st_mtime, model, json.dumps(result, ensure_ascii=False), time.time()),
+                )
+
+    def indexed_roots(self) -> List[str]:
+        """scanned_roots에 기록된 (최상위) 스캔 루트 목록."""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT path FROM scanned_roots ORDER BY path")]
+
+    def query(self, directory: str, filter_video: bool = True, filter_audio: bool = True) -> List[Dict[str, Any]]:
+        """인덱스에서 directory 하위 미디어 파일 목록을 scan_media_files와 같은 형식으로 반환."""
+        types = []
+        if filter_video:
+            types.append("video")
+        if filter_audio:
+            types.append("audio")
+        if not types:
+            return []
+        lower, upper = _subtree_range(str(Path(directory).resolve()))
+        placeholders = ",".join("?" * len(types))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM media WHERE path >= ? AND path < ? AND type IN ({placeholders}) ORDER BY path",
+                (lower, upper, *types),
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def query_page(self, directory: str, limit: int = 100, cursor: Optional[str] = None,
+                   sort: str = "path", order: str = "asc", types: Optional[List[str]] = None,
+                   has_subtitle: Optional[bool] = None, subtitle_lang: Optional[str] = None,
+                   name_contains: Optional[str] = None, min_size: Optional[int] = None, max_size: Optional[int] = None,
+                   modified_after: Optional[float] = None, modified_before: Optional[float] = None) -> Dict[str, Any]:
+        """
+        인덱스에서 directory 하위 미디어 파일을 필터/정렬해 한 페이지씩 반환한다 (커서 기반 페이지네이션).
+        커서는 마지막 행의 (정렬 값, path)이므로 OFFSET 없이 인덱스 범위 검색으로 다음 페이지를 읽는다.
+        커서에는 발급한 조회 조건의 지문도 들어 있어, 정렬/필터를 바꿔 이어서 요청하면 ValueError.
+        반환: {'files': [...], 'next_cursor': str|None, 'total': 첫 페이지(cursor 없음)일 때만 전체 개수, 그 외 None}
+        잘못된 sort/order/cursor는 ValueError.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"지원하지 않는 정렬 키입니다: {sort} (가능: {', '.join(sorted(SORT_KEYS))})")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"order는 asc 또는 desc여야 합니다: {order}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        directory = str(Path(directory).resolve())
+        query_key = _query_key({
+            "directory": directory, "sort": sort, "order": order, "types": sorted(types) if types is not None else None,
+            "has_subtitle": has_subtitle, "subtitle_lang": subtitle_lang.lower().replace("_", "-") if subtitle_lang else None,
+            "name_contains": name_contains or None, "min_size": min_size, "max_size": max_size,
+            "modified_after": modified_after, "modified_before": modified_before,
+        })
+        if cursor is not None:
+            last_value, last_path = _decode_cursor(cursor, query_key)
+
+        lower, upper = _subtree_range(directory)
+        where = ["path >= ?", "path < ?"]
+        params: List[Any] = [lower, upper]
+        if types is not None:
+            if not types:
+                return {"files": [], "next_cursor": None, "total": 0 if cursor is None else None}
+            where.append(f"type IN ({','.join('?' * len(types))})")
+            params.extend(types)
+        if has_subtitle is not None:
+            where.append("has_subtitle = ?")
+            params.append(1 if has_subtitle else 0)
+        if subtitle_lang:
+            # 'pt'는 'pt'와 'pt-br' 모두, 'pt-br'은 정확히 일치하는 것만
+            lang = subtitle_lang.lower().replace("_", "-")
+            where.append("(subtitle_langs LIKE ? OR subtitle_langs LIKE ?)")
+            params.extend([f"%,{lang},%", f"%,{lang}-%"])
+        if name_contains:
+            escaped = name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        for clause, value in (("size >= ?", min_size), ("size <= ?", max_size),
+                              ("mtime >= ?", modified_after), ("mtime <= ?", modified_before)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+
+        total = None
+        with self.lock:
+            if cursor is None:
+                total = self.conn.execute(f"SELECT COUNT(*) FROM media WHERE {' AND '.join(where)}", params).fetchone()[0]
+
+            page_where, page_params = list(where), list(params)
+            op = ">" if order == "asc" else "<"
+            if cursor is not None:
+                if sort == "path":
+                    page_where.append(f"path {op} ?")
+                    page_params.append(last_path)
+                else:
+                    page_where.append(f"({sort} {op} ? OR ({sort} = ? AND path {op} ?))")
+                    page_params.extend([last_value, last_value, last_path])
+            order_by = f"path {order}" if sort == "path" else f"{sort} {order}, path {order}"
+            rows = self.conn.execute(
+                f"SELECT * FROM media WHERE {' AND '.join(page_where)} ORDER BY {order_by} LIMIT ?",
+                (*page_params, limit + 1),
+            ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor([rows[-1][sort], rows[-1]["path"]], query_key)
+        return {"files": [self._row_to_entry(row) for row in rows], "next_cursor": next_cursor, "total": total}
+
+    def get_media_files(self, directory: str, filter_video: bool = True, filter_audio: bool = True, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        인덱스 기반 미디어 목록 조회. 인덱스에 없거나 refresh=True면 전체 스캔,
+        media_index_max_age보다 오래됐으면 증분 스캔을 먼저 수행한다.
+        """
+        self.ensure_fresh(directory, refresh)
+        return self.query(directory, filter_video, filter_audio)
+
+    def ensure_fresh(self, directory: str, refresh: bool = False):
+        """인덱스에 없거나 refresh=True면 전체 스캔, media_index_max_age보다 오래됐으면 증분 스캔한다."""
+        scanned_at = self.last_scanned(directory)
+        if refresh or scanned_at is None:
+            self.refresh(directory)
+        elif time.time() - scanned_at > settings.media_index_max_age:
+            self.refresh(directory, incremental=True)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+media_index = MediaIndex(settings.media_index_path)
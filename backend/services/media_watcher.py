@@ -0,0 +1,140 @@
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from backend.config import settings
+from backend.services.file_scanner import VIDEO_EXTENSIONS, AUDIO_EXTENSIONS, SUBTITLE_EXTENSIONS
+from backend.services.media_index import MediaIndex, media_index
+
+try:
+    import watchfiles  # inotify(리눅스) 기반 파일 감시, 없으면 polling 모드로 동작
+except ImportError:
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+# inotify 이벤트가 전달되지 않는 네트워크/FUSE 파일시스템
+NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "fuse.rclone", "9p"}
+
+WATCHED_EXTENSIONS = VIDEO_EXTENSIONS | AUDIO_EXTENSIONS | SUBTITLE_EXTENSIONS
+
+
+def get_filesystem_type(path: str) -> Optional[str]:
+    """/proc/mounts에서 path가 속한 마운트의 파일시스템 종류를 찾는다 (리눅스 외에는 None)."""
+    try:
+        target = os.path.realpath(path)
+        best_mount, best_type = "", None
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mount_point = parts[1].replace("\\040", " ")
+                if (target == mount_point or target.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best_mount):
+                    best_mount, best_type = mount_point, parts[2]
+        return best_type
+    except OSError:
+        return None
+
+
+class MediaWatcher:
+    """
+    미디어 루트 아래의 생성/삭제/이름 변경 이벤트를 받아 MediaIndex를 실시간으로 갱신하는 백그라운드 서비스.
+    - inotify 모드: watchfiles로 이벤트를 받고, 바뀐 경로의 상위 디렉토리만 다시 읽는다.
+    - polling 모드: inotify가 동작하지 않는 네트워크 마운트용. 주기적으로 인덱싱된 루트를 증분 재스캔한다
+      (디렉토리 stat만 하므로 파일 수와 무관하게 가볍다).
+    """
+
+    def __init__(self, index: MediaIndex, root: str, mode: str = "auto", poll_interval: int = 60):
+        self.index = index
+        self.root = str(Path(root).resolve())
+        self.requested_mode = mode
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _resolve_mode(self) -> str:
+        mode = self.requested_mode
+        if mode == "auto":
+            fs_type = get_filesystem_type(self.root)
+            if fs_type in NETWORK_FS_TYPES:
+                logger.info(f"[MediaWatcher] 네트워크 파일시스템({fs_type}) 감지, polling 모드 사용")
+                mode = "polling"
+            else:
+                mode = "inotify"
+        if mode == "inotify" and watchfiles is None:
+            logger.warning("[MediaWatcher] watchfiles 패키지가 없어 polling 모드로 전환합니다.")
+            mode = "polling"
+        return mode
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        if self.requested_mode == "off":
+            logger.info("[MediaWatcher] 비활성화됨 (media_watch_mode=off)")
+            return
+        if not os.path.isdir(self.root):
+            logger.warning(f"[MediaWatcher] 감시할 디렉토리가 없습니다: {self.root}")
+            return
+        self.mode = self._resolve_mode()
+        self._stop_event.clear()
+        target = self._run_inotify if self.mode == "inotify" else self._run_polling
+        self._thread = threading.Thread(target=target, name="media-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"[MediaWatcher] 시작: {self.root} (모드: {self.mode})")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("[MediaWatcher] 중지됨")
+
+    @staticmethod
+    def _is_relevant(change, path: str) -> bool:
+        """미디어/자막 파일이나 디렉토리(삭제된 경우 확장자 없음으로 추정)에 대한 이벤트만 처리한다."""
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix in WATCHED_EXTENSIONS:
+            return True
+        return os.path.isdir(path) or (change == watchfiles.Change.deleted and not suffix)
+
+    def handle_changes(self, changes: Set[Tuple[object, str]]) -> int:
+        paths = [path for change, path in changes if self._is_relevant(change, path)]
+        if not paths:
+            return 0
+        updated = self.index.update_paths(paths)
+        logger.info(f"[MediaWatcher] 변경 {len(paths)}건 반영 (디렉토리 {updated}개 갱신)")
+        return updated
+
+    def _run_inotify(self):
+        try:
+            for changes in watchfiles.watch(self.root, stop_event=self._stop_event, ignore_permission_denied=True):
+                try:
+                    self.handle_changes(changes)
+                except Exception as e:
+                    logger.error(f"[MediaWatcher] 변경 반영 중 오류: {e}", exc_info=True)
+        except Exception as e:
+            # inotify 감시 한도 초과(ENOSPC) 등
+            if self._stop_event.is_set():
+                return
+            logger.warning(f"[MediaWatcher] inotify 감시 실패, polling 모드로 전환: {e}")
+            self.mode = "polling"
+            self._run_polling()
+
+    def _run_polling(self):
+        while not self._stop_event.wait(self.poll_interval):
+            for root in self.index.indexed_roots():
+                if self._stop_event.is_set():
+                    return
+                if root != self.root and not root.startswith(self.root.rstrip(os.sep) + os.sep):
+                    continue
+                try:
+                    self.index.refresh(root, incremental=True)
+                except Exception as e:
+                    logger.error(f"[MediaWatcher] polling 재스캔 중 오류 ({root}): {e}", exc_info=True)
+
+
+media_watcher = MediaWatcher(media_index, settings.nas_media_path, settings.media_watch_mode, settings.media_watch_poll_interval)
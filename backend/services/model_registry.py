@@ -0,0 +1,204 @@
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 파라미터 수를 알 수 없을 때 사용하는 모델별 대략적인 메모리 사용량(MB, fp32 기준)
+APPROX_MODEL_MB = {
+    "tiny": 150, "tiny.en": 150,
+    "base": 290, "base.en": 290,
+    "small": 970, "small.en": 970,
+    "medium": 3060, "medium.en": 3060,
+    "large": 6170, "large-v1": 6170, "large-v2": 6170, "large-v3": 6170, "turbo": 3240,
+}
+
+ModelKey = Tuple[str, str, str]  # (name, device, dtype)
+
+
+def _default_device() -> str:
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def load_whisper_model(name: str, device: str, dtype: str):
+    """openai-whisper 모델 로더 (레지스트리 기본 로더)"""
+    import whisper
+    model = whisper.load_model(name, device=device)
+    if dtype == "float16":
+        model = model.half()
+    return model
+
+
+def estimate_model_bytes(name: str, model: Any, dtype: str) -> int:
+    """모델이 차지하는 메모리(바이트)를 추정한다. torch 모듈이면 파라미터/버퍼 크기 합, 아니면 APPROX_MODEL_MB."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        total = sum(t.numel() * t.element_size() for t in tensors)
+        if total:
+            return total
+    except Exception:
+        pass
+    approx_mb = APPROX_MODEL_MB.get(name, 1000)
+    if dtype in ("float16", "int8_float16", "bfloat16"):
+        approx_mb //= 2
+    elif dtype.startswith("int8"):
+        approx_mb //= 4
+    return approx_mb * 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ("model", "size", "lock", "users", "loaded_at")
+
+    def __init__(self, model: Any, size: int):
+        self.model = model
+        self.size = size
+        # whisper는 디코딩 중 모델에 kv-cache hook을 설치하므로 같은 인스턴스를 동시에 쓰면 안 됨
+        self.lock = threading.Lock()
+        self.users = 0
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 Whisper 모델 캐시. (name, device, dtype)별로 한 번만 로드해 재사용하고,
+    메모리 예산(memory_budget_mb)을 넘으면 가장 오래 사용하지 않은 모델부터 내린다 (사용 중인 모델은 제외).
+    """
+
+    def __init__(self, memory_budget_mb: int, loader: Callable[[str, str, str], Any] = load_whisper_model,
+                 size_estimator: Callable[[str, Any, str], int] = estimate_model_bytes):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._loader = loader
+        self._size_estimator = size_estimator
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def resolve_key(name: str, device: Optional[str] = None, dtype: Optional[str] = None) -> ModelKey:
+        if device in (None, "", "auto"):
+            device = settings.whisper_device if settings.whisper_device not in ("", "auto") else _default_device()
+        if not dtype:
+            dtype = "float16" if device.startswith("cuda") else "float32"
+        return name, device, dtype
+
+    def _get_entry(self, key: ModelKey) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # 같은 모델을 동시에 요청하면 한 스레드만 로드하고 나머지는 기다렸다가 재사용
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+            name, device, dtype = key
+            start = time.time()
+            model = self._loader(name, device, dtype)
+            entry = _Entry(model, self._size_estimator(name, model, dtype))
+            logger.info(f"[ModelRegistry] 모델 로드: {key} ({entry.size / 1024 / 1024:.0f}MB, {time.time() - start:.1f}초)")
+            with self._lock:
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self.loads += 1
+                self._evict_locked(keep=key)
+        return entry
+
+    def _evict_locked(self, keep: Optional[ModelKey] = None) -> int:
+        evicted = 0
+        for key in list(self._entries):
+            if self._total_bytes_locked() <= self.memory_budget:
+                break
+            entry = self._entries[key]
+            if key == keep or entry.users:
+                continue
+            del self._entries[key]
+            self.evictions += 1
+            evicted += 1
+            logger.info(f"[ModelRegistry] 메모리 예산 초과로 모델 해제: {key}")
+        if evicted:
+            gc.collect()
+        return evicted
+
+    def _total_bytes_locked(self) -> int:
+        return sum(entry.size for entry in self._entries.values())
+
+    def get(self, name: str, device: Optional[str] = None, dtype: Optional[str] = None) -> Any:
+        """모델을 (필요하면 로드해서) 반환한다. 여러 스레드에서 동시에 추론하려면 use()를 사용할 것."""
+        return self._get_entry(self.resolve_key(name, device, dtype)).model
+
+    @contextmanager
+    def use(self, name: str, device: Optional[str] = None, dtype: Optional[str] = None) -> Iterator[Any]:
+        """모델을 독점 사용한다. 사용 중에는 LRU 해제 대상에서 제외된다."""
+        key = self.resolve_key(name, device, dtype)
+        while True:
+            entry = self._get_entry(key)
+            with self._lock:
+                # 로드 직후 다른 스레드가 해제했으면 다시 로드
+                if self._entries.get(key) is entry:
+                    entry.users += 1
+                    break
+        try:
+            with entry.lock:
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.users -= 1
+                self._evict_locked()
+
+    def transcribe(self, name: str, audio, device: Optional[str] = None, dtype: Optional[str] = None, **kwargs) -> Dict:
+        """캐시된 모델로 model.transcribe를 실행한다. fp16 옵션은 dtype에 맞춰 기본 설정."""
+        key = self.resolve_key(name, device, dtype)
+        kwargs.setdefault("fp16", key[2] == "float16")
+        with self.use(*key) as model:
+            return model.transcribe(audio, **kwargs)
+
+    def warm_up(self, names: List[str], device: Optional[str] = None, dtype: Optional[str] = None):
+        """서버 시작 시 자주 쓰는 모델을 미리 로드한다 (실패해도 서버 동작에는 영향 없음)."""
+        for name in names:
+            try:
+                self.get(name, device, dtype)
+            except Exception as e:
+                logger.warning(f"[ModelRegistry] 모델 예열 실패 ({name}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": [
+                    {"name": key[0], "device": key[1], "dtype": key[2], "size_mb": round(entry.size / 1024 / 1024, 1), "in_use": entry.users > 0}
+                    for key, entry in self._entries.items()
+                ],
+                "total_mb": round(self._total_bytes_locked() / 1024 / 1024, 1),
+                "budget_mb": round(self.memory_budget / 1024 / 1024, 1),
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if not entry.users]:
+                del self._entries[key]
+        gc.collect()
+
+
+whisper_models = ModelRegistry(settings.whisper_model_cache_mb)
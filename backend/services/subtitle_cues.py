@@ -0,0 +1,152 @@
+import re
+from itertools import chain
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# SRT 블록: 시각 줄과 그 다음 빈 줄까지의 텍스트 줄들 (번호 줄은 무시)
+SRT_BLOCK_RE = re.compile(
+    r'(\d+):(\d{2}):(\d{2})[,.](\d{3})[ \t]*-->[ \t]*(\d+):(\d{2}):(\d{2})[,.](\d{3})[^\n]*(?:\n|\Z)((?:[^\n]*\S[^\n]*(?:\n|\Z))*)'
+)
+# 시각 그룹별 밀리초 배수 (시, 분, 초, 밀리초)
+TIME_UNITS_MS = np.array([3600000, 60000, 1000, 1], dtype=np.int64)
+
+
+class CueStore:
+    """
+    자막 큐를 병렬 배열로 보관하는 저장소 (pysrt 객체 없이).
+    - starts/ends: 시작 시각 순으로 정렬된 int32 밀리초 배열
+    - 텍스트는 하나의 문자열에 이어 붙이고 text_offsets[i]:text_offsets[i+1]로 i번째 큐의 텍스트를 찾는다.
+    - 구간 조회는 searchsorted(이진 탐색)로 O(log n), 전체 이동은 배열 덧셈 한 번.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, texts: Iterable[str]):
+        texts = list(texts)
+        self.starts = np.ascontiguousarray(starts, dtype=np.int32)
+        self.ends = np.ascontiguousarray(ends, dtype=np.int32)
+        self.text_buffer = ''.join(texts)
+        self.text_offsets = np.concatenate(([0], np.cumsum([len(text) for text in texts], dtype=np.int64)))
+        self._max_ends: Optional[np.ndarray] = None
+        self._sort()
+
+    def _sort(self):
+        """시작 시각 순으로 정렬 (이미 정렬돼 있으면 그대로, 같은 시각은 원래 순서 유지)"""
+        self._max_ends = None
+        if not len(self.starts) or np.all(self.starts[1:] >= self.starts[:-1]):
+            return
+        order = np.argsort(self.starts, kind='stable')
+        texts = list(self.texts())
+        texts = [texts[i] for i in order.tolist()]
+        self.starts, self.ends = self.starts[order], self.ends[order]
+        self.text_buffer = ''.join(texts)
+        self.text_offsets = np.concatenate(([0], np.cumsum([len(text) for text in texts], dtype=np.int64)))
+
+    @classmethod
+    def from_srt(cls, content: str) -> "CueStore":
+        """
+        SRT 텍스트를 파싱한다. 시각은 정규식 한 번으로 모아 NumPy로 한꺼번에 밀리초로 바꾼다.
+        텍스트가 빈 큐는 버린다 (SAMI/ASS에서는 빈 자막을 나타낼 수 없으므로 모든 형식에서 같게).
+        """
+        content = content.lstrip('\ufeff').replace('\r\n', '\n').replace('\r', '\n')
+        return cls.from_matches(SRT_BLOCK_RE.findall(content))
+
+    @classmethod
+    def from_matches(cls, matches: List[Tuple[str, ...]], clean: Callable[[str], str] = lambda text: text) -> "CueStore":
+        """SRT/VTT 정규식 findall 결과(시각 그룹 8개 + 텍스트) → CueStore (clean으로 다듬은 텍스트가 빈 큐는 버림)"""
+        texts = [clean(match[8].rstrip('\n')).strip() for match in matches]
+        keep = [i for i, text in enumerate(texts) if text]
+        if not keep:
+            return cls(np.empty(0, np.int32), np.empty(0, np.int32), [])
+        times = (parse_time_fields(matches) @ TIME_UNITS_MS)[keep]
+        return cls(times[:, 0], times[:, 1], (texts[i] for i in keep))
+
+    @classmethod
+    def load_srt(cls, path: str, encoding: str = 'utf-8') -> "CueStore":
+        with open(path, encoding=encoding, errors='replace') as f:
+            return cls.from_srt(f.read())
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, index: int) -> str:
+        return self.text_buffer[self.text_offsets[index]:self.text_offsets[index + 1]]
+
+    def texts(self) -> Iterable[str]:
+        """모든 큐의 텍스트 (순서대로, 경계는 파이썬 리스트로 바꿔 한 번에 읽음)"""
+        offsets = self.text_offsets.tolist()
+        buffer = self.text_buffer
+        return (buffer[begin:end] for begin, end in zip(offsets, offsets[1:]))
+
+    def start_seconds(self) -> np.ndarray:
+        return self.starts / 1000.0
+
+    def end_seconds(self) -> np.ndarray:
+        return self.ends / 1000.0
+
+    # --- 구간 조회 --- #
+
+    def window(self, start: float, end: float) -> np.ndarray:
+        """[start, end) 초 구간과 겹치는 큐의 인덱스 (시작 시각 순)"""
+        if self._max_ends is None:
+            # 겹치는 큐가 있어도 이진 탐색할 수 있도록 끝 시각의 누적 최댓값을 사용
+            self._max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+        start_ms, end_ms = int(round(start * 1000)), int(round(end * 1000))
+        first = int(np.searchsorted(self._max_ends, start_ms, side='right'))
+        last = int(np.searchsorted(self.starts, end_ms, side='left'))
+        if first >= last:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.arange(first, last)
+        return candidates[self.ends[first:last] > start_ms]
+
+    def text_in(self, start: float, end: float, separator: str = ' ') -> str:
+        """구간과 겹치는 큐의 텍스트 (줄바꿈은 separator로)"""
+        return separator.join(self.text(int(i)).replace('\n', separator) for i in self.window(start, end))
+
+    # --- 시각 변경 --- #
+
+    def shift(self, seconds: float):
+        """모든 큐를 seconds만큼 옮긴다 (음수 시각은 0으로)."""
+        delta = int(round(seconds * 1000))
+        self.starts = np.maximum(self.starts + np.int32(delta), 0).astype(np.int32)
+        self.ends = np.maximum(self.ends + np.int32(delta), 0).astype(np.int32)
+        self._max_ends = None
+
+    def set_times(self, starts: np.ndarray, ends: np.ndarray):
+        """i번째 큐의 시각을 starts[i]/ends[i](초)로 바꾼다 (재타이밍 결과 적용, 음수 시각은 0으로, 순서가 바뀌면 다시 정렬)."""
+        self.starts = np.maximum(np.rint(np.asarray(starts) * 1000), 0).astype(np.int32)
+        self.ends = np.maximum(np.rint(np.asarray(ends) * 1000), 0).astype(np.int32)
+        self._sort()
+
+    # --- 저장 --- #
+
+    def to_srt(self) -> str:
+        return ''.join(
+            f"{i}\n{start} --> {end}\n{text}\n\n"
+            for i, start, end, text in zip(range(1, len(self) + 1), format_srt_times(self.starts), format_srt_times(self.ends), self.texts())
+        )
+
+    def save_srt(self, path: str, encoding: str = 'utf-8'):
+        with open(path, 'w', encoding=encoding) as f:
+            f.write(self.to_srt())
+
+
+def parse_time_fields(matches: List[Tuple[str, ...]]) -> np.ndarray:
+    """정규식 findall 결과의 앞 8개 그룹(시작/끝의 시, 분, 초, 밀리초) → (n, 2, 4) 정수 배열 (빈 그룹은 0)"""
+    fields = chain.from_iterable(match[:8] for match in matches)
+    return np.fromiter((int(field) if field else 0 for field in fields), np.int64, count=len(matches) * 8).reshape(-1, 2, 4)
+
+
+def format_srt_times(ms: np.ndarray, separator: str = ',') -> List[str]:
+    """밀리초 배열 → 'HH:MM:SS,mmm' 문자열들 (자릿수마다 ASCII 코드를 배열로 만들어 한 번에 변환, 100시간 이상은 시 자리를 늘림)"""
+    ms = ms.astype(np.int64)
+    hours = ms // 3600000
+    minutes, seconds, millis = ms // 60000 % 60, ms // 1000 % 60, ms % 1000
+    # 'HH:MM:SS,mmm' 틀을 복사하고 숫자 자리만 채움
+    chars = np.tile(np.frombuffer(f"00:00:00{separator}000".encode(), dtype=np.uint8), (len(ms), 1))
+    digits = ((hours, 10), (hours, 1), (minutes, 10), (minutes, 1), (seconds, 10), (seconds, 1), (millis, 100), (millis, 10), (millis, 1))
+    for column, (values, place) in zip((0, 1, 3, 4, 6, 7, 9, 10, 11), digits):
+        chars[:, column] += (values // place % 10).astype(np.uint8)
+    times = chars.view('S12').ravel().astype('U12').tolist()
+    for i in np.flatnonzero(hours >= 100).tolist():
+        times[i] = f"{hours[i]}{times[i][2:]}"
+    return times
@@ -4,6 +4,7 @@ from typing import List, Dict
 import re
 from difflib import SequenceMatcher
 from backend.config import settings
+from backend.services.media_index import media_index
 import logging
 import json
 import time
@@ -387,6 +388,8 @@ def download_subtitle(file_id: str, save_path: str, use_cache: bool = True) -> D
                 logging.error(f"자막 캐시 저장 실패: {str(e)}")
         
         logging.info(f"자막 파일 저장 완료: {save_path}")
+        # 미디어 인덱스의 자막 유무 즉시 반영
+        media_index.update_paths([save_path])
         return {
             'success': True, 
             'save_path': save_path, 
@@ -413,6 +416,7 @@ def download_and_save_subtitle(download_url: str, save_path: str) -> Dict:
         resp.raise_for_status()
         with open(save_path, 'wb') as f:
             f.write(resp.content)
+        media_index.update_paths([save_path])
         return {'success': True, 'save_path': save_path}
     except Exception as e:
         error_msg = f"자막 다운로드 및 저장 실패: {str(e)}"
@@ -442,6 +446,7 @@ def search_and_download_subtitle(filename: str, save_path: str, language: str =
             try:
                 import shutil
                 shutil.copy2(cache_result['cache_path'], save_path)
+                media_index.update_paths([save_path])
                 return {
                     'success': True,
                     'save_path': save_path,
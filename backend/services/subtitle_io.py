@@ -0,0 +1,253 @@
+import os
+import re
+import html
+import codecs
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.services.subtitle_cues import CueStore, format_srt_times
+
+logger = logging.getLogger(__name__)
+
+# 인코딩 추정 순서: BOM이 없으면 UTF-8로 엄격하게 읽어 보고, 실패하면 한국어 자막에 흔한 CP949(EUC-KR 상위 호환)
+FALLBACK_ENCODINGS = ("utf-8", "cp949")
+BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+SMI_DEFAULT_CLASS = "KRCC"
+SMI_LAST_CUE_MS = 4000  # SAMI 마지막 자막은 끝 시각이 없으므로 이 길이만큼 표시
+
+VTT_BLOCK_RE = re.compile(
+    r'(?:(\d+):)?(\d{2}):(\d{2})\.(\d{3})[ \t]+-->[ \t]+(?:(\d+):)?(\d{2}):(\d{2})\.(\d{3})[^\n]*(?:\n|\Z)((?:[^\n]*\S[^\n]*(?:\n|\Z))*)'
+)
+# SRT에서도 쓰이는 <i>/<b>/<u>만 남기고 나머지 태그(VTT의 <c.색>/<v 화자>/<00:00:01.000>, SAMI의 <font> 등)는 제거
+MARKUP_TAG_RE = re.compile(r'<(?!/?(?:i|b|u)>)[^>]*>', re.I)
+SMI_SYNC_RE = re.compile(r'<sync\s[^>]*?start\s*=\s*["\']?(\d+)[^>]*>', re.I)
+SMI_P_RE = re.compile(r'<p(?:\s[^>]*?class\s*=\s*["\']?([\w-]+)[^>]*)?>', re.I)
+SMI_BR_RE = re.compile(r'<br\s*/?>', re.I)
+ASS_TIME_RE = re.compile(r'(\d+):(\d{2}):(\d{2})[.:](\d{2})')
+ASS_OVERRIDE_RE = re.compile(r'\{[^}]*\}')
+
+
+# --- 인코딩 --- #
+
+def detect_encoding(data: bytes) -> str:
+    """자막 바이트의 인코딩 추정: BOM → 엄격한 UTF-8 → CP949 (EUC-KR 포함). 모두 실패하면 latin-1."""
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            data.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def read_subtitle_text(path: str, encoding: Optional[str] = None) -> Tuple[str, str]:
+    """자막 파일을 읽어 (텍스트, 사용한 인코딩)을 반환한다. 줄바꿈은 \\n으로 통일."""
+    with open(path, "rb") as f:
+        data = f.read()
+    encoding = encoding or detect_encoding(data)
+    text = data.decode(encoding, errors="replace").lstrip("\ufeff")
+    return text.replace("\r\n", "\n").replace("\r", "\n"), encoding
+
+
+# --- 파서 (텍스트 → CueStore) --- #
+
+def parse_srt(text: str) -> CueStore:
+    return CueStore.from_srt(text)
+
+
+def parse_vtt(text: str) -> CueStore:
+    """WebVTT: 시(hour)를 생략한 시각도 허용, NOTE/STYLE 블록은 시각 줄이 없어 자연히 건너뜀"""
+    return CueStore.from_matches(VTT_BLOCK_RE.findall(text), lambda cue_text: MARKUP_TAG_RE.sub('', cue_text))
+
+
+def _smi_text(fragment: str) -> str:
+    fragment = SMI_BR_RE.sub('\n', fragment.replace('\n', ' '))
+    lines = (html.unescape(MARKUP_TAG_RE.sub('', line)).replace('\xa0', ' ').strip() for line in fragment.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_smi(text: str, language_class: Optional[str] = None) -> CueStore:
+    """
+    SAMI: <SYNC Start=ms> 다음의 <P Class=..> 내용이 다음 SYNC까지 표시된다 (&nbsp;만 있는 SYNC는 지우기).
+    한 파일에 여러 언어(Class)가 있으면 language_class, 없으면 처음 나온 Class의 자막을 읽는다.
+    """
+    syncs = list(SMI_SYNC_RE.finditer(text))
+    body_end = re.search(r'</body>', text, re.I)
+    starts: List[int] = []
+    ends: List[int] = []
+    texts: List[str] = []
+    open_cue: Optional[int] = None  # 아직 끝 시각이 정해지지 않은 마지막 자막 인덱스
+    for i, sync in enumerate(syncs):
+        start_ms = int(sync.group(1))
+        content_end = syncs[i + 1].start() if i + 1 < len(syncs) else (body_end.start() if body_end else len(text))
+        content = text[sync.end():content_end]
+        paragraphs = SMI_P_RE.split(content)
+        # split 결과: [P 앞 내용, class, 내용, class, 내용, ...] (P 태그가 없으면 내용 전체)
+        if len(paragraphs) == 1:
+            blocks = [(None, paragraphs[0])]
+        else:
+            blocks = list(zip(paragraphs[1::2], paragraphs[2::2]))
+        chosen = None
+        for class_name, fragment in blocks:
+            class_name = (class_name or '').upper() or None
+            if language_class is None and class_name:
+                language_class = class_name
+            if class_name is None or language_class is None or class_name == language_class.upper():
+                chosen = fragment
+                break
+        if chosen is None:
+            continue
+        if open_cue is not None:
+            ends[open_cue] = start_ms
+            open_cue = None
+        cue_text = _smi_text(chosen)
+        if cue_text:
+            starts.append(start_ms)
+            ends.append(start_ms + SMI_LAST_CUE_MS)
+            texts.append(cue_text)
+            open_cue = len(starts) - 1
+    return CueStore(np.array(starts, np.int64), np.array(ends, np.int64), texts)
+
+
+def parse_ass(text: str) -> CueStore:
+    """ASS/SSA: [Events]의 Format 줄에 맞춰 Dialogue 줄의 Start/End/Text를 읽는다 (스타일 태그 {..}는 제거)."""
+    starts: List[int] = []
+    ends: List[int] = []
+    texts: List[str] = []
+    in_events = False
+    columns = ["layer", "start", "end", "style", "name", "marginl", "marginr", "marginv", "effect", "text"]
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith('['):
+            in_events = stripped.lower() == '[events]'
+            continue
+        if not in_events:
+            continue
+        key, _, value = stripped.partition(':')
+        key = key.lower()
+        if key == 'format':
+            columns = [column.strip().lower() for column in value.split(',')]
+        elif key == 'dialogue':
+            fields = value.lstrip().split(',', len(columns) - 1)
+            if len(fields) < len(columns):
+                continue
+            row = dict(zip(columns, fields))
+            start, end = ASS_TIME_RE.match(row['start'].strip()), ASS_TIME_RE.match(row['end'].strip())
+            if not start or not end:
+                continue
+            cue_text = ASS_OVERRIDE_RE.sub('', row['text']).replace('\\N', '\n').replace('\\n', '\n').replace('\\h', ' ').strip()
+            if not cue_text:
+                continue
+            starts.append(_ass_ms(start))
+            ends.append(_ass_ms(end))
+            texts.append(cue_text)
+    return CueStore(np.array(starts, np.int64), np.array(ends, np.int64), texts)
+
+
+def _ass_ms(match: re.Match) -> int:
+    hours, minutes, seconds, centis = (int(group) for group in match.groups())
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000 + centis * 10
+
+
+# --- 쓰기 (CueStore → 텍스트) --- #
+
+def format_srt(cues: CueStore) -> str:
+    return cues.to_srt()
+
+
+def format_vtt(cues: CueStore) -> str:
+    starts, ends = format_srt_times(cues.starts, '.'), format_srt_times(cues.ends, '.')
+    return "WEBVTT\n\n" + ''.join(f"{start} --> {end}\n{text}\n\n" for start, end, text in zip(starts, ends, cues.texts()))
+
+
+def format_smi(cues: CueStore, language_class: str = SMI_DEFAULT_CLASS) -> str:
+    lines = [
+        "<SAMI>", "<HEAD>", "<STYLE TYPE=\"text/css\">", "<!--",
+        f".{language_class} {{ Name: {language_class}; lang: {'ko-KR' if language_class == 'KRCC' else 'en-US'}; SAMIType: CC; }}",
+        "-->", "</STYLE>", "</HEAD>", "<BODY>",
+    ]
+    next_starts = np.append(cues.starts[1:], np.iinfo(np.int32).max).tolist()
+    for start, end, next_start, text in zip(cues.starts.tolist(), cues.ends.tolist(), next_starts, cues.texts()):
+        lines.append(f"<SYNC Start={start}><P Class={language_class}>{text.replace(chr(10), '<br>')}")
+        if end < next_start:
+            lines.append(f"<SYNC Start={end}><P Class={language_class}>&nbsp;")
+    lines += ["</BODY>", "</SAMI>", ""]
+    return '\n'.join(lines)
+
+
+def _ass_times(ms: np.ndarray) -> List[str]:
+    """밀리초 → ASS 시각 'H:MM:SS.cc' (SRT 시각을 1/100초로 반올림해 만든 뒤 앞 0과 마지막 자리를 뗌)"""
+    times = format_srt_times((ms.astype(np.int64) + 5) // 10 * 10, '.')
+    return [time[1:-1] if time[0] == '0' else time[:-1] for time in times]
+
+
+def format_ass(cues: CueStore) -> str:
+    header = (
+        "[Script Info]\nScriptType: v4.00+\nWrapStyle: 0\nScaledBorderAndShadow: yes\n\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, "
+        "Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+        "Style: Default,Arial,16,&Hffffff,&Hffffff,&H0,&H0,0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,0\n\n"
+        "[Events]\nFormat: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+    return header + ''.join(
+        f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text.replace(chr(10), chr(92) + 'N')}\n"
+        for start, end, text in zip(_ass_times(cues.starts), _ass_times(cues.ends), cues.texts())
+    )
+
+
+# 확장자별 (파서, 포맷터). file_scanner.SUBTITLE_EXTENSIONS의 모든 형식
+PARSERS: Dict[str, Callable[[str], CueStore]] = {".srt": parse_srt, ".vtt": parse_vtt, ".smi": parse_smi, ".ass": parse_ass}
+FORMATTERS: Dict[str, Callable[[CueStore], str]] = {".srt": format_srt, ".vtt": format_vtt, ".smi": format_smi, ".ass": format_ass}
+
+
+def _extension(path_or_format: str) -> str:
+    ext = os.path.splitext(path_or_format)[1].lower() or '.' + path_or_format.lower().lstrip('.')
+    if ext == '.ssa':
+        ext = '.ass'
+    if ext not in PARSERS:
+        raise ValueError(f"지원하지 않는 자막 형식: {path_or_format}")
+    return ext
+
+
+def is_supported_subtitle(path_or_format: str) -> bool:
+    try:
+        _extension(path_or_format)
+        return True
+    except ValueError:
+        return False
+
+
+def load_subtitle(path: str, encoding: Optional[str] = None) -> CueStore:
+    """자막 파일(.srt/.vtt/.smi/.ass)을 인코딩을 추정해 읽고 CueStore로 파싱한다."""
+    text, _ = read_subtitle_text(path, encoding)
+    return PARSERS[_extension(path)](text)
+
+
+def save_subtitle(cues: CueStore, path: str, target_format: Optional[str] = None, encoding: str = "utf-8"):
+    """CueStore를 저장한다. 형식은 target_format, 없으면 path 확장자로 정한다."""
+    text = FORMATTERS[_extension(target_format or path)](cues)
+    with open(path, "w", encoding=encoding, newline='\n') as f:
+        f.write(text)
+
+
+def convert_subtitle(input_path: str, output_path: str, target_format: Optional[str] = None,
+                     encoding: Optional[str] = None, output_encoding: str = "utf-8") -> int:
+    """자막 형식 변환 (프로세스 안에서, ffmpeg 없음). 반환: 변환한 자막 수"""
+    cues = load_subtitle(input_path, encoding)
+    save_subtitle(cues, output_path, target_format, output_encoding)
+    logger.info(f"[convert_subtitle] {input_path} → {output_path} ({len(cues)}개)")
+    return len(cues)
+
+
+def cues_from_segments(segments: List[Dict]) -> CueStore:
+    """Whisper 결과 segments({'start', 'end', 'text'}, 초 단위) → CueStore (공백뿐인 segment는 버림, 모든 형식에서 자막 수가 같도록)"""
+    segments = [segment for segment in segments if segment['text'].strip()]
+    starts = np.rint(np.array([segment['start'] for segment in segments], dtype=np.float64) * 1000)
+    ends = np.rint(np.array([segment['end'] for segment in segments], dtype=np.float64) * 1000)
+    return CueStore(starts.astype(np.int64), ends.astype(np.int64), (segment['text'].strip() for segment in segments))
@@ -0,0 +1,91 @@
+import os
+import uuid
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.services.file_scanner import scan_media_files, SUBTITLE_EXTENSIONS
+from backend.services.transcription_pool import TranscriptionPool, transcription_pool
+
+logger = logging.getLogger(__name__)
+
+# 일괄 싱크 검사에 쓰는 자막 형식 (sync_checker가 subtitle_io.load_subtitle로 모든 형식을 바로 읽음)
+SYNC_SUBTITLE_EXTENSIONS = SUBTITLE_EXTENSIONS
+
+
+def find_sync_pairs(folder: str) -> List[Tuple[str, str]]:
+    """폴더(하위 폴더 포함)에서 미디어와 같은 이름의 자막 쌍 목록 [(미디어 경로, 자막 경로)] (movie.srt, movie.en.srt 등)"""
+    pairs = []
+    for media in scan_media_files(folder):
+        directory = os.path.dirname(media["path"])
+        for name in media["subtitle_files"]:
+            if os.path.splitext(name)[1].lower() in SYNC_SUBTITLE_EXTENSIONS:
+                pairs.append((media["path"], os.path.join(directory, name)))
+    return pairs
+
+
+class SyncBatchRunner:
+    """
+    여러 미디어/자막 쌍의 싱크 검사를 변환 워커 풀에 맡기고, 쌍마다 끝나는 대로 결과를 WebSocket으로 보낸다.
+    - 워커 프로세스들이 쌍을 나눠 동시에 검사한다 (모든 코어 사용, 웹 서버 프로세스의 GIL과 무관).
+    - 텍스트 대조(model_size)는 워커에 한 번 로드된 모델을 계속 쓰고, 미디어 오디오는 오디오 캐시를 공유한다.
+    - 한 번에 워커 수만큼만 풀에 넣어, 큰 배치가 대기 중인 Whisper 변환 작업을 뒤로 밀지 않게 한다.
+    """
+
+    def __init__(self, pool: TranscriptionPool):
+        self.pool = pool
+        self.batches: Dict[str, asyncio.Task] = {}
+
+    def start(self, manager, client_id: str, pairs: List[Tuple[str, str]], model_size: Optional[str] = None,
+              engine: Optional[str] = None) -> str:
+        """배치를 백그라운드에서 시작하고 batch_id를 반환한다."""
+        batch_id = str(uuid.uuid4())
+        task = asyncio.create_task(self._run(manager, client_id, batch_id, pairs, model_size, engine))
+        self.batches[batch_id] = task
+        task.add_done_callback(lambda _: self.batches.pop(batch_id, None))
+        logger.info(f"[SyncBatchRunner] 배치 시작 (Client: {client_id}): {len(pairs)}쌍, 텍스트 대조 모델: {model_size}")
+        return batch_id
+
+    def cancel(self, batch_id: str) -> bool:
+        task = self.batches.get(batch_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def _run(self, manager, client_id: str, batch_id: str, pairs: List[Tuple[str, str]],
+                   model_size: Optional[str], engine: Optional[str]) -> Dict[str, Any]:
+        await manager.send_personal_message({"type": "sync_batch_start", "batch_id": batch_id, "total": len(pairs)}, client_id)
+        slots = asyncio.Semaphore(max(1, self.pool.num_workers))
+        counts: Dict[str, int] = {}
+
+        async def check(media_path: str, subtitle_path: str) -> Dict[str, Any]:
+            async with slots:
+                try:
+                    return await self.pool.check_sync(media_path, subtitle_path, model_size, engine)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    return {"success": False, "media_path": media_path, "subtitle_path": subtitle_path, "error": str(e)}
+
+        tasks = [asyncio.ensure_future(check(media_path, subtitle_path)) for media_path, subtitle_path in pairs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                status = result.get("status") if result.get("success") else "error"
+                counts[status] = counts.get(status, 0) + 1
+                await manager.send_personal_message({"type": "sync_result", "batch_id": batch_id, **result, "status": status}, client_id)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"[SyncBatchRunner] 배치 취소 (Client: {client_id}): {sum(counts.values())}/{len(pairs)}쌍 검사 후")
+            await manager.send_personal_message({"type": "sync_batch_cancelled", "batch_id": batch_id, "total": len(pairs), **counts}, client_id)
+            raise
+        summary = {"type": "sync_batch_complete", "batch_id": batch_id, "total": len(pairs), **counts}
+        logger.info(f"[SyncBatchRunner] 배치 완료 (Client: {client_id}): {summary}")
+        await manager.send_personal_message(summary, client_id)
+        return summary
+
+
+sync_batch_runner = SyncBatchRunner(transcription_pool)
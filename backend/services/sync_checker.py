@@ -1,36 +1,339 @@
 import os
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import numpy as np
-import whisper
-import pysrt
 from Levenshtein import ratio as levenshtein_ratio
 import random
+from backend.services.media_index import media_index
+from backend.services.model_registry import whisper_models
+from backend.services.audio_cache import audio_cache, open_pcm, pcm_duration
+from backend.services.audio_chunker import detect_speech_regions
+from backend.services.language_probe import sample_windows
+from backend.services.whisper_engines import get_engine, TranscriptionCancelled
+from backend.services.subtitle_io import load_subtitle, save_subtitle
 
-# 미디어 길이 추출 (ffprobe)
-def get_media_duration(media_path: str) -> float:
-    import subprocess, json
-    cmd = [
-        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-        '-of', 'json', media_path
-    ]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError(f"ffprobe 오류: {proc.stderr}")
-    info = json.loads(proc.stdout)
-    return float(info['format']['duration'])
-
-# SRT에서 구간 텍스트 추출
-def extract_subtitle_text(subs: List, start: float, end: float) -> str:
-    texts = []
-    for sub in subs:
-        sub_start = sub.start.ordinal / 1000.0
-        sub_end = sub.end.ordinal / 1000.0
-        if sub_end < start:
+# 상호상관 싱크 추정 기본값
+ENVELOPE_RESOLUTION = 0.1  # 발화/자막 포락선 한 칸의 길이(초) = 오프셋 해상도 (포물선 보간으로 더 세밀하게)
+MAX_OFFSET_SECONDS = 600.0  # 이 범위(±초) 안에서만 오프셋을 찾음
+# 자막 시간 × 비율로 보정할 프레임레이트 후보 (1.0 = 드리프트 없음, 23.976↔25, 24↔25, 23.976↔24 변환본)
+FRAMERATE_RATIOS = (1.0, 25 / 23.976, 23.976 / 25, 25 / 24, 24 / 25, 24 / 23.976, 23.976 / 24)
+SYNC_MIN_SCORE = 0.2  # 정규화 상호상관 최고값이 이보다 낮으면 자막과 미디어가 맞지 않는 것으로 판단
+
+# 구간별(piecewise) 재타이밍 기본값
+ANCHOR_WINDOW_SECONDS = 120.0  # 기준점 하나를 구하는 자막 구간 길이
+ANCHOR_STEP_SECONDS = 30.0  # 기준점 간격 (구간은 서로 겹침)
+ANCHOR_SEARCH_SECONDS = 60.0  # 전체 추정 위치 주변 ±이 범위에서 구간별 오프셋을 찾음 (장면 편집으로 생긴 점프 포함)
+ANCHOR_MIN_SCORE = 0.3  # 상관값이 이보다 낮은 구간(대사가 거의 없거나 음악뿐)은 기준점으로 쓰지 않음
+SPLICE_JUMP_SECONDS = 0.5  # 기준점 오프셋이 이보다 크게 바뀌고 다음 기준점도 따라가면 편집점으로 판단
+SYNC_MAX_SHIFT = 0.5  # 보정해도 어느 자막도 이보다 적게 움직이면 싱크가 맞는 것으로 판단
+RATIO_SNAP_TOLERANCE = 5e-5  # 맞춘 기울기가 알려진 프레임레이트 비율과 이만큼 가까우면 그 비율로 고정 (2시간에 0.36초)
+
+
+def interval_envelope(starts: np.ndarray, ends: np.ndarray, n_bins: int, resolution: float = ENVELOPE_RESOLUTION) -> np.ndarray:
+    """[start, end) 구간들이 덮는 칸을 1로 채운 0/1 포락선 (구간 수와 무관하게 한 번의 누적합으로 계산)"""
+    first = np.clip(np.floor(np.asarray(starts) / resolution).astype(np.int64), 0, n_bins)
+    last = np.clip(np.ceil(np.asarray(ends) / resolution).astype(np.int64), 0, n_bins)
+    valid = last > first
+    edges = np.zeros(n_bins + 1, dtype=np.int64)
+    np.add.at(edges, first[valid], 1)
+    np.add.at(edges, last[valid], -1)
+    return (np.cumsum(edges[:-1]) > 0).astype(np.float32)
+
+
+def speech_envelope(media_path: str, resolution: float = ENVELOPE_RESOLUTION) -> np.ndarray:
+    """미디어의 발화 포락선: 오디오 캐시의 PCM에 VAD를 돌려 음성 구간을 칸 단위 0/1로 (STT 없음)"""
+    pcm_path = audio_cache.get(media_path)
+    regions = detect_speech_regions(open_pcm(pcm_path))
+    n_bins = int(np.ceil(pcm_duration(pcm_path) / resolution))
+    return interval_envelope(np.array([r.start for r in regions]), np.array([r.end for r in regions]), n_bins, resolution)
+
+
+def cross_correlate(reference: np.ndarray, signal: np.ndarray, max_lag: int) -> Tuple[int, float, float]:
+    """
+    FFT 상호상관으로 signal을 몇 칸 뒤로 밀어야 reference와 가장 잘 겹치는지 찾는다 (|lag| <= max_lag).
+    반환: (lag, 정규화 상관값(-1~1), 포물선 보간으로 구한 소수 lag)
+    """
+    a = reference - reference.mean()
+    b = signal - signal.mean()
+    norm = float(np.sqrt(np.dot(a, a) * np.dot(b, b)))
+    if norm == 0:
+        return 0, 0.0, 0.0
+    size = 1 << int(np.ceil(np.log2(len(a) + len(b))))
+    corr = np.fft.irfft(np.fft.rfft(a, size) * np.conj(np.fft.rfft(b, size)), size)
+    max_lag = min(max_lag, size // 2 - 1)
+    # corr[k] = sum_t a[t + k] * b[t], 음수 lag는 배열 끝에서부터
+    lags = np.concatenate((np.arange(-max_lag, 0), np.arange(0, max_lag + 1)))
+    values = np.concatenate((corr[size - max_lag:], corr[:max_lag + 1])) / norm
+    best = int(np.argmax(values))
+    return int(lags[best]), float(values[best]), float(lags[best]) + _refine_peak(values, best)
+
+
+def _refine_peak(values: np.ndarray, best: int) -> float:
+    """최고점 양옆 값으로 포물선을 맞춰 칸 사이의 실제 최고점 위치(-0.5~0.5칸 보정값)를 구한다."""
+    if 0 < best < len(values) - 1:
+        left, center, right = values[best - 1], values[best], values[best + 1]
+        denominator = left - 2 * center + right
+        if denominator < 0:
+            return float(0.5 * (left - right) / denominator)
+    return 0.0
+
+
+def estimate_offset(speech: np.ndarray, starts: np.ndarray, ends: np.ndarray, resolution: float = ENVELOPE_RESOLUTION,
+                    max_offset: float = MAX_OFFSET_SECONDS, ratios: Sequence[float] = FRAMERATE_RATIOS) -> Dict:
+    """
+    발화 포락선과 자막 포락선의 상호상관으로 전체 오프셋과 프레임레이트 비율을 추정한다.
+    보정된 시각 = 자막 시각 × ratio + offset. 비율 후보마다 자막 포락선을 다시 만들어 상관값이 가장 큰 조합을 고른다.
+    반환: {'offset': 초, 'ratio', 'score': 정규화 상관값, 'aligned_score': 보정 전(ratio 1, offset 0) 상관값}
+    """
+    n_bins = len(speech)
+    max_lag = int(max_offset / resolution)
+    best = {'offset': 0.0, 'ratio': 1.0, 'score': -1.0}
+    aligned_score = 0.0
+    for ratio in ratios:
+        envelope = interval_envelope(starts * ratio, ends * ratio, n_bins, resolution)
+        lag, score, refined = cross_correlate(speech, envelope, max_lag)
+        if ratio == 1.0:
+            aligned_score = _correlation_at_zero(speech, envelope)
+        if score > best['score']:
+            best = {'offset': refined * resolution, 'ratio': ratio, 'score': score}
+    return {
+        'offset': round(float(best['offset']), 3),
+        'ratio': best['ratio'],
+        'score': round(max(best['score'], 0.0), 3),
+        'aligned_score': round(aligned_score, 3),
+    }
+
+
+def _correlation_at_zero(a: np.ndarray, b: np.ndarray) -> float:
+    a = a - a.mean()
+    b = b - b.mean()
+    norm = float(np.sqrt(np.dot(a, a) * np.dot(b, b)))
+    return float(np.dot(a, b) / norm) if norm else 0.0
+
+
+def estimate_sync_offset(media_path: str, subtitle_path: str, max_offset: float = MAX_OFFSET_SECONDS,
+                         ratios: Sequence[float] = FRAMERATE_RATIOS) -> Dict:
+    """
+    Whisper 없이 미디어와 자막 파일의 싱크 오프셋을 추정한다 (영화 한 편 전체를 한 번의 FFT 상관으로).
+    반환: {'success', 'offset', 'ratio', 'score', 'aligned_score', 'matched': score >= SYNC_MIN_SCORE, 'error'}
+    """
+    try:
+        cues = load_subtitle(subtitle_path)
+        starts, ends = cues.start_seconds(), cues.end_seconds()
+        if not len(starts):
+            return {'success': False, 'error': '자막이 비어 있음'}
+        estimate = estimate_offset(speech_envelope(media_path), starts, ends, max_offset=max_offset, ratios=ratios)
+        return {'success': True, **estimate, 'matched': estimate['score'] >= SYNC_MIN_SCORE, 'error': None}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+def _local_offset(speech: np.ndarray, window: np.ndarray, first_bin: int, search_bins: int) -> Tuple[float, float]:
+    """
+    speech의 first_bin 위치에 놓인 자막 포락선 조각(window)을 ±search_bins 안에서 밀어 보며 가장 잘 겹치는 위치를 찾는다.
+    위치마다 그 구간의 speech 평균/분산으로 정규화한 상관값을 한 번의 FFT와 누적합으로 계산한다.
+    반환: (소수 lag(칸), 정규화 상관값)
+    """
+    width = len(window)
+    region_start = max(first_bin - search_bins, 0)
+    region = speech[region_start:first_bin + width + search_bins].astype(np.float64)
+    b = window - window.mean()
+    b_norm = float(np.sqrt(np.dot(b, b)))
+    if len(region) < width or b_norm == 0:
+        return 0.0, 0.0
+    size = 1 << int(np.ceil(np.log2(len(region) + width)))
+    # b의 평균이 0이므로 corr[k]는 region[k:k+width]에서 평균을 뺀 것과의 내적과 같음
+    corr = np.fft.irfft(np.fft.rfft(region, size) * np.conj(np.fft.rfft(b, size)), size)[:len(region) - width + 1]
+    sums = np.concatenate(([0.0], np.cumsum(region)))
+    squares = np.concatenate(([0.0], np.cumsum(region ** 2)))
+    window_sum = sums[width:] - sums[:-width]
+    local_norm = np.sqrt(np.maximum(squares[width:] - squares[:-width] - window_sum ** 2 / width, 0.0))
+    values = np.divide(corr, local_norm * b_norm, out=np.zeros_like(corr), where=local_norm > 0)
+    best = int(np.argmax(values))
+    return region_start + best - first_bin + _refine_peak(values, best), float(values[best])
+
+
+def find_anchors(speech: np.ndarray, starts: np.ndarray, ends: np.ndarray, ratio: float, offset: float,
+                 resolution: float = ENVELOPE_RESOLUTION, window_seconds: float = ANCHOR_WINDOW_SECONDS,
+                 step_seconds: float = ANCHOR_STEP_SECONDS, search_seconds: float = ANCHOR_SEARCH_SECONDS,
+                 min_score: float = ANCHOR_MIN_SCORE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    전체 추정(ratio, offset)으로 옮긴 자막을 겹치는 구간들로 나눠, 구간마다 미디어에서 실제로 맞는 위치를 찾는다.
+    반환: (자막 시각, 그 자막 시각에 대응하는 미디어 시각, 상관값) 배열. 상관값이 낮은 구간은 뺀다.
+    """
+    n_bins = len(speech)
+    mapped = interval_envelope(starts * ratio + offset, ends * ratio + offset, n_bins, resolution)
+    width = int(window_seconds / resolution)
+    step = max(1, int(step_seconds / resolution))
+    search = int(search_seconds / resolution)
+    first = int(max(np.min(starts) * ratio + offset, 0) / resolution)
+    last = int(min(np.max(ends) * ratio + offset, n_bins * resolution) / resolution)
+    sub_times, media_times, scores = [], [], []
+    for bin_start in range(first, max(last - width, first) + 1, step):
+        window = mapped[bin_start:bin_start + width]
+        # 대사가 거의 없거나 꽉 찬 구간은 위치를 가릴 수 없음
+        if len(window) < width // 2 or not 0.05 <= window.mean() <= 0.95:
+            continue
+        lag, score = _local_offset(speech, window, bin_start, search)
+        if score < min_score:
             continue
-        if sub_start > end:
-            break
-        texts.append(sub.text.replace('\n', ' '))
-    return ' '.join(texts)
+        center = (bin_start + len(window) / 2) * resolution
+        sub_times.append((center - offset) / ratio)
+        media_times.append(center + lag * resolution)
+        scores.append(score)
+    return np.array(sub_times), np.array(media_times), np.array(scores)
+
+
+def _split_anchors(residuals: np.ndarray, jump: float) -> List[List[int]]:
+    """
+    기준점 오프셋(전체 추정 대비 잔차)을 순서대로 보며 편집점에서 나눈다. 직전 기준점들과 jump 이상 차이 나고
+    다음 기준점도 새 값을 따라가면 편집점, 혼자만 튀면 잘못 맞춘 기준점으로 보고 버린다.
+    """
+    groups: List[List[int]] = []
+    for i, value in enumerate(residuals):
+        if groups and abs(value - np.median(residuals[groups[-1][-3:]])) <= jump:
+            groups[-1].append(i)
+        elif not groups or (i + 1 < len(residuals) and abs(residuals[i + 1] - value) <= jump):
+            groups.append([i])
+    return groups
+
+
+def _fit_line(sub_times: np.ndarray, media_times: np.ndarray, default_ratio: float, min_span: float) -> Tuple[float, float]:
+    """미디어 시각 = 자막 시각 × ratio + offset 직선 맞춤. 기준점이 충분히 퍼져 있을 때만 기울기도 맞춘다."""
+    ratio = default_ratio
+    if len(sub_times) >= 3 and np.ptp(sub_times) >= min_span:
+        slope = float(np.polyfit(sub_times, media_times, 1)[0])
+        snapped = min(FRAMERATE_RATIOS, key=lambda candidate: abs(candidate - slope))
+        ratio = snapped if abs(snapped - slope) <= RATIO_SNAP_TOLERANCE else slope
+    return ratio, float(np.median(media_times - sub_times * ratio))
+
+
+def _split_point(speech_sums: np.ndarray, starts: np.ndarray, ends: np.ndarray, left: Tuple[float, float],
+                 right: Tuple[float, float], low: float, high: float, resolution: float) -> float:
+    """
+    두 구간의 경계(자막 시각)를 [low, high] 안의 자막 시작 시각 중에서 고른다: 경계 앞 자막은 left, 뒤 자막은 right로
+    옮겼을 때 발화와 겹치는 정도(겹침 - 비어 있음)의 합이 가장 큰 위치.
+    """
+    inside = np.flatnonzero((starts > low) & (starts <= high))
+    if not len(inside):
+        return (low + high) / 2
+
+    def overlap(ratio: float, offset: float) -> np.ndarray:
+        first = np.clip(((starts[inside] * ratio + offset) / resolution).astype(np.int64), 0, len(speech_sums) - 1)
+        last = np.clip(((ends[inside] * ratio + offset) / resolution).astype(np.int64), 0, len(speech_sums) - 1)
+        covered = speech_sums[last] - speech_sums[first]
+        return 2 * covered - (last - first)
+
+    before = np.concatenate(([0.0], np.cumsum(overlap(*left))))
+    after = overlap(*right)
+    after = after.sum() - np.concatenate(([0.0], np.cumsum(after)))
+    best = int(np.argmax(before + after))
+    return float(starts[inside[best]]) if best < len(inside) else high
+
+
+def fit_time_map(speech: np.ndarray, starts: np.ndarray, ends: np.ndarray, estimate: Optional[Dict] = None,
+                 resolution: float = ENVELOPE_RESOLUTION, window_seconds: float = ANCHOR_WINDOW_SECONDS,
+                 jump: float = SPLICE_JUMP_SECONDS) -> List[Dict]:
+    """
+    자막 시각 → 미디어 시각의 구간별 선형 사상을 맞춘다. 전체 추정(estimate_offset)을 기준으로 겹치는 구간마다
+    기준점을 구하고, 오프셋이 갑자기 바뀌는 곳(다른 편집본의 장면 편집점)에서 구간을 나눠 구간마다 직선
+    (프레임레이트 비율 + 오프셋)을 맞춘다.
+    반환: [{'start': 자막 시각(이 구간의 첫 자막부터), 'end': 다음 구간 시작 또는 None, 'ratio', 'offset',
+           'anchors': 기준점 수, 'residual_rms', 'residual_max': 기준점 잔차(초)}, ...]
+    """
+    if estimate is None:
+        estimate = estimate_offset(speech, starts, ends, resolution)
+    ratio, offset = estimate['ratio'], estimate['offset']
+    sub_times, media_times, _ = find_anchors(speech, starts, ends, ratio, offset, resolution, window_seconds)
+    groups = _split_anchors(media_times - (sub_times * ratio + offset), jump) if len(sub_times) else []
+    if not groups:
+        return [{'start': 0.0, 'end': None, 'ratio': ratio, 'offset': offset, 'anchors': 0, 'residual_rms': None, 'residual_max': None}]
+
+    lines = [_fit_line(sub_times[group], media_times[group], ratio, 2 * window_seconds) for group in groups]
+    speech_sums = np.concatenate(([0.0], np.cumsum(speech)))
+    boundaries = [0.0]
+    for i in range(1, len(groups)):
+        # 편집점은 앞 구간 마지막 기준점과 뒤 구간 첫 기준점 사이 (기준점 구간 폭의 절반만큼 여유)
+        low = max(sub_times[groups[i - 1][-1]] - window_seconds / 2, boundaries[-1])
+        high = sub_times[groups[i][0]] + window_seconds / 2
+        boundaries.append(_split_point(speech_sums, starts, ends, lines[i - 1], lines[i], low, high, resolution))
+
+    segments = []
+    for i, (group, (segment_ratio, segment_offset)) in enumerate(zip(groups, lines)):
+        residuals = media_times[group] - (sub_times[group] * segment_ratio + segment_offset)
+        segments.append({
+            # 경계는 구간의 첫 자막 시작 시각이므로 내림 (반올림하면 그 자막이 앞 구간으로 넘어감)
+            'start': float(np.floor(boundaries[i] * 1000) / 1000),
+            'end': float(np.floor(boundaries[i + 1] * 1000) / 1000) if i + 1 < len(boundaries) else None,
+            'ratio': round(segment_ratio, 7),
+            'offset': round(segment_offset, 3),
+            'anchors': len(group),
+            'residual_rms': round(float(np.sqrt(np.mean(residuals ** 2))), 3),
+            'residual_max': round(float(np.max(np.abs(residuals))), 3),
+        })
+    return segments
+
+
+def apply_time_map(starts: np.ndarray, ends: np.ndarray, segments: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """fit_time_map의 구간별 사상을 모든 자막에 한 번에 적용한다 (자막은 시작 시각이 속한 구간의 사상을 따름)."""
+    bounds = np.array([segment['start'] for segment in segments[1:]])
+    index = np.searchsorted(bounds, starts, side='right')
+    ratios = np.array([segment['ratio'] for segment in segments])[index]
+    offsets = np.array([segment['offset'] for segment in segments])[index]
+    return starts * ratios + offsets, ends * ratios + offsets
+
+def score_subtitle_sync(media_path: str, subtitle_path: str, model_size: Optional[str] = None, engine: Optional[str] = None,
+                        samples: int = 3, sample_seconds: float = 20.0, should_stop: Optional[Callable[[], int]] = None) -> Dict:
+    """
+    미디어/자막 한 쌍의 싱크 점수 (일괄 검사용, 변환 워커 프로세스에서 실행).
+    발화/자막 포락선 상관으로 일치 여부와 구간별 시간 사상을 구하고, model_size를 주면 보정된 시각 기준으로
+    샘플 구간 몇 개를 워커에 로드된 모델로 STT해 자막 텍스트와의 유사도(text_score)도 계산한다.
+    반환: {'success', 'status': 'synced' | 'shifted' | 'unmatched', 'score', 'offset', 'ratio', 'segments',
+           'max_shift', 'residual_rms', 'text_score', 'error'}
+    """
+    result = {'success': False, 'media_path': media_path, 'subtitle_path': subtitle_path, 'error': None}
+    try:
+        cues = load_subtitle(subtitle_path)
+        starts, ends = cues.start_seconds(), cues.end_seconds()
+        if not len(starts):
+            return dict(result, error='자막이 비어 있음')
+        speech = speech_envelope(media_path)
+        estimate = estimate_offset(speech, starts, ends)
+        result.update(success=True, score=estimate['score'], offset=estimate['offset'], ratio=estimate['ratio'])
+        if estimate['score'] < SYNC_MIN_SCORE:
+            return dict(result, status='unmatched')
+        if should_stop and should_stop():
+            raise TranscriptionCancelled("싱크 검사 중 취소됨")
+        segments = fit_time_map(speech, starts, ends, estimate)
+        new_starts, new_ends = apply_time_map(starts, ends, segments)
+        max_shift = float(np.max(np.abs(new_starts - starts)))
+        residuals = [segment['residual_rms'] for segment in segments if segment['residual_rms'] is not None]
+        result.update(
+            status='synced' if max_shift < SYNC_MAX_SHIFT else 'shifted',
+            segments=len(segments),
+            max_shift=round(max_shift, 3),
+            residual_rms=max(residuals) if residuals else None,
+        )
+        if model_size:
+            cues.set_times(new_starts, new_ends)
+            duration = len(speech) * ENVELOPE_RESOLUTION
+            whisper_engine = get_engine(engine)
+            similarities = []
+            for start, end in sample_windows(duration, samples, sample_seconds):
+                if should_stop and should_stop():
+                    raise TranscriptionCancelled("싱크 검사 중 취소됨")
+                subtitle_text = cues.text_in(start, end)
+                if not subtitle_text:
+                    continue
+                stt = whisper_engine.transcribe(model_size, audio_cache.read(media_path, start, end), verbose=False)
+                stt_text = ' '.join(segment['text'].strip() for segment in stt.get('segments', []))
+                similarities.append(levenshtein_ratio(stt_text.lower(), subtitle_text.lower()))
+            result['text_score'] = round(float(np.mean(similarities)), 3) if similarities else None
+        return result
+    except TranscriptionCancelled:
+        raise
+    except Exception as e:
+        return dict(result, success=False, error=str(e))
+
 
 def check_subtitle_sync(media_path: str, subtitle_path: str, sample_count: int = 3) -> Dict:
     """
@@ -39,37 +342,28 @@ def check_subtitle_sync(media_path: str, subtitle_path: str, sample_count: int =
     반환: {'success': bool, 'sync': bool, 'score': float, 'details': [...], 'error': str|None}
     """
     try:
-        # 1. 미디어 길이 측정
-        duration = get_media_duration(media_path)
+        # 1. 미디어 길이 측정 (오디오 캐시: 처음 한 번만 추출, 이후 구간은 memory-map으로 읽음)
+        duration = audio_cache.duration(media_path)
         if duration < 30:
             return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': '미디어 길이가 너무 짧음'}
         # 2. 샘플 구간 선정 (앞/중/끝, 랜덤 오프셋)
         sample_len = min(10, duration // (sample_count+1))  # 각 샘플 구간 길이(초)
         positions = np.linspace(0, duration-sample_len, sample_count)
         positions = [max(0, float(p) + random.uniform(-2, 2)) for p in positions]
-        # 3. 자막 파싱
-        subs = pysrt.open(subtitle_path, encoding='utf-8')
-        # 4. Whisper 모델 로드 (base)
-        model = whisper.load_model('base')
+        # 3. 자막 파싱 (구간 텍스트는 이진 탐색으로 조회)
+        cues = load_subtitle(subtitle_path)
+        # 4. Whisper 모델 (base, 레지스트리에 캐시된 모델 재사용)
         details = []
         scores = []
         for idx, start in enumerate(positions):
             end = min(start + sample_len, duration)
-            # 5. ffmpeg로 구간 추출 (wav 임시파일)
-            tmp_wav = f"/tmp/sync_sample_{os.getpid()}_{idx}.wav"
-            cmd = [
-                'ffmpeg', '-y', '-ss', str(start), '-to', str(end), '-i', media_path,
-                '-ar', '16000', '-ac', '1', '-vn', '-loglevel', 'error', tmp_wav
-            ]
-            import subprocess
-            proc = subprocess.run(cmd, capture_output=True)
-            if proc.returncode != 0:
-                return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': f'ffmpeg 오류: {proc.stderr.decode()}'}
+            # 5. 오디오 캐시에서 구간 읽기 (ffmpeg 재실행 없음)
+            audio = audio_cache.read(media_path, start, end)
             # 6. Whisper로 STT
-            stt_result = model.transcribe(tmp_wav, language=None)
+            stt_result = whisper_models.transcribe('base', audio, language=None)
             stt_text = ' '.join([seg['text'].strip() for seg in stt_result.get('segments', [])])
             # 7. 자막 텍스트 추출
-            subtitle_text = extract_subtitle_text(subs, start, end)
+            subtitle_text = cues.text_in(start, end)
             # 8. 유사도/싱크 오차 계산
             similarity = levenshtein_ratio(stt_text, subtitle_text) if subtitle_text else 0.0
             scores.append(similarity)
@@ -81,7 +375,6 @@ def check_subtitle_sync(media_path: str, subtitle_path: str, sample_count: int =
                 'subtitle_text': subtitle_text,
                 'similarity': round(similarity, 3)
             })
-            os.remove(tmp_wav)
         avg_score = float(np.mean(scores)) if scores else 0.0
         sync = avg_score > 0.7  # 임계값(조정 가능)
         return {
@@ -94,104 +387,51 @@ def check_subtitle_sync(media_path: str, subtitle_path: str, sample_count: int =
     except Exception as e:
         return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': str(e)}
 
-def advanced_sync_and_save(media_path: str, subtitle_path: str, save_path: str = None, first_sec: int = 120, sample_count: int = 3, sync_threshold: float = 0.7, max_shift_sec: float = 3.0) -> Dict:
+def advanced_sync_and_save(media_path: str, subtitle_path: str, save_path: str = None, max_offset: float = MAX_OFFSET_SECONDS,
+                           min_score: float = SYNC_MIN_SCORE, min_shift: float = 0.5) -> Dict:
     """
-    1. 자막의 첫 부분(0~first_sec)에서 Whisper(en) STT와 자막을 대조
-    2. 일치하면 앞/중/끝 3구간에서 싱크 오차 측정
-    3. 오차가 크면 pysrt로 자막을 shift 보정
-    4. 미디어와 같은 폴더, 같은 이름(.srt)로 저장
-    반환: {'success': bool, 'sync': bool, 'score': float, 'details': [...], 'error': str|None, 'save_path': str}
+    1. 미디어 발화 포락선과 자막 포락선의 상호상관으로 전체 오프셋과 프레임레이트 비율을 추정 (Whisper 없음)
+    2. 상관값이 min_score보다 낮으면 자막과 미디어가 일치하지 않는 것으로 보고 저장하지 않음
+    3. 구간별 기준점으로 시간 사상을 맞춤 (다른 편집본의 장면 편집점, 프레임레이트 차이, 점진적 드리프트)
+    4. 어느 자막이든 min_shift초 이상 어긋나면 모든 자막 시각을 한 번에 보정
+    5. 미디어와 같은 폴더, 같은 이름(.srt)로 저장
+    반환: {'success': bool, 'sync': bool, 'score': float, 'avg_offset': float, 'ratio': float,
+          'details': [구간별 사상과 잔차 (fit_time_map)], 'error': str|None, 'save_path': str}
     """
-    import shutil
     try:
-        # 1. 미디어 길이 측정
-        duration = get_media_duration(media_path)
-        if duration < 30:
-            return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': '미디어 길이가 너무 짧음', 'save_path': None}
-        # 2. 자막 파싱
-        subs = pysrt.open(subtitle_path, encoding='utf-8')
-        # 3. Whisper 모델 로드 (en)
-        model = whisper.load_model('tiny')
-        # 4. 첫 부분(0~first_sec) 대조
-        first_end = min(first_sec, duration)
-        # ffmpeg로 첫 부분 추출
-        tmp_wav = f"/tmp/sync_first_{os.getpid()}.wav"
-        cmd = [
-            'ffmpeg', '-y', '-ss', '0', '-to', str(first_end), '-i', media_path,
-            '-ar', '16000', '-ac', '1', '-vn', '-loglevel', 'error', tmp_wav
-        ]
-        import subprocess
-        proc = subprocess.run(cmd, capture_output=True)
-        if proc.returncode != 0:
-            return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': f'ffmpeg 오류: {proc.stderr.decode()}', 'save_path': None}
-        stt_result = model.transcribe(tmp_wav, language="en")
-        stt_text = ' '.join([seg['text'].strip() for seg in stt_result.get('segments', [])])
-        subtitle_text = extract_subtitle_text(subs, 0, first_end)
-        similarity = levenshtein_ratio(stt_text, subtitle_text) if subtitle_text else 0.0
-        os.remove(tmp_wav)
-        if similarity < sync_threshold:
-            return {'success': False, 'sync': False, 'score': similarity, 'details': [{'section': 'first', 'similarity': similarity}], 'error': '자막과 미디어가 일치하지 않음', 'save_path': None}
-        # 5. 앞/중/끝 3구간 싱크 대조
-        sample_len = min(10, duration // (sample_count+1))  # 각 샘플 구간 길이(초)
-        positions = np.linspace(0, duration-sample_len, sample_count)
-        positions = [max(0, float(p)) for p in positions]
-        details = []
-        offsets = []
-        scores = []
-        for idx, start in enumerate(positions):
-            end = min(start + sample_len, duration)
-            tmp_wav = f"/tmp/sync_sample_{os.getpid()}_{idx}.wav"
-            cmd = [
-                'ffmpeg', '-y', '-ss', str(start), '-to', str(end), '-i', media_path,
-                '-ar', '16000', '-ac', '1', '-vn', '-loglevel', 'error', tmp_wav
-            ]
-            proc = subprocess.run(cmd, capture_output=True)
-            if proc.returncode != 0:
-                return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': f'ffmpeg 오류: {proc.stderr.decode()}', 'save_path': None}
-            stt_result = model.transcribe(tmp_wav, language="en")
-            stt_text = ' '.join([seg['text'].strip() for seg in stt_result.get('segments', [])])
-            subtitle_text = extract_subtitle_text(subs, start, end)
-            similarity = levenshtein_ratio(stt_text, subtitle_text) if subtitle_text else 0.0
-            # 싱크 오프셋(초) 추정: STT segment와 자막 segment의 시작 시간 차이 평균
-            stt_starts = [seg['start'] for seg in stt_result.get('segments', [])]
-            sub_starts = [sub.start.ordinal/1000.0 for sub in subs if sub.start.ordinal/1000.0 >= start and sub.start.ordinal/1000.0 < end]
-            if stt_starts and sub_starts:
-                offset = np.mean([s - t for s, t in zip(sub_starts, stt_starts[:len(sub_starts)])])
-            else:
-                offset = 0.0
-            offsets.append(offset)
-            scores.append(similarity)
-            details.append({
-                'sample_idx': idx+1,
-                'start': round(start, 2),
-                'end': round(end, 2),
-                'stt_text': stt_text,
-                'subtitle_text': subtitle_text,
-                'similarity': round(similarity, 3),
-                'offset': round(offset, 2)
-            })
-            os.remove(tmp_wav)
-        avg_score = float(np.mean(scores)) if scores else 0.0
-        avg_offset = float(np.mean(offsets)) if offsets else 0.0
-        sync = avg_score > sync_threshold and abs(avg_offset) < max_shift_sec
-        # 6. 오프셋이 크면 자막 shift 보정
-        if abs(avg_offset) > 0.5:  # 0.5초 이상이면 보정
-            for sub in subs:
-                sub.start = sub.start + avg_offset
-                sub.end = sub.end + avg_offset
-        # 7. 저장 경로 결정
+        # 1. 자막 파싱
+        cues = load_subtitle(subtitle_path)
+        starts, ends = cues.start_seconds(), cues.end_seconds()
+        if not len(starts):
+            return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': '자막이 비어 있음', 'save_path': None}
+        # 2. 오프셋/비율 추정 (오디오 캐시의 PCM으로 VAD → FFT 상호상관)
+        speech = speech_envelope(media_path)
+        estimate = estimate_offset(speech, starts, ends, max_offset=max_offset)
+        if estimate['score'] < min_score:
+            return {'success': False, 'sync': False, 'score': estimate['score'], 'details': [estimate], 'error': '자막과 미디어가 일치하지 않음', 'save_path': None}
+        # 3. 구간별 시간 사상
+        segments = fit_time_map(speech, starts, ends, estimate)
+        new_starts, new_ends = apply_time_map(starts, ends, segments)
+        shifts = new_starts - starts
+        sync = float(np.max(np.abs(shifts))) < min_shift
+        # 4. 싱크가 어긋났으면 모든 자막을 보정 (음수 시각은 0으로)
+        if not sync:
+            cues.set_times(new_starts, new_ends)
+        # 5. 저장 경로 결정
         if not save_path:
             base, _ = os.path.splitext(media_path)
             save_path = base + ".srt"
-        subs.save(save_path, encoding='utf-8')
+        save_subtitle(cues, save_path)
+        media_index.update_paths([save_path])
         return {
             'success': True,
             'sync': sync,
-            'score': round(avg_score, 3),
-            'avg_offset': round(avg_offset, 2),
-            'details': details,
+            'score': estimate['score'],
+            'avg_offset': round(float(np.mean(shifts)), 2),
+            'ratio': estimate['ratio'],
+            'details': segments,
             'error': None,
             'save_path': save_path
         }
     except Exception as e:
-        return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': str(e), 'save_path': None} 
\ No newline at end of file
+        return {'success': False, 'sync': False, 'score': 0.0, 'details': [], 'error': str(e), 'save_path': None}
@@ -0,0 +1,674 @@
+import os
+import time
+import uuid
+import queue
+import asyncio
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.executors import run_cpu, run_io
+from backend.services.whisper_engines import get_engine, TranscriptionCancelled, TranscriptionPaused
+from backend.services.audio_cache import audio_cache, read_pcm
+from backend.services.audio_chunker import prepare_long_form, offset_segments, stitch_chunk_results
+from backend.services.language_probe import detect_language_in_samples
+
+logger = logging.getLogger(__name__)
+
+# 워커 → 부모 이벤트 종류
+EVENT_READY = "ready"
+EVENT_STARTED = "started"
+EVENT_PROGRESS = "event"
+EVENT_DONE = "done"
+EVENT_ERROR = "error"
+EVENT_CANCELLED = "cancelled"
+EVENT_PAUSED = "paused"
+
+# 워커 취소 플래그 값
+STOP_CANCEL = 1
+STOP_PAUSE = 2  # 다음 윈도우 경계에서 체크포인트를 남기고 멈춤
+
+# 이어서 변환할 때 앞 구간 문맥으로 넘기는 마지막 자막 길이(글자)
+RESUME_PROMPT_CHARS = 200
+
+# 취소 지연(취소 요청 → 워커가 멈추고 CPU를 반환하기까지) 통계에 남기는 최근 기록 수
+CANCEL_LATENCY_HISTORY = 100
+
+
+def run_transcription(file_path: str, model_size: str, options: Dict[str, Any],
+                      emit: Callable[[Dict[str, Any]], None], should_stop: Callable[[], int],
+                      engine: Optional[str] = None, clip: Optional[Tuple[str, float, float]] = None) -> Dict[str, Any]:
+    """
+    한 파일을 Whisper로 변환한다 (워커 프로세스와 in-process 실행이 같은 함수를 사용). engine은 whisper_engines 이름.
+    clip=(오디오 캐시 파일 경로, 시작 초, 끝 초)이면 그 구간만 변환한다 (long-form 청크). 아니면 오디오 캐시에서
+    파일 전체 오디오를 읽는다 (처음 한 번만 ffmpeg로 추출, Whisper가 컨테이너를 매번 다시 디코딩하지 않음).
+    디코딩 윈도우마다 emit으로 진행 이벤트를 보내고 ({'type': 'progress', 'processed', 'duration', 'segments'}:
+    처리한 오디오 초, 전체 초, 새로 확정된 segment), 그때마다 should_stop을 확인해 취소되면 다음 윈도우 전에 중단한다.
+    should_stop이 STOP_PAUSE면 그때까지의 segment와 위치를 체크포인트로 담아 TranscriptionPaused를 던진다.
+    """
+    decoded = {"offset": 0.0, "segments": []}
+
+    def check_stop(stage: str):
+        flag = should_stop()
+        if flag == STOP_PAUSE:
+            raise TranscriptionPaused({"offset": decoded["offset"], "segments": decoded["segments"], "language": options.get("language")})
+        if flag:
+            raise TranscriptionCancelled(stage)
+
+    check_stop("시작 전 취소됨")
+
+    def on_progress(processed: float, duration: float, new_segments: List[Dict[str, Any]]):
+        decoded["offset"] = processed
+        decoded["segments"].extend(new_segments)
+        emit({
+            "type": "progress",
+            "processed": round(processed, 2),
+            "duration": round(duration, 2),
+            "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in new_segments],
+        })
+        check_stop("변환 중 취소됨")
+
+    if clip:
+        audio = read_pcm(*clip)
+    elif os.path.isfile(file_path):
+        audio = audio_cache.read(file_path)
+    else:
+        audio = file_path  # 접근할 수 없는 경로는 엔진이 오류를 보고하도록 그대로 전달
+    return get_engine(engine).transcribe(model_size, audio, on_progress=on_progress, verbose=False, **options)
+
+
+def run_language_detection(file_path: str, model_size: str, options: Dict[str, Any],
+                           emit: Callable[[Dict[str, Any]], None], should_stop: Callable[[], bool],
+                           engine: Optional[str] = None, clip: Optional[Tuple[str, float, float]] = None) -> Dict[str, Any]:
+    """언어 사전 감지 작업 (run_transcription과 같은 호출 형식, options는 samples/sample_seconds)"""
+    return detect_language_in_samples(file_path, model_size, engine, should_stop=should_stop, **options)
+
+
+def run_sync_check(file_path: str, model_size: str, options: Dict[str, Any],
+                   emit: Callable[[Dict[str, Any]], None], should_stop: Callable[[], int],
+                   engine: Optional[str] = None, clip: Optional[Tuple[str, float, float]] = None) -> Dict[str, Any]:
+    """자막 싱크 검사 작업 (options: subtitle_path, verify_text). verify_text면 워커에 로드된 모델로 샘플 구간 STT"""
+    from backend.services.sync_checker import score_subtitle_sync
+    return score_subtitle_sync(file_path, options["subtitle_path"], model_size if options.get("verify_text") else None,
+                               engine, should_stop=should_stop)
+
+
+# 워커가 처리하는 작업 종류
+TASKS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "transcribe": run_transcription,
+    "detect_language": run_language_detection,
+    "sync_check": run_sync_check,
+}
+
+
+def _worker_main(worker_id: int, task_queue, event_queue, cancel_flag, torch_threads: int, preload: List[str]):
+    """워커 프로세스 진입점: 모델을 미리 로드해 두고 부모가 보낸 작업을 하나씩 처리한다."""
+    # 워커마다 연산 스레드 수를 고정해 여러 워커가 코어를 나눠 쓰도록 함
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(torch_threads)
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    get_engine().warm_up(preload)
+    event_queue.put((EVENT_READY, None, worker_id))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        job_key, kind, file_path, model_size, options, engine, clip = task
+        event_queue.put((EVENT_STARTED, job_key, worker_id))
+        try:
+            result = TASKS[kind](
+                file_path, model_size, options,
+                emit=lambda payload: event_queue.put((EVENT_PROGRESS, job_key, payload)),
+                should_stop=lambda: cancel_flag.value,
+                engine=engine,
+                clip=clip,
+            )
+            event_queue.put((EVENT_DONE, job_key, result))
+        except TranscriptionPaused as e:
+            event_queue.put((EVENT_PAUSED, job_key, e.checkpoint))
+        except TranscriptionCancelled as e:
+            event_queue.put((EVENT_CANCELLED, job_key, str(e)))
+        except Exception as e:
+            event_queue.put((EVENT_ERROR, job_key, f"{type(e).__name__}: {e}"))
+
+
+def merge_checkpoint(previous: Dict[str, Any], partial: Dict[str, Any]) -> Dict[str, Any]:
+    """체크포인트에서 이어서 변환하다 다시 멈춘 경우: 이전 체크포인트 + 이번 구간의 체크포인트(구간 시작 기준 시간)"""
+    offset = previous["offset"]
+    return {
+        "offset": offset + partial["offset"],
+        "segments": previous["segments"] + offset_segments(partial["segments"], offset),
+        "language": partial.get("language") or previous.get("language"),
+    }
+
+
+def _long_form_checkpoint(chunks, results: Dict[int, Dict[str, Any]], partial: Dict[int, Dict[str, Any]],
+                          language: Optional[str]) -> Dict[str, Any]:
+    """long-form 체크포인트: 끝난 청크는 결과, 멈춘 청크는 청크 기준 체크포인트 (청크 계획이 같을 때만 이어서 사용)"""
+    saved = {str(i): {"done": True, "result": result} for i, result in results.items()}
+    saved.update({str(i): dict(checkpoint, done=False) for i, checkpoint in partial.items()})
+    return {
+        "long_form": True,
+        "language": language,
+        "plan": [[chunk.start, chunk.end] for chunk in chunks],
+        "chunks": saved,
+    }
+
+
+class _StopFlag:
+    """in-process 실행용 취소/일시정지 플래그 (워커 프로세스의 cancel_flag처럼 value로 읽고 씀)"""
+
+    def __init__(self):
+        self.value = 0
+        self.cancelled_at: Optional[float] = None
+
+
+class TranscriptionJob:
+    def __init__(self, kind: str, file_path: str, model_size: str, options: Dict[str, Any], engine: Optional[str],
+                 clip: Optional[Tuple[str, float, float]], loop: asyncio.AbstractEventLoop,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]], tag: Optional[str] = None):
+        self.key = str(uuid.uuid4())
+        self.kind = kind
+        self.file_path = file_path
+        self.model_size = model_size
+        self.options = options
+        self.engine = engine
+        self.clip = clip
+        self.loop = loop
+        self.on_event = on_event
+        self.future: asyncio.Future = loop.create_future()
+        self.worker: Optional["_Worker"] = None
+        self.cancelled = False
+        self.tag = tag  # 호출자 작업 식별자 (작업 저장소 job id): 일시정지는 이 단위로 요청됨
+        self.paused = False
+        self.cancel_requested_at: Optional[float] = None
+
+
+class _Worker:
+    def __init__(self, worker_id: int, process, task_queue, cancel_flag):
+        self.id = worker_id
+        self.process = process
+        self.task_queue = task_queue
+        self.cancel_flag = cancel_flag
+        self.job: Optional[TranscriptionJob] = None
+
+
+class TranscriptionPool:
+    """
+    Whisper 변환 전용 워커 프로세스 풀.
+    - 워커마다 모델을 미리 로드해 두고 torch 스레드 수를 고정해, 웹 서버 프로세스(GIL/메모리)와 분리된 채로
+      여러 파일을 동시에 변환한다 (예: 6코어/12스레드 CPU에서 워커 3개 × 스레드 4개).
+    - 대기 작업은 부모가 보관하다가 쉬는 워커에 하나씩 보낸다. 진행/결과는 이벤트 큐로 받아 이벤트 루프에 전달.
+    - workers=0이면 프로세스 없이 cpu 실행 풀에서 같은 변환 함수를 실행한다.
+    - pause(tag)는 그 tag의 작업을 윈도우 경계에서 멈추고 워커를 비운다. 호출자는 TranscriptionPaused의
+      체크포인트를 resume_from으로 다시 넘겨 멈춘 위치부터 이어서 변환한다.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int, preload: Optional[List[str]] = None):
+        self.num_workers = workers
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.preload = preload or []
+        self._ctx = multiprocessing.get_context("spawn")  # torch/스레드가 있는 프로세스에서 fork는 안전하지 않음
+        self._workers: List[_Worker] = []
+        self._pending: Deque[TranscriptionJob] = deque()
+        self._jobs: Dict[str, TranscriptionJob] = {}
+        self._inline: Dict[str, Tuple[Optional[str], _StopFlag]] = {}  # in-process로 실행 중인 작업의 (tag, 플래그)
+        self._paused_tags = set()
+        self._cancel_latencies: Deque[float] = deque(maxlen=CANCEL_LATENCY_HISTORY)
+        self._lock = threading.Lock()
+        self._event_queue = None
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._next_worker_id = 0
+
+    @property
+    def in_process(self) -> bool:
+        return self.num_workers <= 0
+
+    # --- 수명 주기 --- #
+
+    def start(self):
+        with self._lock:
+            if self.in_process or self._listener is not None:
+                return
+            self._stopping.clear()
+            self._event_queue = self._ctx.Queue()
+            for _ in range(self.num_workers):
+                self._workers.append(self._spawn_worker_locked())
+            self._listener = threading.Thread(target=self._listen, name="transcription-pool", daemon=True)
+            self._listener.start()
+        logger.info(f"[TranscriptionPool] 워커 {self.num_workers}개 시작 (워커당 스레드 {self.threads_per_worker}개, 예열 모델: {self.preload})")
+
+    def _spawn_worker_locked(self) -> _Worker:
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        task_queue = self._ctx.Queue()
+        cancel_flag = self._ctx.Value("b", 0)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, self._event_queue, cancel_flag, self.threads_per_worker, self.preload),
+            name=f"whisper-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return _Worker(worker_id, process, task_queue, cancel_flag)
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            workers, self._workers = self._workers, []
+            listener, self._listener = self._listener, None
+            jobs = list(self._jobs.values())
+            self._pending.clear()
+            self._jobs.clear()
+        self._stopping.set()
+        for worker in workers:
+            worker.task_queue.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if listener:
+            listener.join(timeout)
+        for job in jobs:
+            self._resolve(job, exception=RuntimeError("변환 워커 풀이 종료되었습니다."))
+        if workers:
+            logger.info("[TranscriptionPool] 중지됨")
+
+    # --- 작업 제출 --- #
+
+    async def transcribe(self, file_path: str, model_size: str, options: Optional[Dict[str, Any]] = None,
+                         on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         engine: Optional[str] = None, clip: Optional[Tuple[str, float, float]] = None,
+                         tag: Optional[str] = None, resume_from: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        파일을 변환하고 결과 dict를 반환한다. on_event는 이벤트 루프에서 진행 이벤트마다 호출된다.
+        engine은 whisper_engines 이름 (None이면 settings.whisper_engine), clip은 run_transcription 참고.
+        이 코루틴이 취소되면 대기 중인 작업은 큐에서 빠지고, 실행 중인 작업은 워커에 취소 플래그가 전달된다.
+        pause(tag)로 멈추면 TranscriptionPaused(체크포인트)를 던지고, 그 체크포인트를 resume_from으로 넘기면
+        멈춘 위치부터 나머지 오디오만 변환해 앞 구간 segment와 합친 결과를 반환한다.
+        """
+        if not resume_from or resume_from.get("offset", 0.0) <= 0:
+            return await self._submit("transcribe", file_path, model_size, options, on_event, engine, clip, tag)
+
+        offset = resume_from["offset"]
+        if clip is None:
+            clip = (await run_io(audio_cache.get, file_path), 0.0, None)
+        pcm_path, clip_start, clip_end = clip
+        options = dict(options or {})
+        if resume_from.get("language"):
+            options.setdefault("language", resume_from["language"])
+        # 앞 구간의 마지막 자막을 문맥으로 넘겨 이어지는 문장을 자연스럽게 디코딩
+        prompt = "".join(segment["text"] for segment in resume_from["segments"]).strip()[-RESUME_PROMPT_CHARS:]
+        if prompt:
+            options.setdefault("initial_prompt", prompt)
+
+        def shifted(event: Dict[str, Any]):
+            if event.get("type") == "progress":
+                event = dict(event, processed=round(event["processed"] + offset, 2), duration=round(event["duration"] + offset, 2),
+                             segments=offset_segments(event["segments"], offset))
+            on_event(event)
+
+        if clip_end is not None and clip_start + offset >= clip_end:
+            result = {"text": "", "segments": [], "language": options.get("language")}
+        else:
+            try:
+                result = await self._submit("transcribe", file_path, model_size, options, shifted if on_event else None,
+                                            engine, (pcm_path, clip_start + offset, clip_end), tag)
+            except TranscriptionPaused as e:
+                raise TranscriptionPaused(merge_checkpoint(resume_from, e.checkpoint)) from None
+        segments = [dict(segment, id=i) for i, segment in enumerate(resume_from["segments"] + offset_segments(result.get("segments", []), offset))]
+        return dict(result, segments=segments, text="".join(segment["text"] for segment in segments),
+                    language=result.get("language") or resume_from.get("language"))
+
+    async def detect_language(self, file_path: str, model_size: str, engine: Optional[str] = None,
+                              samples: Optional[int] = None, sample_seconds: Optional[float] = None,
+                              tag: Optional[str] = None) -> Dict[str, Any]:
+        """전체 변환 없이 샘플 구간만으로 언어를 판정한다 (language_probe.detect_language_in_samples 결과 반환)."""
+        options = {
+            "samples": samples or settings.language_probe_samples,
+            "sample_seconds": sample_seconds or settings.language_probe_sample_seconds,
+        }
+        return await self._submit("detect_language", file_path, model_size, options, None, engine, None, tag)
+
+    async def check_sync(self, media_path: str, subtitle_path: str, model_size: Optional[str] = None,
+                         engine: Optional[str] = None) -> Dict[str, Any]:
+        """
+        미디어/자막 한 쌍의 싱크를 워커에서 검사한다 (sync_checker.score_subtitle_sync 결과 반환).
+        model_size를 주면 워커에 이미 로드된 모델로 샘플 구간 텍스트도 대조한다.
+        """
+        options = {"subtitle_path": subtitle_path, "verify_text": bool(model_size)}
+        return await self._submit("sync_check", media_path, model_size or "base", options, None, engine, None)
+
+    async def _submit(self, kind: str, file_path: str, model_size: str, options: Optional[Dict[str, Any]],
+                      on_event: Optional[Callable[[Dict[str, Any]], None]], engine: Optional[str],
+                      clip: Optional[Tuple[str, float, float]], tag: Optional[str] = None) -> Dict[str, Any]:
+        options = dict(options or {})
+        get_engine(engine)  # 잘못된 엔진 이름은 워커에 보내기 전에 ValueError
+        loop = asyncio.get_running_loop()
+        if self.in_process:
+            stop_flag = _StopFlag()
+            inline_key = str(uuid.uuid4())
+            with self._lock:
+                if tag is not None and tag in self._paused_tags:
+                    raise TranscriptionPaused()
+                self._inline[inline_key] = (tag, stop_flag)
+            emit = (lambda payload: loop.call_soon_threadsafe(on_event, payload)) if on_event else (lambda payload: None)
+
+            def run_inline():
+                try:
+                    return TASKS[kind](file_path, model_size, options, emit, lambda: stop_flag.value, engine, clip)
+                finally:
+                    if stop_flag.cancelled_at is not None:
+                        self._record_cancel_latency(file_path, time.monotonic() - stop_flag.cancelled_at)
+
+            try:
+                return await run_cpu(run_inline)
+            except TranscriptionPaused:
+                raise
+            except TranscriptionCancelled:
+                # 언어 감지 등 체크포인트가 없는 작업은 처음부터 다시 하도록 빈 체크포인트로 일시정지
+                if stop_flag.value == STOP_PAUSE:
+                    raise TranscriptionPaused() from None
+                raise
+            except asyncio.CancelledError:
+                stop_flag.cancelled_at = time.monotonic()
+                stop_flag.value = STOP_CANCEL
+                raise
+            finally:
+                with self._lock:
+                    self._inline.pop(inline_key, None)
+
+        self.start()
+        job = TranscriptionJob(kind, file_path, model_size, options, engine, clip, loop, on_event, tag)
+        with self._lock:
+            if tag is not None and tag in self._paused_tags:
+                raise TranscriptionPaused()
+            self._jobs[job.key] = job
+            self._pending.append(job)
+            self._dispatch_locked()
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            self.cancel(job.key)
+            raise
+
+    async def transcribe_long_form(self, file_path: str, model_size: str, options: Optional[Dict[str, Any]] = None,
+                                   on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                   engine: Optional[str] = None, tag: Optional[str] = None,
+                                   resume_from: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        긴 파일(영화 등) 변환: 오디오 캐시에서 VAD로 음성 구간만 청크로 나누고, 청크들을 워커에 나눠
+        병렬로 변환한 뒤 시간축을 원본 기준으로 이어 붙인다. 무음/음악 구간은 디코딩하지 않는다.
+        진행 이벤트의 processed/duration은 음성 구간 합계 기준.
+        일시정지되면 끝난 청크의 결과와 멈춘 청크의 체크포인트를 모아 TranscriptionPaused를 던지고,
+        resume_from으로 이어서 변환할 때는 끝난 청크는 건너뛰고 멈춘 청크는 멈춘 위치부터 변환한다.
+        """
+        options = dict(options or {})
+        pcm_path, chunks, _ = await run_cpu(prepare_long_form, file_path, settings.long_form_chunk_seconds)
+        if not chunks:
+            return {"text": "", "segments": [], "language": options.get("language", "unk")}
+        saved: Dict[str, Dict[str, Any]] = {}
+        if resume_from:
+            if resume_from.get("plan") == [[chunk.start, chunk.end] for chunk in chunks]:
+                saved = resume_from.get("chunks", {})
+                if resume_from.get("language"):
+                    options.setdefault("language", resume_from["language"])
+            else:
+                logger.warning(f"[TranscriptionPool] 청크 계획이 체크포인트와 달라 처음부터 변환: {file_path}")
+        results: Dict[int, Dict[str, Any]] = {int(i): state["result"] for i, state in saved.items() if state.get("done")}
+        speech_total = sum(chunk.duration for chunk in chunks)
+        processed = [0.0] * len(chunks)
+        for i, state in saved.items():
+            processed[int(i)] = chunks[int(i)].duration if state.get("done") else state.get("offset", 0.0)
+
+        def chunk_handler(index: int):
+            def handler(event: Dict[str, Any]):
+                if event.get("type") != "progress":
+                    return
+                processed[index] = min(event["processed"], chunks[index].duration)
+                if on_event:
+                    on_event({
+                        "type": "progress",
+                        "processed": round(sum(processed), 2),
+                        "duration": round(speech_total, 2),
+                        "segments": offset_segments(event["segments"], chunks[index].start),
+                        "chunk": index,
+                        "chunks": len(chunks),
+                    })
+            return handler
+
+        def run_chunk(index: int, chunk_options: Dict[str, Any]):
+            chunk = chunks[index]
+            return self.transcribe(file_path, model_size, chunk_options, on_event=chunk_handler(index),
+                                   engine=engine, clip=(pcm_path, chunk.start, chunk.end), tag=tag,
+                                   resume_from=saved.get(str(index)))
+
+        # 언어를 지정하지 않았으면 첫 청크에서 감지한 언어로 나머지를 고정 (청크마다 다른 언어로 인식되는 것 방지)
+        remaining = [i for i in range(len(chunks)) if i not in results]
+        if remaining and not options.get("language"):
+            first = remaining.pop(0)
+            try:
+                results[first] = await run_chunk(first, options)
+            except TranscriptionPaused as e:
+                raise TranscriptionPaused(_long_form_checkpoint(chunks, results, {first: e.checkpoint}, None)) from None
+            options["language"] = results[first].get("language")
+        tasks = {i: asyncio.ensure_future(run_chunk(i, options)) for i in remaining}
+        try:
+            results.update(zip(tasks, await asyncio.gather(*tasks.values())))
+        except TranscriptionPaused:
+            # 일시정지: 실행 중인 청크들이 각자 윈도우 경계에서 멈출 때까지 기다려 체크포인트를 모음
+            outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+            partial = {}
+            for i, outcome in zip(tasks, outcomes):
+                if isinstance(outcome, TranscriptionPaused):
+                    partial[i] = outcome.checkpoint
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                else:
+                    results[i] = outcome
+            raise TranscriptionPaused(_long_form_checkpoint(chunks, results, partial, options.get("language"))) from None
+        except BaseException:
+            # 한 청크라도 실패/취소되면 나머지 청크도 워커에서 내림
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return stitch_chunk_results(chunks, [results[i] for i in range(len(chunks))], options.get("language"))
+
+    def pause(self, tag: str) -> int:
+        """
+        tag의 작업을 일시정지한다: 대기 중이면 큐에서 빼고, 실행 중이면 워커가 다음 윈도우 경계에서 체크포인트를
+        남기고 멈춘다 (워커는 바로 다음 작업을 받음). clear_pause 전까지 같은 tag의 새 작업도 바로 일시정지된다.
+        일시정지를 요청한 작업 수를 반환.
+        """
+        removed = []
+        requested = 0
+        with self._lock:
+            self._paused_tags.add(tag)
+            for job in list(self._jobs.values()):
+                if job.tag != tag or job.cancelled:
+                    continue
+                job.paused = True
+                requested += 1
+                if job.worker is None:
+                    self._pending.remove(job)
+                    del self._jobs[job.key]
+                    removed.append(job)
+                else:
+                    job.worker.cancel_flag.value = STOP_PAUSE
+            for job_tag, flag in self._inline.values():
+                if job_tag == tag:
+                    flag.value = STOP_PAUSE
+                    requested += 1
+        for job in removed:
+            self._resolve(job, exception=TranscriptionPaused())
+        return requested
+
+    def clear_pause(self, tag: str):
+        """일시정지 요청을 거둔다 (아직 윈도우 경계에 닿지 않은 작업은 그대로 계속 변환)."""
+        with self._lock:
+            self._paused_tags.discard(tag)
+            for job in self._jobs.values():
+                if job.tag == tag and job.paused:
+                    job.paused = False
+                    if job.worker is not None and job.worker.cancel_flag.value == STOP_PAUSE:
+                        job.worker.cancel_flag.value = 0
+            for job_tag, flag in self._inline.values():
+                if job_tag == tag and flag.value == STOP_PAUSE:
+                    flag.value = 0
+
+    def cancel(self, job_key: str) -> bool:
+        """대기 중이면 큐에서 제거, 실행 중이면 해당 워커에 취소 플래그를 세운다."""
+        with self._lock:
+            job = self._jobs.get(job_key)
+            if job is None:
+                return False
+            job.cancelled = True
+            if job.cancel_requested_at is None:
+                job.cancel_requested_at = time.monotonic()
+            if job.worker is None:
+                self._pending.remove(job)
+                del self._jobs[job_key]
+            else:
+                job.worker.cancel_flag.value = STOP_CANCEL
+                return True
+        self._resolve(job, exception=asyncio.CancelledError())
+        return True
+
+    def _dispatch_locked(self):
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.job is None and worker.process.is_alive():
+                job = self._pending.popleft()
+                job.worker = worker
+                worker.job = job
+                worker.cancel_flag.value = 0
+                worker.task_queue.put((job.key, job.kind, job.file_path, job.model_size, job.options, job.engine, job.clip))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": "in_process" if self.in_process else "processes",
+                "workers": [
+                    {"id": w.id, "pid": w.process.pid, "alive": w.process.is_alive(),
+                     "file_path": w.job.file_path if w.job else None, "task": w.job.kind if w.job else None}
+                    for w in self._workers
+                ],
+                "pending": len(self._pending),
+                "cancel_latency": self._cancel_latency_stats_locked(),
+            }
+
+    def _cancel_latency_stats_locked(self) -> Dict[str, Any]:
+        """실행 중에 취소된 작업의 취소 요청 → 워커 반환 시간(초) 통계 (최근 CANCEL_LATENCY_HISTORY개)"""
+        latencies = list(self._cancel_latencies)
+        if not latencies:
+            return {"count": 0, "last": None, "avg": None, "max": None}
+        return {
+            "count": len(latencies),
+            "last": round(latencies[-1], 3),
+            "avg": round(sum(latencies) / len(latencies), 3),
+            "max": round(max(latencies), 3),
+        }
+
+    def _record_cancel_latency(self, file_path: str, seconds: float):
+        with self._lock:
+            self._cancel_latencies.append(seconds)
+        logger.info(f"[TranscriptionPool] 취소 후 워커 반환까지 {seconds:.2f}초: {file_path}")
+
+    # --- 이벤트 수신 (리스너 스레드) --- #
+
+    def _resolve(self, job: TranscriptionJob, result: Any = None, exception: Optional[BaseException] = None):
+        def _set():
+            if job.future.done():
+                return
+            if isinstance(exception, asyncio.CancelledError):
+                job.future.cancel()
+            elif exception is not None:
+                job.future.set_exception(exception)
+            else:
+                job.future.set_result(result)
+        try:
+            job.loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            pass  # 이벤트 루프가 이미 닫힘
+
+    def _finish_locked(self, job_key: str) -> Optional[TranscriptionJob]:
+        job = self._jobs.pop(job_key, None)
+        if job and job.worker and job.worker.job is job:
+            job.worker.job = None
+        self._dispatch_locked()
+        return job
+
+    def _listen(self):
+        last_reap = time.monotonic()
+        while not self._stopping.is_set():
+            if time.monotonic() - last_reap >= 1.0:
+                self._reap_dead_workers()
+                last_reap = time.monotonic()
+            try:
+                kind, job_key, payload = self._event_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            if kind in (EVENT_READY, EVENT_STARTED):
+                continue
+            if kind == EVENT_PROGRESS:
+                with self._lock:
+                    job = self._jobs.get(job_key)
+                if job and job.on_event and not job.cancelled:
+                    try:
+                        job.loop.call_soon_threadsafe(job.on_event, payload)
+                    except RuntimeError:
+                        pass
+                continue
+            with self._lock:
+                job = self._finish_locked(job_key)
+            if job is None:
+                continue
+            if job.cancel_requested_at is not None:
+                # 실행 중에 취소된 작업: 워커가 이벤트를 보낸 시점에 이미 다음 작업을 받을 수 있는 상태
+                self._record_cancel_latency(job.file_path, time.monotonic() - job.cancel_requested_at)
+            if kind == EVENT_DONE and not job.cancelled:
+                self._resolve(job, result=payload)
+            elif kind == EVENT_ERROR and not job.cancelled:
+                self._resolve(job, exception=RuntimeError(payload))
+            elif kind == EVENT_PAUSED and not job.cancelled:
+                self._resolve(job, exception=TranscriptionPaused(payload))
+            elif kind == EVENT_CANCELLED and job.paused and not job.cancelled:
+                # 체크포인트가 없는 작업(언어 감지 등)이 일시정지 요청으로 멈춤
+                self._resolve(job, exception=TranscriptionPaused())
+            else:
+                self._resolve(job, exception=asyncio.CancelledError())
+
+    def _reap_dead_workers(self):
+        """비정상 종료(OOM 등)된 워커의 작업을 오류 처리하고 워커를 다시 띄운다."""
+        failed = []
+        with self._lock:
+            for i, worker in enumerate(self._workers):
+                if worker.process.is_alive() or self._stopping.is_set():
+                    continue
+                logger.error(f"[TranscriptionPool] 워커 {worker.id} 비정상 종료 (exitcode={worker.process.exitcode}), 재시작")
+                if worker.job is not None:
+                    failed.append((self._jobs.pop(worker.job.key, worker.job), worker.process.exitcode))
+                self._workers[i] = self._spawn_worker_locked()
+            if failed:
+                self._dispatch_locked()
+        for job, exitcode in failed:
+            self._resolve(job, exception=RuntimeError(f"변환 워커 프로세스가 비정상 종료되었습니다 (exitcode={exitcode})"))
+
+
+transcription_pool = TranscriptionPool(
+    settings.transcription_workers,
+    settings.transcription_threads_per_worker,
+    [name.strip() for name in settings.whisper_warmup_models.split(",") if name.strip()],
+)
@@ -0,0 +1,258 @@
+import io
+import sys
+import inspect
+import importlib.util
+import logging
+import threading
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import settings
+from backend.services.model_registry import ModelRegistry, whisper_models
+
+logger = logging.getLogger(__name__)
+
+# faster-whisper WhisperModel.transcribe가 받는 옵션 (openai-whisper 전용 옵션 verbose/fp16 등은 제외)
+FASTER_WHISPER_OPTIONS = {
+    "language", "task", "beam_size", "best_of", "patience", "length_penalty", "temperature",
+    "compression_ratio_threshold", "log_prob_threshold", "no_speech_threshold", "condition_on_previous_text",
+    "initial_prompt", "prefix", "suppress_blank", "suppress_tokens", "without_timestamps", "word_timestamps",
+    "vad_filter", "vad_parameters",
+}
+# openai-whisper와 faster-whisper의 옵션 이름 차이
+OPTION_ALIASES = {"logprob_threshold": "log_prob_threshold"}
+
+# 진행 콜백: (처리한 오디오 초, 전체 오디오 초, 이번 윈도우에서 새로 나온 segment 목록)
+# 콜백에서 예외(TranscriptionCancelled)를 던지면 다음 윈도우로 넘어가지 않고 변환이 중단된다.
+ProgressCallback = Callable[[float, float, List[Dict[str, Any]]], None]
+
+
+class TranscriptionCancelled(Exception):
+    """진행 콜백에서 취소 요청을 확인하고 변환을 중단한 경우"""
+
+
+class TranscriptionPaused(TranscriptionCancelled):
+    """
+    일시정지 요청으로 윈도우 경계에서 변환을 멈춘 경우. checkpoint로 이어서 변환할 수 있다:
+    {'offset': 디코딩을 마친 오디오 위치(초), 'segments': 그때까지 확정된 segment, 'language': 고정된 언어 또는 None}
+    """
+
+    def __init__(self, checkpoint: Optional[Dict[str, Any]] = None, message: str = "일시정지됨"):
+        super().__init__(message)
+        self.checkpoint = checkpoint or {"offset": 0.0, "segments": [], "language": None}
+
+
+# openai-whisper 디코딩 루프(30초 윈도우)에 진행 콜백을 거는 스레드별 슬롯
+_window_progress = threading.local()
+
+
+class _NullOutput(io.TextIOBase):
+    """진행 막대 출력을 버리는 스트림"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _whisper_loop_is_hookable(whisper_transcribe) -> bool:
+    """
+    설치된 openai-whisper의 transcribe가 훅이 가정하는 구조인지 확인한다: 지역 변수 all_segments가 있고,
+    tqdm.tqdm(...) 진행 막대를 pbar.update로 직접 갱신한다 (버전이 바뀌어 구조가 달라지면 진행 중 segment를 읽지 못함).
+    """
+    transcribe = getattr(whisper_transcribe, "transcribe", None)
+    code = getattr(transcribe, "__code__", None)
+    if code is None or "all_segments" not in code.co_varnames + code.co_cellvars:
+        return False
+    try:
+        source = inspect.getsource(transcribe)
+    except (OSError, TypeError):
+        return False
+    return "tqdm.tqdm(" in source and "pbar.update(" in source
+
+
+def _install_whisper_window_hook() -> bool:
+    """
+    whisper.transcribe 모듈이 쓰는 tqdm을 교체해, 30초 윈도우를 디코딩할 때마다(pbar.update)
+    현재 스레드의 진행 콜백을 호출한다. 콜백이 없는 스레드에서는 진행 막대만 세고 아무것도 하지 않는다.
+    진행 막대는 윈도우를 세는 데만 쓰므로 출력은 버린다 (워커마다 서버 로그에 막대를 그리지 않게).
+    설치된 whisper가 예상한 구조가 아니면 경고를 남기고 False (호출한 쪽은 변환이 끝난 뒤 한 번에 진행 상황을 알림).
+    """
+    try:
+        import whisper.transcribe as whisper_transcribe
+    except ImportError:
+        return False
+    if getattr(whisper_transcribe.tqdm, "window_hook", False):
+        return True
+    if getattr(whisper_transcribe, "window_hook_unsupported", False):
+        return False
+    if not _whisper_loop_is_hookable(whisper_transcribe):
+        logger.warning("[WhisperEngine] 설치된 openai-whisper의 디코딩 루프 구조가 달라 윈도우별 진행 알림을 끄고, 변환이 끝난 뒤 한 번에 알립니다.")
+        whisper_transcribe.window_hook_unsupported = True
+        return False
+    base_tqdm = whisper_transcribe.tqdm.tqdm
+
+    class WindowProgress(base_tqdm):
+        def __init__(self, *args, **kwargs):
+            kwargs["file"] = _NullOutput()
+            super().__init__(*args, **kwargs)
+
+        def update(self, n=1):
+            displayed = super().update(n)
+            callback = getattr(_window_progress, "callback", None)
+            if callback is not None:
+                # 디코딩 루프(transcribe 함수)의 지역 변수에서 지금까지 확정된 segment를 읽음
+                segments = sys._getframe(1).f_locals.get("all_segments", [])
+                callback(self.n, self.total, segments)
+            return displayed
+
+    whisper_transcribe.tqdm = SimpleNamespace(tqdm=WindowProgress, window_hook=True)
+    return True
+
+
+class WhisperEngine(ABC):
+    """
+    변환 엔진 인터페이스. transcribe는 openai-whisper의 model.transcribe와 같은 형식의 dict를 반환해야 한다:
+    {'text': str, 'language': str, 'segments': [{'id', 'seek', 'start', 'end', 'text', 'tokens', 'temperature',
+    'avg_logprob', 'compression_ratio', 'no_speech_prob'}, ...]} → 이후 SRT 저장 로직은 엔진과 무관하게 동일.
+    transcribe/detect_language를 구현하지 않은 엔진은 만들 수 없다 (ENGINES에 등록할 때 바로 TypeError).
+    """
+    name = ""
+    module = ""
+    models: ModelRegistry
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def dtype(self) -> Optional[str]:
+        """모델 레지스트리 키에 쓰는 연산 타입 (None이면 장치 기본값)"""
+        return None
+
+    def warm_up(self, names: List[str]):
+        self.models.warm_up(names, dtype=self.dtype())
+
+    @abstractmethod
+    def transcribe(self, model_size: str, audio: str, on_progress: Optional[ProgressCallback] = None, **options) -> Dict[str, Any]:
+        """audio(파일 경로 또는 16kHz 오디오 배열)를 변환한다. on_progress는 디코딩 단위마다 호출."""
+
+    @abstractmethod
+    def detect_language(self, model_size: str, audio) -> Dict[str, float]:
+        """16kHz 오디오 배열의 처음 30초(한 윈도우)만 보고 언어별 확률을 반환한다 (디코딩 없음)."""
+
+
+class OpenAIWhisperEngine(WhisperEngine):
+    """openai-whisper (PyTorch, CPU에서는 fp32)"""
+    name = "openai"
+    module = "whisper"
+    models = whisper_models
+
+    def transcribe(self, model_size: str, audio: str, on_progress: Optional[ProgressCallback] = None, **options) -> Dict[str, Any]:
+        if on_progress is None or not _install_whisper_window_hook():
+            result = whisper_models.transcribe(model_size, audio, **options)
+            if on_progress is not None:
+                end = result["segments"][-1]["end"] if result.get("segments") else 0.0
+                on_progress(end, end, result.get("segments", []))
+            return result
+
+        from whisper.audio import FRAMES_PER_SECOND
+        sent = 0
+
+        def on_window(frames_done: int, frames_total: int, segments: List[Dict[str, Any]]):
+            nonlocal sent
+            new_segments, sent = segments[sent:], len(segments)
+            on_progress(frames_done / FRAMES_PER_SECOND, (frames_total or 0) / FRAMES_PER_SECOND, new_segments)
+
+        _window_progress.callback = on_window
+        try:
+            return whisper_models.transcribe(model_size, audio, **options)
+        finally:
+            _window_progress.callback = None
+
+    def detect_language(self, model_size: str, audio) -> Dict[str, float]:
+        import whisper
+        dtype = whisper_models.resolve_key(model_size)[2]
+        with whisper_models.use(model_size) as model:
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels).to(model.device)
+            if dtype == "float16":
+                mel = mel.half()
+            _, probs = model.detect_language(mel)
+        return dict(probs)
+
+
+def load_faster_whisper_model(name: str, device: str, compute_type: str):
+    from faster_whisper import WhisperModel
+    return WhisperModel(name, device=device, compute_type=compute_type, cpu_threads=settings.transcription_threads_per_worker)
+
+
+class FasterWhisperEngine(WhisperEngine):
+    """faster-whisper (CTranslate2). CPU에서 int8 양자화로 openai-whisper fp32보다 빠르고 메모리를 덜 쓴다."""
+    name = "faster-whisper"
+    module = "faster_whisper"
+
+    def __init__(self):
+        self.models = ModelRegistry(settings.whisper_model_cache_mb, loader=load_faster_whisper_model)
+
+    def dtype(self) -> Optional[str]:
+        return settings.faster_whisper_compute_type
+
+    def transcribe(self, model_size: str, audio: str, on_progress: Optional[ProgressCallback] = None, **options) -> Dict[str, Any]:
+        kwargs = {}
+        for key, value in options.items():
+            key = OPTION_ALIASES.get(key, key)
+            if key in FASTER_WHISPER_OPTIONS:
+                kwargs[key] = value
+        with self.models.use(model_size, dtype=self.dtype()) as model:
+            # segments는 지연 생성기: 한 segment를 디코딩할 때마다 진행 상황을 알리고 취소를 확인
+            segments_iter, info = model.transcribe(audio, **kwargs)
+            segments = []
+            for segment in segments_iter:
+                segments.append(self._segment_to_dict(segment))
+                if on_progress is not None:
+                    on_progress(segment.end, info.duration, segments[-1:])
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+    def detect_language(self, model_size: str, audio) -> Dict[str, float]:
+        with self.models.use(model_size, dtype=self.dtype()) as model:
+            _, _, all_probs = model.detect_language(audio)
+        return dict(all_probs)
+
+    @staticmethod
+    def _segment_to_dict(segment) -> Dict[str, Any]:
+        item = {
+            "id": segment.id - 1,  # faster-whisper는 1부터, openai-whisper는 0부터
+            "seek": segment.seek,
+            "start": segment.start,
+            "end": segment.end,
+            "text": segment.text,
+            "tokens": list(segment.tokens),
+            "temperature": segment.temperature,
+            "avg_logprob": segment.avg_logprob,
+            "compression_ratio": segment.compression_ratio,
+            "no_speech_prob": segment.no_speech_prob,
+        }
+        if segment.words:
+            item["words"] = [
+                {"word": word.word, "start": word.start, "end": word.end, "probability": word.probability}
+                for word in segment.words
+            ]
+        return item
+
+
+ENGINES: Dict[str, WhisperEngine] = {engine.name: engine for engine in (OpenAIWhisperEngine(), FasterWhisperEngine())}
+
+
+def get_engine(name: Optional[str] = None) -> WhisperEngine:
+    """이름으로 엔진을 찾는다 (None이면 settings.whisper_engine). 없는 엔진이면 ValueError."""
+    name = name or settings.whisper_engine
+    engine = ENGINES.get(name)
+    if engine is None:
+        raise ValueError(f"지원하지 않는 Whisper 엔진입니다: {name} (가능: {', '.join(ENGINES)})")
+    return engine
+
+
+def list_engines() -> List[Dict[str, Any]]:
+    return [{"name": name, "available": engine.is_available(), "default": name == settings.whisper_engine}
+            for name, engine in ENGINES.items()]
@@ -177,7 +177,8 @@ function renderDirectoryList(directories) {
             // 미디어 개수 표시 추가
             let countStr = '';
             if (typeof dir.video_count === 'number' && typeof dir.audio_count === 'number') {
-                countStr = ` <span style="color:#888;font-size:0.97em;">(영상 ${dir.video_count}, 오디오 ${dir.audio_count})</span>`;
+                const subtitleStr = typeof dir.without_subtitle_count === 'number' ? `, 자막없음 ${dir.without_subtitle_count}` : '';
+                countStr = ` <span style="color:#888;font-size:0.97em;">(영상 ${dir.video_count}, 오디오 ${dir.audio_count}${subtitleStr})</span>`;
             }
             li.innerHTML = `<a href="javascript:void(0);" class="directory">📁 ${dir.name}${countStr}</a>`;
             li.querySelector('a').addEventListener('click', function() {
@@ -234,34 +235,7 @@ function updateFileList(files) {
     
     // 파일 목록 렌더링
     files.forEach((file, index) => {
-        const tr = document.createElement('tr');
-        tr.dataset.path = file.path;
-        tr.dataset.type = file.type || '';
-        tr.dataset.filename = file.name || '';
-        
-        tr.innerHTML = `
-            <td><input type="checkbox" class="file-checkbox"></td>
-            <td class="status"></td>
-            <td class="progress"></td>
-            <td>${file.name}</td>
-            <td class="lang-code" title="언어">${file.language || '-'}</td>
-            <td class="subtitle-status">${file.has_subtitle ? 'O' : 'X'}</td>
-            <td class="subtitle-preview"></td>
-            <td class="extract-embedded">
-                ${file.has_embedded ? '<button class="extract-btn" title="내장자막 추출">E</button>' : '-'}
-            </td>
-        `;
-        
-        // 내장 자막 추출 버튼 이벤트 (필요 시)
-        const extractBtn = tr.querySelector('.extract-btn');
-        if (extractBtn) {
-            extractBtn.addEventListener('click', function() {
-                if (typeof extractEmbeddedSubtitle === 'function') {
-                    extractEmbeddedSubtitle(file.path);
-                }
-            });
-        }
-        
+        const tr = createFileRow(file);
         fileListElement.appendChild(tr);
         
         // 일부 파일마다 로그 추가 (첫 3개와 마지막 3개만)
@@ -284,6 +258,42 @@ function updateFileList(files) {
     */
 }
 
+/**
+ * 미디어 파일 한 개에 대한 테이블 행 생성
+ * @param {Object} file - 스캔 결과 파일 정보
+ * @returns {HTMLTableRowElement}
+ */
+function createFileRow(file) {
+    const tr = document.createElement('tr');
+    tr.dataset.path = file.path;
+    tr.dataset.type = file.type || '';
+    tr.dataset.filename = file.name || '';
+    
+    tr.innerHTML = `
+        <td><input type="checkbox" class="file-checkbox"></td>
+        <td class="status"></td>
+        <td class="progress"></td>
+        <td>${file.name}</td>
+        <td class="lang-code" title="언어">${file.language || '-'}</td>
+        <td class="subtitle-status">${file.has_subtitle ? 'O' : 'X'}</td>
+        <td class="subtitle-preview"></td>
+        <td class="extract-embedded">
+            ${file.has_embedded ? '<button class="extract-btn" title="내장자막 추출">E</button>' : '-'}
+        </td>
+    `;
+    
+    // 내장 자막 추출 버튼 이벤트 (필요 시)
+    const extractBtn = tr.querySelector('.extract-btn');
+    if (extractBtn) {
+        extractBtn.addEventListener('click', function() {
+            if (typeof extractEmbeddedSubtitle === 'function') {
+                extractEmbeddedSubtitle(file.path);
+            }
+        });
+    }
+    return tr;
+}
+
 /**
  * 파일 테이블 필터링 (클라이언트 측)
  * 자막 필터, 파일 타입 및 검색어 기준으로 필터링
@@ -421,48 +431,71 @@ async function scanCurrentDirectory() {
         
         console.log(`스캔 시작: 경로=${window.currentRelativePath}, 비디오=${filterVideo}, 오디오=${filterAudio}`);
         
-        // 기존 /api/files 엔드포인트 사용
-        const response = await fetch(`/api/files?scan_path=${encodeURIComponent(window.currentRelativePath)}&filter_video=${filterVideo}&filter_audio=${filterAudio}`, {
+        // 스트리밍 스캔: 디렉토리를 읽는 즉시 NDJSON 한 줄씩 도착하므로 첫 파일부터 바로 표시
+        const response = await fetch(`/api/scan_directory/stream?path=${encodeURIComponent(window.currentRelativePath)}&filter_video=${filterVideo}&filter_audio=${filterAudio}`, {
             method: 'GET'
         });
         
-        const data = await response.json();
-        
-        // 디버깅용 로그 추가
-        console.log('scanCurrentDirectory fetch 응답:', data);
-        
         if (!response.ok) {
+            const data = await response.json().catch(() => ({}));
             throw new Error(data.error || '디렉토리 스캔에 실패했습니다.');
         }
         
-        // 결과 처리
-        if (data.files) {
-            console.log('data.files:', data.files);
-            
-            // 파일 목록 요소 다시 확인
-            if (!fileListElement) {
-                console.error('파일 목록 요소(#file-list)를 찾을 수 없습니다.');
-                throw new Error('파일 목록 요소를 찾을 수 없습니다.');
+        // 파일 목록 요소 다시 확인
+        if (!fileListElement) {
+            console.error('파일 목록 요소(#file-list)를 찾을 수 없습니다.');
+            throw new Error('파일 목록 요소를 찾을 수 없습니다.');
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let fileCount = 0;
+        let summary = null;
+        
+        const handleRecord = (record) => {
+            if (record.type === 'file') {
+                if (fileCount === 0) {
+                    // 첫 파일 도착 시 로딩 메시지 제거
+                    while (fileListElement.firstChild) {
+                        fileListElement.removeChild(fileListElement.firstChild);
+                    }
+                }
+                fileListElement.appendChild(createFileRow(record.file));
+                fileCount++;
+            } else if (record.type === 'summary') {
+                summary = record;
+            } else if (record.type === 'error') {
+                throw new Error(record.error);
             }
-            
-            // 업데이트 전 파일 목록 요소 현재 상태 로깅
-            console.log('파일 목록 업데이트 전 상태:', fileListElement.innerHTML);
-            
-            // 파일 목록 업데이트
-            updateFileList(data.files);
-            
-            // 업데이트 후 파일 목록 요소 상태 로깅
-            console.log('파일 목록 업데이트 후 행 수:', document.querySelectorAll('#file-list tr').length);
-            
-            // 완료 메시지
+        };
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.filter(line => line.trim()).forEach(line => handleRecord(JSON.parse(line)));
             if (batchStatus) {
-                batchStatus.textContent = `스캔 완료: ${data.files.length}개의 미디어 파일 발견`;
+                batchStatus.textContent = `디렉토리 스캔 중... (${fileCount}개 발견)`;
             }
-            
-            // 필터 적용
-            filterTableClientSide();
-        } else {
-            throw new Error('스캔 결과가 없습니다.');
+        }
+        if (buffer.trim()) {
+            handleRecord(JSON.parse(buffer));
+        }
+        
+        if (fileCount === 0) {
+            updateFileList([]);
+        }
+        
+        // 필터 적용
+        filterTableClientSide();
+        
+        // 완료 메시지
+        console.log('스트리밍 스캔 완료:', summary);
+        if (batchStatus) {
+            batchStatus.textContent = `스캔 완료: ${summary ? summary.total : fileCount}개의 미디어 파일 발견`;
         }
     } catch (error) {
         console.error('디렉토리 스캔 오류:', error);
@@ -224,8 +224,10 @@ class WhisperTab {
         
         const modelSize = document.getElementById('model-select').value;
         const language = document.getElementById('whisper-lang').value;
+        const engineSelect = document.getElementById('engine-select');
+        const engine = engineSelect ? engineSelect.value : undefined;
         
-        console.log(`Whisper 자막 생성 시작: ${selectedFiles.length}개 파일, 모델: ${modelSize}, 언어: ${language}`);
+        console.log(`Whisper 자막 생성 시작: ${selectedFiles.length}개 파일, 모델: ${modelSize}, 엔진: ${engine}, 언어: ${language}`);
         
         // 작업 상태 업데이트
         document.getElementById('batch-status').textContent = '서버에 처리 요청 중...';
@@ -240,7 +242,8 @@ class WhisperTab {
                     files: selectedFiles,
                     client_id: window.clientId,
                     model_size: modelSize,
-                    language: language
+                    language: language,
+                    engine: engine
                 }),
             });
             
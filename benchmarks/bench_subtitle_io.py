@@ -0,0 +1,82 @@
+"""
+자막 입출력 벤치마크: 큰 자막 파일을 subtitle_io로 읽기/변환하는 시간과 pysrt 읽기, ffmpeg 변환 시간을 비교한다.
+자막은 합성해서 만든다 (--cues개, 한국어 텍스트, --encoding으로 CP949 파일도 측정 가능).
+ffmpeg가 PATH에 없으면 ffmpeg 항목은 건너뛴다.
+
+사용 예:
+    python -m benchmarks.bench_subtitle_io --cues 100000
+    python -m benchmarks.bench_subtitle_io --cues 50000 --encoding cp949 --targets vtt ass smi --repeat 5
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pysrt
+
+from backend.services.subtitle_io import load_subtitle, convert_subtitle, save_subtitle
+from backend.services.subtitle_cues import CueStore
+
+
+def make_cues(count: int, seed: int = 0) -> CueStore:
+    rng = np.random.default_rng(seed)
+    durations = rng.integers(800, 4000, count)
+    starts = np.cumsum(rng.integers(100, 3000, count) + np.concatenate(([0], durations[:-1])))
+    texts = (f"{i}번째 대사입니다\nline {i} of the benchmark" for i in range(count))
+    return CueStore(starts, starts + durations, texts)
+
+
+def best_of(repeat: int, func) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="subtitle_io vs pysrt(읽기) / ffmpeg(변환) 시간 비교")
+    parser.add_argument("--cues", type=int, default=100000, help="합성할 자막 수")
+    parser.add_argument("--encoding", default="utf-8", help="원본 SRT 인코딩 (utf-8, cp949 등)")
+    parser.add_argument("--targets", nargs="+", default=["vtt", "ass"], help="변환 대상 형식")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_subtitle_io_"))
+    try:
+        source = workdir / "source.srt"
+        save_subtitle(make_cues(args.cues), str(source), encoding=args.encoding)
+        size_mb = os.path.getsize(source) / (1024 * 1024)
+        print(f"원본: {args.cues}개 자막, {size_mb:.1f}MB ({args.encoding})")
+
+        rows = [
+            ("read", "subtitle_io", best_of(args.repeat, lambda: load_subtitle(str(source)))),
+            ("read", "pysrt", best_of(args.repeat, lambda: pysrt.open(str(source), encoding=args.encoding))),
+        ]
+        ffmpeg = shutil.which("ffmpeg")
+        for target in args.targets:
+            output = workdir / f"out.{target}"
+            rows.append((f"srt→{target}", "subtitle_io", best_of(args.repeat, lambda: convert_subtitle(str(source), str(output)))))
+            if ffmpeg and target != "smi":  # ffmpeg는 SAMI를 쓰지 못함
+                cmd = [ffmpeg, "-v", "error", "-y", "-sub_charenc", args.encoding.upper(), "-i", str(source), str(output)]
+                rows.append((f"srt→{target}", "ffmpeg", best_of(args.repeat, lambda: subprocess.run(cmd, check=True, capture_output=True))))
+
+        print(f"{'task':<12}{'tool':<14}{'best(s)':>10}{'cues/s':>14}")
+        for task, tool, seconds in rows:
+            print(f"{task:<12}{tool:<14}{seconds:>10.3f}{args.cues / seconds:>14.0f}")
+        if not ffmpeg:
+            print("ffmpeg를 찾지 못해 ffmpeg 변환은 측정하지 않음")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
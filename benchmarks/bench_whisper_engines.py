@@ -0,0 +1,98 @@
+"""
+Whisper 변환 엔진 벤치마크: 같은 오디오 클립을 엔진별로 변환해 실행 시간과 최대 메모리(RSS)를 비교한다.
+엔진마다 새 프로세스에서 실행하므로 모델 로드/메모리 측정이 서로 영향을 주지 않는다.
+
+사용 예:
+    python -m benchmarks.bench_whisper_engines clip.wav --model base --threads 4
+    python -m benchmarks.bench_whisper_engines clip.wav --engines openai faster-whisper --repeat 3 --srt-dir /tmp/bench
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+
+def _peak_rss_mb() -> float:
+    # 리눅스에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_single(engine_name: str, audio: str, model: str, language: str, repeat: int, srt_dir: str) -> dict:
+    """현재 프로세스에서 한 엔진을 측정한다 (--child 모드)."""
+    from backend.services.whisper_engines import get_engine
+    from backend.services.subtitle_io import save_subtitle, cues_from_segments
+
+    engine = get_engine(engine_name)
+    options = {"language": language} if language else {}
+    start = time.perf_counter()
+    engine.models.get(model, dtype=engine.dtype())
+    load_seconds = time.perf_counter() - start
+
+    runs = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = engine.transcribe(model, audio, **options)
+        runs.append(time.perf_counter() - start)
+
+    srt_path = None
+    if srt_dir:
+        srt_path = Path(srt_dir) / f"{Path(audio).stem}.{engine_name}.srt"
+        srt_path.parent.mkdir(parents=True, exist_ok=True)
+        save_subtitle(cues_from_segments(result["segments"]), str(srt_path))
+
+    return {
+        "engine": engine_name,
+        "model": model,
+        "load_seconds": round(load_seconds, 2),
+        "transcribe_seconds": [round(r, 2) for r in runs],
+        "best_seconds": round(min(runs), 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "segments": len(result["segments"]),
+        "language": result.get("language"),
+        "srt_path": str(srt_path) if srt_path else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="openai-whisper vs faster-whisper(int8) 변환 시간/메모리 비교")
+    parser.add_argument("audio", help="고정 오디오 클립 경로 (wav/mp3/영상 모두 가능)")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--engines", nargs="+", default=["openai", "faster-whisper"])
+    parser.add_argument("--language", default="en", help="언어 고정 (빈 문자열이면 자동 감지)")
+    parser.add_argument("--threads", type=int, default=4, help="엔진별 연산 스레드 수")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--srt-dir", default="", help="엔진별 SRT를 저장해 형식을 비교할 디렉토리")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_single(args.child, args.audio, args.model, args.language, args.repeat, args.srt_dir)))
+        return
+
+    env = dict(os.environ, OMP_NUM_THREADS=str(args.threads), TRANSCRIPTION_THREADS_PER_WORKER=str(args.threads))
+    results = []
+    for engine in args.engines:
+        cmd = [sys.executable, "-m", "benchmarks.bench_whisper_engines", args.audio, "--model", args.model,
+               "--language", args.language, "--repeat", str(args.repeat), "--srt-dir", args.srt_dir, "--child", engine]
+        proc = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=str(Path(__file__).resolve().parent.parent))
+        if proc.returncode != 0:
+            print(f"[{engine}] 실패:\n{proc.stderr.strip()}", file=sys.stderr)
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{'engine':<16}{'load(s)':>10}{'best(s)':>10}{'peak RSS(MB)':>14}{'segments':>10}")
+    for r in results:
+        print(f"{r['engine']:<16}{r['load_seconds']:>10}{r['best_seconds']:>10}{r['peak_rss_mb']:>14}{r['segments']:>10}")
+    if len(results) == 2 and results[1]["best_seconds"]:
+        print(f"속도 비율 ({results[0]['engine']} / {results[1]['engine']}): {results[0]['best_seconds'] / results[1]['best_seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import sys
+import pytest
+
+# 테스트용 가짜 openai-whisper 패키지. 실제 모델 없이 whisper.transcribe의 30초 윈도우 디코딩 루프
+# (tqdm 진행 막대 + all_segments) 구조만 흉내 내며, 워커 프로세스(spawn)에서도 import된다.
+FAKE_WHISPER_FILES = {
+    "__init__.py": '''
+import os
+from . import audio, utils, transcribe as _transcribe_module
+
+class _Mel:
+    def __init__(self, audio):
+        self.audio = audio
+
+    def to(self, *args, **kwargs):
+        return self
+
+    def half(self):
+        return self
+
+def pad_or_trim(audio, length=480000):
+    return audio[:length]
+
+def log_mel_spectrogram(audio, n_mels=80):
+    return _Mel(audio)
+
+class _Model:
+    dims = type("Dims", (), {"n_mels": 80})()
+    device = "cpu"
+
+    def transcribe(self, audio, **kwargs):
+        return _transcribe_module.transcribe(self, audio, **kwargs)
+
+    def detect_language(self, mel):
+        # 큰 소리(진폭 0.2 이상)면 한국어, 아니면 영어로 판정
+        if abs(mel.audio).max() >= 0.2:
+            return None, {"ko": 0.85, "en": 0.1, "ja": 0.05}
+        return None, {"en": 0.9, "ko": 0.06, "ja": 0.04}
+
+def load_model(name, device=None):
+    return _Model()
+''',
+    "audio.py": '''
+FRAMES_PER_SECOND = 100
+''',
+    "utils.py": '''
+class WriteSRT:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def __call__(self, result, audio_path):
+        pass
+''',
+    "transcribe.py": '''
+import os
+import time
+import tqdm
+
+# 파일 이름 규칙: "<윈도우 수>w" 가 들어 있으면 그만큼의 30초 윈도우, "fail"이 있으면 오류
+# 오디오 배열(16kHz)을 받으면 길이만큼 디코딩하고, 배열 길이(샘플 수)를 텍스트로 남긴다
+WINDOW_SECONDS = 0.1
+
+def transcribe(model, audio, verbose=None, language=None, **kwargs):
+    if not isinstance(audio, str):
+        content_frames = len(audio) * 100 // 16000
+        audio = f"array{len(audio)}"
+    else:
+        if "fail" in audio:
+            raise ValueError("bad audio")
+        windows = 2
+        for part in os.path.basename(audio).split("_"):
+            if part.endswith("w") and part[:-1].isdigit():
+                windows = int(part[:-1])
+        content_frames = windows * 3000
+    all_segments = []
+    seek = 0
+    with tqdm.tqdm(total=content_frames, unit="frames", disable=verbose is not False) as pbar:
+        while seek < content_frames:
+            time.sleep(WINDOW_SECONDS)
+            previous_seek = seek
+            start = seek / 100
+            end = min(content_frames, seek + 3000) / 100
+            all_segments.append({"id": len(all_segments), "seek": seek, "start": start, "end": end, "text": f" {audio} {len(all_segments)}"})
+            seek += 3000
+            pbar.update(min(content_frames, seek) - previous_seek)
+    return {"text": "".join(s["text"] for s in all_segments), "segments": all_segments,
+            "language": language or "en", "pid": os.getpid()}
+''',
+}
+
+
+@pytest.fixture
+def fake_whisper(tmp_path, monkeypatch):
+    package = tmp_path / "fake_modules" / "whisper"
+    package.mkdir(parents=True)
+    for name, source in FAKE_WHISPER_FILES.items():
+        (package / name).write_text(source)
+    monkeypatch.syspath_prepend(str(package.parent))
+    for name in [name for name in sys.modules if name == "whisper" or name.startswith("whisper.")]:
+        monkeypatch.delitem(sys.modules, name)
+    yield package
+    # 가짜 모듈로 만든 모델이 다른 테스트에 남지 않도록 레지스트리도 비움
+    from backend.services.model_registry import whisper_models
+    whisper_models.clear()
+    for name in [name for name in sys.modules if name == "whisper" or name.startswith("whisper.")]:
+        del sys.modules[name]
@@ -0,0 +1,75 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import shutil
+import threading
+import time
+import numpy as np
+from backend.services import audio_cache as audio_cache_module
+from backend.services.audio_cache import AudioCache, SAMPLE_RATE
+
+
+def _cache(tmp_path, monkeypatch, max_mb=100):
+    """ffmpeg 대신 미디어 파일 첫 바이트로 정한 길이(초)의 램프 신호를 추출하는 캐시"""
+    cache = AudioCache(str(tmp_path / "cache"), max_mb)
+    extracted = []
+
+    def fake_extract(media_path, path):
+        time.sleep(0.05)
+        extracted.append(media_path)
+        seconds = open(media_path, "rb").read(1)[0]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        (np.arange(seconds * SAMPLE_RATE) % 30000).astype(np.int16).tofile(path)
+
+    monkeypatch.setattr(cache, "_extract", fake_extract)
+    return cache, extracted
+
+
+def test_extracts_once_and_shares_by_content(tmp_path, monkeypatch):
+    cache, extracted = _cache(tmp_path, monkeypatch)
+    movie = tmp_path / "movie.mkv"
+    movie.write_bytes(bytes([10]) + b"x" * 100)
+    assert cache.cached_path(str(movie)) is None
+
+    # 같은 파일을 동시에 요청해도 추출은 한 번
+    threads = [threading.Thread(target=cache.get, args=(str(movie),)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(extracted) == 1
+
+    # 이름만 다른 복사본은 같은 캐시 사용 (내용 지문)
+    copy = tmp_path / "renamed.mkv"
+    shutil.copy(movie, copy)
+    assert cache.get(str(copy)) == cache.get(str(movie))
+    assert len(extracted) == 1
+
+    assert cache.duration(str(movie)) == 10.0
+    window = cache.read(str(movie), 2.0, 2.5)
+    assert window.dtype == np.float32 and len(window) == SAMPLE_RATE // 2
+    assert window[0] == np.float32((2 * SAMPLE_RATE) % 30000 / 32768.0)
+    stats = cache.stats()
+    assert stats["files"] == 1 and stats["misses"] == 1
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_cache_module, "EVICTION_MIN_IDLE", 0)
+    # 파일 하나 약 1MB(32초), 예산 2MB
+    cache, extracted = _cache(tmp_path, monkeypatch, max_mb=2)
+    paths = []
+    for i in range(3):
+        media = tmp_path / f"m{i}.mkv"
+        media.write_bytes(bytes([32]) + bytes([i]) * 10)
+        paths.append(str(media))
+
+    first = cache.get(paths[0])
+    cache.get(paths[1])
+    os.utime(first, (time.time() - 100, time.time() - 100))
+    second = cache.cached_path(paths[1])
+    os.utime(second, (time.time() - 200, time.time() - 200))
+    cache.read(paths[0], 0, 1)  # 최근 사용 → m1이 가장 오래됨
+
+    cache.get(paths[2])
+    assert cache.cached_path(paths[1]) is None
+    assert cache.cached_path(paths[0]) is not None and cache.cached_path(paths[2]) is not None
+    assert cache.stats()["evictions"] == 1
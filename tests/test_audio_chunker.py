@@ -0,0 +1,127 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import numpy as np
+import pytest
+from backend.services import transcription_pool as transcription_pool_module
+from backend.services.audio_chunker import (
+    SAMPLE_RATE, AudioChunk, detect_speech_regions, plan_chunks, stitch_chunk_results,
+)
+from backend.services.audio_cache import read_pcm
+from backend.services.transcription_pool import TranscriptionPool
+from backend.services.whisper_engines import TranscriptionPaused
+
+
+def _tone(seconds, freqs, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * sum(np.sin(2 * np.pi * f * t) for f in freqs) / len(freqs)).astype(np.float32)
+
+
+def _silence(seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 1e-4).astype(np.float32)
+
+
+def _synthetic_movie():
+    """무음 2초 → 말 3초 → 무음 5초 → 저음 음악 4초 → 말 2초(0.3초 쉼 포함) → 무음 2초"""
+    speech = [300, 700, 1200, 2500]
+    return np.concatenate([
+        _silence(2), _tone(3, speech), _silence(5), _tone(4, [40, 80], amplitude=0.5),
+        _tone(1, speech), _silence(0.3), _tone(0.7, speech), _silence(2),
+    ])
+
+
+def test_detect_speech_regions_skips_silence_and_music():
+    regions = detect_speech_regions(_synthetic_movie())
+    assert len(regions) == 2
+    (s1, e1), (s2, e2) = regions
+    assert abs(s1 - 2.0) < 0.1 and abs(e1 - 5.0) < 0.1
+    # 짧은 쉼(0.3초)은 하나의 구간으로 이어 붙임
+    assert abs(s2 - 14.0) < 0.1 and abs(e2 - 16.0) < 0.1
+
+
+def test_plan_chunks_merges_nearby_regions_and_respects_max_length():
+    regions = [AudioChunk(2, 5), AudioChunk(6, 9), AudioChunk(30, 40), AudioChunk(41, 100)]
+    chunks = plan_chunks(regions, total_duration=120, max_chunk_seconds=20, max_merge_gap=3)
+    assert all(chunk.duration <= 20 for chunk in chunks)
+    # 가까운 두 구간은 합치고, 경계는 음성 구간 밖 (무음 절반까지만 여유)
+    assert chunks[0] == AudioChunk(1.8, 9.2)
+    assert chunks[1] == AudioChunk(29.8, 40.2)
+    assert 40.2 <= chunks[2].start < 41
+    # 합치면 최대 길이를 넘는 구간(41~100초)은 따로, 그래도 길면 고정 길이로 나눔
+    assert len(chunks) == 5 and 100 < chunks[-1].end <= 120
+
+
+def test_stitch_offsets_segments_and_picks_majority_language():
+    chunks = [AudioChunk(100, 160), AudioChunk(0, 50)]
+    results = [
+        {"language": "en", "segments": [{"id": 0, "start": 0.0, "end": 10.0, "text": " b"}, {"id": 1, "start": 50.0, "end": 70.0, "text": " c"}]},
+        {"language": "ko", "segments": [{"id": 0, "start": 1.0, "end": 5.0, "text": " a"}]},
+    ]
+    stitched = stitch_chunk_results(chunks, results)
+    assert [(s["id"], s["start"], s["end"], s["text"]) for s in stitched["segments"]] == [
+        (0, 1.0, 5.0, " a"), (1, 100.0, 110.0, " b"), (2, 150.0, 160.0, " c"),
+    ]
+    assert stitched["text"] == " a b c" and stitched["language"] == "en"
+
+
+def test_transcribe_long_form_decodes_speech_chunks_in_parallel(fake_whisper, tmp_path, monkeypatch):
+    # 120초짜리 오디오 중 음성 구간 세 곳 (각 30초 → 청크 하나당 윈도우 하나)
+    pcm_path = str(tmp_path / "movie.s16")
+    np.zeros(120 * SAMPLE_RATE, dtype=np.int16).tofile(pcm_path)
+    chunks = [AudioChunk(0, 30), AudioChunk(40, 70), AudioChunk(85, 115)]
+    monkeypatch.setattr(transcription_pool_module, "prepare_long_form", lambda path, max_seconds: (pcm_path, chunks, 120.0))
+    assert len(read_pcm(pcm_path, 40, 70)) == 30 * SAMPLE_RATE
+
+    pool = TranscriptionPool(workers=2, threads_per_worker=1)
+    events = []
+
+    async def main():
+        pool.start()
+        return await pool.transcribe_long_form("movie.mkv", "tiny", on_event=events.append)
+
+    try:
+        result = asyncio.run(main())
+    finally:
+        pool.stop()
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.0, 30.0), (40.0, 70.0), (85.0, 115.0)]
+    assert [s["id"] for s in result["segments"]] == [0, 1, 2]
+    assert all(s["text"] == f" array{30 * SAMPLE_RATE} 0" for s in result["segments"])
+    assert result["language"] == "en"
+    # 진행률은 음성 구간 합계(90초) 기준, segment 시간은 원본 기준
+    assert {e["duration"] for e in events} == {90.0} and max(e["processed"] for e in events) == 90.0
+    assert sorted(e["segments"][0]["start"] for e in events) == [0.0, 40.0, 85.0]
+
+
+def test_paused_long_form_keeps_finished_chunks_and_resumes_the_rest(fake_whisper, tmp_path, monkeypatch):
+    # 청크 세 개 × 90초(윈도우 3개), 워커 2개 → 세 번째 청크는 일시정지 때 아직 대기 중
+    pcm_path = str(tmp_path / "movie.s16")
+    np.zeros(300 * SAMPLE_RATE, dtype=np.int16).tofile(pcm_path)
+    chunks = [AudioChunk(0, 90), AudioChunk(100, 190), AudioChunk(200, 290)]
+    monkeypatch.setattr(transcription_pool_module, "prepare_long_form", lambda path, max_seconds: (pcm_path, chunks, 300.0))
+    pool = TranscriptionPool(workers=2, threads_per_worker=1)
+
+    async def main():
+        pool.start()
+        await pool.transcribe("warmup-a", "tiny")
+        started = asyncio.Event()
+        job = asyncio.ensure_future(pool.transcribe_long_form("movie.mkv", "tiny", {"language": "en"}, tag="job-1",
+                                                              on_event=lambda event: started.set()))
+        await started.wait()
+        pool.pause("job-1")
+        with pytest.raises(TranscriptionPaused) as paused:
+            await job
+        pool.clear_pause("job-1")
+        result = await pool.transcribe_long_form("movie.mkv", "tiny", {}, tag="job-1", resume_from=paused.value.checkpoint)
+        return paused.value.checkpoint, result
+
+    try:
+        checkpoint, result = asyncio.run(main())
+    finally:
+        pool.stop()
+    assert checkpoint["long_form"] and checkpoint["language"] == "en"
+    assert checkpoint["plan"] == [[0, 90], [100, 190], [200, 290]]
+    assert checkpoint["chunks"]["2"] == {"offset": 0.0, "segments": [], "language": None, "done": False}
+    assert 0 < checkpoint["chunks"]["0"]["offset"] < 90
+    assert [s["start"] for s in result["segments"]] == [0.0, 30.0, 60.0, 100.0, 130.0, 160.0, 200.0, 230.0, 260.0]
+    assert result["language"] == "en"
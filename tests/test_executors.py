@@ -0,0 +1,96 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import time
+from backend import executors
+from backend.executors import run_io, run_cpu, iterate_io
+from backend.services import media_index as media_index_module
+from backend.services.media_index import MediaIndex
+
+
+def _make_tree(root, dirs=40):
+    for i in range(dirs):
+        d = root / f"d{i}"
+        d.mkdir()
+        (d / f"m{i}.mkv").write_bytes(b"x")
+
+
+async def _measure_loop_lag(work):
+    """work를 실행하는 동안 10ms 주기 타이머의 최대 지연(초)을 측정한다."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - before - 0.01)
+
+    tick_task = asyncio.create_task(ticker())
+    try:
+        result = await work
+    finally:
+        done.set()
+        await tick_task
+    return result, max(lags, default=float("inf")), len(lags)
+
+
+def test_event_loop_stays_responsive_during_large_scan(tmp_path, monkeypatch):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_tree(library)
+    # 느린 NAS: 디렉토리마다 20ms씩 블로킹
+    original = media_index_module.scan_directory_level
+    def slow_level(directory):
+        time.sleep(0.02)
+        return original(directory)
+    monkeypatch.setattr(media_index_module, "scan_directory_level", slow_level)
+    monkeypatch.setattr(executors.settings, "scan_workers", 1)
+    index = MediaIndex(str(tmp_path / "index.db"))
+
+    start = time.perf_counter()
+    stats, max_lag, ticks = asyncio.run(_measure_loop_lag(run_io(index.refresh, str(library))))
+    elapsed = time.perf_counter() - start
+
+    assert stats["files"] == 40
+    assert elapsed > 0.5
+    # 스캔이 이벤트 루프 밖에서 돌면 타이머가 계속 실행되고 지연도 작다
+    assert ticks > 20
+    assert max_lag < 0.2
+
+
+def test_pools_are_separate_and_streaming_closes_generator(monkeypatch):
+    monkeypatch.setattr(executors.settings, "cpu_workers", 1)
+    executors.shutdown_executors()
+
+    async def main():
+        io_thread = await run_io(lambda: __import__("threading").current_thread().name)
+        cpu_thread = await run_cpu(lambda: __import__("threading").current_thread().name)
+        # cpu 풀이 바쁜 동안에도 io 작업은 바로 실행된다
+        busy = asyncio.ensure_future(run_cpu(time.sleep, 0.3))
+        before = time.perf_counter()
+        await run_io(lambda: None)
+        io_wait = time.perf_counter() - before
+        await busy
+
+        closed = []
+        def gen():
+            try:
+                for i in range(100):
+                    yield i
+            finally:
+                closed.append(True)
+        received = []
+        stream = iterate_io(gen())
+        async for item in stream:
+            received.append(item)
+            if item == 2:
+                break
+        await stream.aclose()
+        return io_thread, cpu_thread, io_wait, received, closed
+
+    io_thread, cpu_thread, io_wait, received, closed = asyncio.run(main())
+    executors.shutdown_executors()
+    assert io_thread.startswith("io-worker") and cpu_thread.startswith("cpu-worker")
+    assert io_wait < 0.2
+    assert received == [0, 1, 2] and closed == [True]
@@ -0,0 +1,107 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services import file_scanner
+from backend.services.file_scanner import scan_media_files, scan_directory_level, match_subtitle_stem, FolderCountCache, MediaCounts
+
+
+def test_match_subtitle_stem_language_suffixes():
+    stems = {"Movie.2014", "Show_S01E01"}
+    assert match_subtitle_stem("Movie.2014", stems) == "Movie.2014"
+    assert match_subtitle_stem("Movie.2014.en", stems) == "Movie.2014"
+    assert match_subtitle_stem("Movie.2014_pt-BR", stems) == "Movie.2014"
+    assert match_subtitle_stem("Show_S01E01-zh_TW", stems) == "Show_S01E01"
+    assert match_subtitle_stem("Movie.2014.commentary", stems) is None
+    assert match_subtitle_stem("Other.en", stems) is None
+
+
+def test_scan_groups_subtitles_by_stem(tmp_path):
+    season = tmp_path / "Show" / "Season 1"
+    season.mkdir(parents=True)
+    for name in ["e01.mkv", "e01.en.srt", "e01_pt-BR.ass", "e02.mkv", "e03.MP4", "e03.ko.vtt", "notes.txt"]:
+        (season / name).write_bytes(b"x")
+    (tmp_path / "track.flac").write_bytes(b"x")
+    # 다른 폴더의 같은 이름 미디어도 각각 반환되어야 한다
+    (tmp_path / "e01.mkv").write_bytes(b"x")
+
+    files = {os.path.relpath(f["path"], tmp_path): f for f in scan_media_files(str(tmp_path))}
+    assert sorted(files) == sorted([
+        "e01.mkv", "track.flac",
+        os.path.join("Show", "Season 1", "e01.mkv"),
+        os.path.join("Show", "Season 1", "e02.mkv"),
+        os.path.join("Show", "Season 1", "e03.MP4"),
+    ])
+    assert files[os.path.join("Show", "Season 1", "e01.mkv")]["subtitle_files"] == ["e01.en.srt", "e01_pt-BR.ass"]
+    assert not files[os.path.join("Show", "Season 1", "e02.mkv")]["has_subtitle"]
+    assert files[os.path.join("Show", "Season 1", "e03.MP4")]["subtitle_files"] == ["e03.ko.vtt"]
+    assert not files["e01.mkv"]["has_subtitle"]
+    assert files["track.flac"]["type"] == "audio"
+
+    assert [f["name"] for f in scan_media_files(str(tmp_path), filter_video=False)] == ["track.flac"]
+    entries, subdirs = scan_directory_level(str(tmp_path))
+    assert subdirs == [str(tmp_path / "Show")]
+
+
+def test_folder_count_cache_aggregates_and_invalidates(tmp_path, monkeypatch):
+    (tmp_path / "A" / "A1").mkdir(parents=True)
+    (tmp_path / "B").mkdir()
+    (tmp_path / "A" / "x.mkv").write_bytes(b"x")
+    (tmp_path / "A" / "x.srt").write_bytes(b"x")
+    (tmp_path / "A" / "A1" / "y.mp4").write_bytes(b"x")
+    (tmp_path / "A" / "A1" / "z.mp3").write_bytes(b"x")
+    (tmp_path / "B" / "w.wav").write_bytes(b"x")
+
+    listed = []
+    original = file_scanner.scan_directory_level
+    monkeypatch.setattr(file_scanner, "scan_directory_level", lambda d: listed.append(d) or original(d))
+
+    cache = FolderCountCache()
+    children = dict(cache.get_children(str(tmp_path)))
+    assert children[str(tmp_path / "A")] == MediaCounts(video=2, audio=1, with_subtitle=1, without_subtitle=2)
+    assert children[str(tmp_path / "B")] == MediaCounts(video=0, audio=1, with_subtitle=0, without_subtitle=1)
+    assert len(listed) == 4  # 디렉토리마다 한 번
+
+    # 하위 폴더 조회는 캐시만 사용
+    listed.clear()
+    assert dict(cache.get_children(str(tmp_path / "A")))[str(tmp_path / "A" / "A1")].video == 1
+    assert listed == []
+
+    # 변경된 폴더만 다시 읽고 조상 합계는 다시 더한다
+    (tmp_path / "A" / "A1" / "y.srt").write_bytes(b"x")
+    cache.invalidate(str(tmp_path / "A" / "A1" / "y.srt"))
+    assert cache.get(str(tmp_path)).with_subtitle == 2
+    assert listed == [str(tmp_path / "A" / "A1")]
+
+
+def test_parallel_walk_matches_sequential(tmp_path, monkeypatch):
+    for i in range(6):
+        for j in range(3):
+            leaf = tmp_path / f"d{i}" / f"s{j}"
+            leaf.mkdir(parents=True)
+            (leaf / f"m{i}{j}.mkv").write_bytes(b"x")
+            (leaf / f"m{i}{j}.en.srt").write_bytes(b"x")
+            (leaf / f"a{i}{j}.mp3").write_bytes(b"x")
+
+    monkeypatch.setattr(file_scanner.settings, "scan_workers", 1)
+    sequential = scan_media_files(str(tmp_path))
+    sequential_counts = FolderCountCache().get_children(str(tmp_path))
+    monkeypatch.setattr(file_scanner.settings, "scan_workers", 4)
+    assert scan_media_files(str(tmp_path)) == sequential
+    assert FolderCountCache().get_children(str(tmp_path)) == sequential_counts
+    assert len(sequential) == 36
+
+    # 동시에 읽는 디렉토리 수는 max_workers를 넘지 않는다
+    active, peak = [0], [0]
+    lock = file_scanner.threading.Lock()
+
+    def slow_visit(directory):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        file_scanner.time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return scan_directory_level(directory)
+
+    visited = list(file_scanner.walk_parallel(str(tmp_path), slow_visit, max_workers=3))
+    assert len(visited) == 1 + 6 + 18
+    assert 1 < peak[0] <= 3
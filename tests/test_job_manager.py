@@ -0,0 +1,292 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import sqlite3
+import time
+from backend.config import settings
+from backend.job_manager import (
+    JobManager, select_next_job, STATUS_QUEUED, STATUS_RUNNING, STATUS_PAUSED, STATUS_COMPLETED, STATUS_ERROR, STATUS_CANCELLED,
+    STATUS_STOPPED,
+)
+
+
+class FakeConnectionManager:
+    def __init__(self):
+        self.messages = []
+
+    async def send_personal_message(self, message, client_id):
+        self.messages.append((client_id, message))
+
+
+def test_expired_lease_is_adopted_by_another_process(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    first = JobManager(db_path, lease_seconds=0.2)
+    second = JobManager(db_path, lease_seconds=0.2)
+    job_ids = [first.add_job(f"{name}.mkv", "auto", "base", client_id="c1", owner="A") for name in ("a", "b")]
+
+    # 다른 프로세스가 임대한 작업은 가져가지 않음
+    assert second.claim_next("B") is None
+    claimed = first.claim_next("A")
+    assert claimed["id"] == job_ids[0] and claimed["status"] == STATUS_RUNNING and claimed["attempts"] == 1
+
+    # 임대 연장 중에는 이어받지 않음
+    assert first.heartbeat("A") == 2
+    assert second.adopt_expired("B") == []
+
+    # A가 죽어서 임대가 만료되면 B가 가져가고, 실행 중이던 작업은 대기로 돌아감
+    time.sleep(0.3)
+    adopted = second.adopt_expired("B")
+    assert [job["id"] for job in adopted] == job_ids
+    assert all(job["status"] == STATUS_QUEUED and job["lease_owner"] == "B" for job in adopted)
+    # 임대를 잃은 A의 완료 기록은 무시됨
+    assert not first.finish(job_ids[0], "A", STATUS_COMPLETED, {"status": "completed"})
+
+    retried = second.claim_next("B")
+    assert retried["id"] == job_ids[0] and retried["attempts"] == 2
+    assert second.finish(job_ids[0], "B", STATUS_COMPLETED, {"status": "completed"})
+    job = first.get_job(job_ids[0])
+    assert job["status"] == STATUS_COMPLETED and job["progress"] == 100 and job["result"] == {"status": "completed"}
+
+
+def test_job_that_keeps_crashing_stops_after_max_attempts(tmp_path):
+    store = JobManager(str(tmp_path / "jobs.db"), lease_seconds=0.05, max_attempts=2)
+    job_id = store.add_job("crash.mkv", "auto", "base", client_id="c1", owner="A")
+    for owner in ("A", "B"):
+        assert store.claim_next(owner)["id"] == job_id
+        time.sleep(0.1)
+        store.adopt_expired("B" if owner == "A" else "C")
+    job = store.get_job(job_id)
+    assert job["status"] == STATUS_ERROR and job["attempts"] == 2 and "재시도" in job["result"]["message"]
+    assert store.claim_next("C") is None
+
+
+def test_dispatcher_resumes_released_jobs_after_restart(tmp_path, fake_whisper, monkeypatch):
+    from backend.services import job_dispatcher as job_dispatcher_module
+    from backend.services.job_dispatcher import JobDispatcher
+
+    store = JobManager(str(tmp_path / "jobs.db"), lease_seconds=0.3)
+    started = []
+
+    async def fake_run_whisper_on_file(manager, client_id, file_path, model_size, language, engine, long_form, job_id=None, checkpoint=None):
+        started.append(file_path)
+        await asyncio.sleep(0.2)
+        return {"status": "completed", "file_path": file_path}
+
+    monkeypatch.setattr(job_dispatcher_module, "run_whisper_on_file", fake_run_whisper_on_file)
+
+    async def main():
+        connections = FakeConnectionManager()
+        first = JobDispatcher(store, max_running=2, owner="first")
+        await first.start(connections)
+        batch = await first.submit("c1", ["/m/a.mkv", "/m/b.mkv", "/m/c.mkv"], "base")
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        # 서버 재시작: 실행 중이던 두 작업은 대기로 돌아가고 임대 반납
+        await first.stop()
+        assert [job["status"] for job in store.get_jobs()] == [STATUS_QUEUED] * 3
+
+        second = JobDispatcher(store, max_running=2, owner="second")
+        await second.start(connections)
+        while store.has_active_jobs("c1"):
+            await asyncio.sleep(0.02)
+        await second.stop()
+        return batch, connections.messages
+
+    batch, messages = asyncio.run(main())
+    jobs = store.get_jobs()
+    assert [job["status"] for job in jobs] == [STATUS_COMPLETED] * 3
+    # 종료 때 끊긴 시도는 횟수에 넣지 않음
+    assert [job["attempts"] for job in jobs] == [1, 1, 1]
+    assert started.count("/m/a.mkv") == 2 and started.count("/m/c.mkv") == 1
+    done = [message for _, message in messages if message["type"] == "batch_complete"]
+    assert len(done) == 1 and done[0]["batch_id"] == batch["batch_id"] and done[0]["completed_count"] == 3
+
+
+def _job(job_id, client_id, duration, created_at=0.0, priority=0):
+    return {"id": job_id, "client_id": client_id, "priority": priority, "duration": duration, "created_at": created_at}
+
+
+def test_scheduler_orders_by_priority_fairness_and_length():
+    film, clip, song = _job("film", "a", 3 * 3600), _job("clip", "a", 30), _job("song", "b", 200)
+    # 같은 클라이언트 안에서는 짧은 파일 먼저, 길이를 모르는 파일은 마지막
+    assert select_next_job([film, clip, _job("unknown", "a", None)], {}, now=0)["id"] == "clip"
+    # 클라이언트 간에는 실행 중인 작업이 적은 쪽, 같으면 오래전에 시작한 쪽
+    clients = {"a": {"running": 1, "last_started": 5.0}, "b": {"running": 1, "last_started": 1.0}}
+    assert select_next_job([film, clip, song], clients, now=10)["id"] == "song"
+    assert select_next_job([film, clip, song], {"a": {"running": 0}, "b": {"running": 1}}, now=10)["id"] == "clip"
+    # 우선순위가 높으면 길이·순서와 무관하게 먼저
+    assert select_next_job([clip, song, _job("urgent", "b", 9000, priority=5)], {}, now=0)["id"] == "urgent"
+    # 오래 기다린 긴 파일은 결국 짧은 파일보다 먼저 (aging, 기본값 기준: 자기 길이만큼 기다려야 앞지름)
+    aging = settings.job_sjf_aging
+    old_film = _job("film", "a", 3 * 3600, created_at=0.0)
+    assert select_next_job([old_film, _job("clip", "a", 30, created_at=300.0)], {}, now=300, sjf_aging=aging)["id"] == "clip"
+    assert select_next_job([old_film, _job("clip", "a", 30, created_at=3600.0)], {}, now=3600, sjf_aging=aging)["id"] == "clip"
+    assert select_next_job([old_film, _job("clip", "a", 30, created_at=11000.0)], {}, now=11000, sjf_aging=aging)["id"] == "film"
+
+
+def test_per_client_limit_applies_only_while_others_wait():
+    jobs = [_job("a1", "a", 10), _job("b1", "b", 500)]
+    clients = {"a": {"running": 2}, "b": {"running": 2}}
+    assert select_next_job(jobs, {"a": {"running": 2}}, now=0, max_running_per_client=2)["id"] == "b1"
+    # 모두 상한에 걸렸으면 워커를 놀리지 않고 그대로 정책 적용
+    assert select_next_job(jobs, clients, now=0, max_running_per_client=2)["id"] == "a1"
+
+
+def test_claim_next_interleaves_clients_and_counts_running_jobs(tmp_path):
+    store = JobManager(str(tmp_path / "jobs.db"), max_running_per_client=1)
+    # 클라이언트 a가 긴 영화 두 개를 먼저 등록하고, b가 짧은 클립들을 나중에 등록
+    for name, duration in (("film1", 9000), ("film2", 8000)):
+        store.add_job(f"{name}.mkv", "auto", "base", client_id="a", owner="A", duration=duration)
+    for name, duration in (("clip1", 60), ("clip2", 30)):
+        store.add_job(f"{name}.mp3", "auto", "base", client_id="b", owner="A", duration=duration)
+    order = [store.claim_next("A")["filename"] for _ in range(4)]
+    assert order == ["film2.mkv", "clip2.mp3", "film1.mkv", "clip1.mp3"]
+    assert store.claim_next("A") is None
+
+
+def test_schema_v1_store_is_migrated_in_place(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE jobs (id TEXT PRIMARY KEY, batch_id TEXT, client_id TEXT, filename TEXT NOT NULL, file_path TEXT,
+            language TEXT, model TEXT, engine TEXT, options TEXT NOT NULL DEFAULT '{}', status TEXT NOT NULL,
+            progress INTEGER NOT NULL DEFAULT 0, log TEXT NOT NULL DEFAULT '', attempts INTEGER NOT NULL DEFAULT 0,
+            lease_owner TEXT, lease_expires REAL NOT NULL DEFAULT 0, heartbeat_at REAL, created_at REAL NOT NULL,
+            started_at REAL, completed_at REAL, result TEXT);
+        INSERT INTO jobs (id, filename, status, lease_owner, created_at) VALUES ('old', 'old.mkv', '대기', 'A', 0);
+        PRAGMA user_version = 1;
+    """)
+    conn.close()
+    store = JobManager(str(db_path))
+    job = store.claim_next("A")
+    assert job["id"] == "old" and job["priority"] == 0 and job["duration"] is None
+
+
+def test_paused_job_keeps_checkpoint_until_finished(tmp_path):
+    store = JobManager(str(tmp_path / "jobs.db"))
+    job_id = store.add_job("movie.mkv", "auto", "base", client_id="c1", owner="A")
+    store.claim_next("A")
+    assert store.pause_job(job_id) == STATUS_RUNNING
+    checkpoint = {"offset": 60.0, "segments": [{"start": 0.0, "end": 30.0, "text": " hi"}], "language": "en"}
+    assert store.suspend(job_id, "A", checkpoint)
+    job = store.get_job(job_id)
+    # 일시정지는 실패 시도로 세지 않고, 재개 전에는 다시 실행하지 않음
+    assert job["status"] == STATUS_PAUSED and job["attempts"] == 0 and job["checkpoint"] == checkpoint
+    assert store.claim_next("A") is None
+    assert store.resume_job(job_id)
+    resumed = store.claim_next("A")
+    assert resumed["id"] == job_id and resumed["checkpoint"] == checkpoint
+    assert store.finish(job_id, "A", STATUS_COMPLETED, {"status": "completed"})
+    assert store.get_job(job_id)["checkpoint"] is None
+    assert store.pause_job(job_id) is None
+
+
+def test_cancel_stops_only_that_job_and_other_processes_notice(tmp_path, monkeypatch):
+    from backend.services import job_dispatcher as job_dispatcher_module
+    from backend.services.job_dispatcher import JobDispatcher
+
+    store = JobManager(str(tmp_path / "jobs.db"), lease_seconds=0.3)
+    started, cancelled = [], []
+
+    async def fake_run_whisper_on_file(manager, client_id, file_path, model_size, language, engine, long_form, job_id=None, checkpoint=None):
+        started.append(file_path)
+        try:
+            await asyncio.sleep(0.3)
+        except asyncio.CancelledError:
+            cancelled.append(file_path)
+            return {"status": "cancelled", "file_path": file_path}
+        return {"status": "completed", "file_path": file_path}
+
+    monkeypatch.setattr(job_dispatcher_module, "run_whisper_on_file", fake_run_whisper_on_file)
+
+    async def main():
+        connections = FakeConnectionManager()
+        dispatcher = JobDispatcher(store, max_running=2, owner="A")
+        await dispatcher.start(connections)
+        batch = await dispatcher.submit("c1", ["/m/a.mkv", "/m/b.mkv", "/m/c.mkv"], "base")
+        a, b, c = batch["job_ids"]
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        # 실행 중인 a는 중단, 대기 중인 c는 취소. 같은 배치의 b는 계속 진행
+        assert await dispatcher.cancel(a, STATUS_STOPPED)
+        assert await dispatcher.cancel(c)
+        assert not await dispatcher.cancel(c)
+        while store.has_active_jobs("c1"):
+            await asyncio.sleep(0.02)
+
+        # 다른 프로세스가 저장소에서 취소한 작업도 다음 임대 연장 때 멈춤
+        d = (await dispatcher.submit("c2", ["/m/d.mkv"], "base"))["job_ids"][0]
+        while "/m/d.mkv" not in started:
+            await asyncio.sleep(0.01)
+        assert JobManager(str(tmp_path / "jobs.db")).cancel_job(d) == STATUS_RUNNING
+        while sum(message["type"] == "batch_cancelled" for _, message in connections.messages) < 2:
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+        return (a, b, c, d), connections.messages
+
+    (a, b, c, d), messages = asyncio.run(main())
+    assert [store.get_job(job_id)["status"] for job_id in (a, b, c, d)] == [STATUS_STOPPED, STATUS_COMPLETED, STATUS_CANCELLED, STATUS_CANCELLED]
+    assert started == ["/m/a.mkv", "/m/b.mkv", "/m/d.mkv"] and cancelled == ["/m/a.mkv", "/m/d.mkv"]
+    done = [message for _, message in messages if message["type"] == "batch_cancelled"]
+    assert len(done) == 2 and done[0]["completed_count"] == 1 and done[0]["cancelled_count"] == 2
+
+
+def test_pause_and_resume_from_another_process_reach_the_owner(tmp_path, monkeypatch):
+    from backend.services import job_dispatcher as job_dispatcher_module
+    from backend.services.job_dispatcher import JobDispatcher
+
+    class FakePool:
+        def __init__(self):
+            self.paused = set()
+
+        def pause(self, tag):
+            self.paused.add(tag)
+
+        def clear_pause(self, tag):
+            self.paused.discard(tag)
+
+    pool = FakePool()
+    store = JobManager(str(tmp_path / "jobs.db"), lease_seconds=0.3)
+    checkpoints = []
+
+    async def fake_run_whisper_on_file(manager, client_id, file_path, model_size, language, engine, long_form, job_id=None, checkpoint=None):
+        # 윈도우 10개를 디코딩하는 척하며 윈도우 경계마다 일시정지 요청을 확인
+        checkpoints.append(checkpoint)
+        for window in range(checkpoint["offset"] if checkpoint else 0, 10):
+            if job_id in pool.paused:
+                return {"status": "paused", "checkpoint": {"offset": window}, "file_path": file_path}
+            await asyncio.sleep(0.03)
+        return {"status": "completed", "file_path": file_path}
+
+    monkeypatch.setattr(job_dispatcher_module, "transcription_pool", pool)
+    monkeypatch.setattr(job_dispatcher_module, "run_whisper_on_file", fake_run_whisper_on_file)
+
+    async def main():
+        owner = JobDispatcher(store, max_running=1, owner="A")
+        other = JobDispatcher(JobManager(str(tmp_path / "jobs.db"), lease_seconds=0.3), max_running=1, owner="B")
+        await owner.start(FakeConnectionManager())
+        job_id = (await owner.submit("c1", ["/m/a.mkv"], "base"))["job_ids"][0]
+        while not checkpoints:
+            await asyncio.sleep(0.01)
+
+        # 다른 프로세스의 일시정지: 담당 프로세스가 다음 임대 연장 때 워커를 멈추고 체크포인트를 저장
+        assert await other.pause(job_id)
+        # 워커가 멈추기 전의 재개는 거절 (대기로 돌리면 실행 중인 변환을 처음부터 다시 하게 됨)
+        assert not await other.resume(job_id)
+        while store.get_job(job_id)["checkpoint"] is None:
+            await asyncio.sleep(0.01)
+        paused = store.get_job(job_id)
+        assert paused["status"] == STATUS_PAUSED and 0 < paused["checkpoint"]["offset"] < 10
+        # 완료 기록이 일시정지를 덮어쓰지 않음
+        assert not store.finish(job_id, "A", STATUS_COMPLETED, {"status": "completed"})
+
+        # 워커가 멈춘 뒤의 재개는 담당 프로세스가 체크포인트에서 이어서 실행
+        assert await other.resume(job_id)
+        while store.has_active_jobs("c1"):
+            await asyncio.sleep(0.02)
+        await owner.stop()
+        return job_id, paused["checkpoint"]
+
+    job_id, checkpoint = asyncio.run(main())
+    assert checkpoints == [None, checkpoint]
+    assert store.get_job(job_id)["status"] == STATUS_COMPLETED
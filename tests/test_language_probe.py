@@ -0,0 +1,85 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import numpy as np
+from backend.services import language_probe
+from backend.services.audio_chunker import SAMPLE_RATE
+from backend.services.language_probe import sample_windows, detect_language_in_samples
+from backend.services.media_index import MediaIndex
+from backend.services.transcription_pool import TranscriptionPool
+
+
+def _speech(seconds, amplitude):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * (np.sin(2 * np.pi * 500 * t) + np.sin(2 * np.pi * 1500 * t)) / 2).astype(np.float32)
+
+
+def _fake_movie(monkeypatch, clips):
+    """probe_duration/extract_audio를 가짜로: clips[i]는 i번째 샘플 구간에서 돌려줄 오디오"""
+    calls = []
+
+    def extract_audio(media_path, start=None, duration=None):
+        calls.append((start, duration))
+        return clips[len(calls) - 1]
+
+    monkeypatch.setattr(language_probe, "probe_duration", lambda media_path: 400.0)
+    monkeypatch.setattr(language_probe, "extract_audio", extract_audio)
+    return calls
+
+
+def test_sample_windows_spread_over_file_without_overlap():
+    assert sample_windows(400, 3, 30) == [(85.0, 115.0), (185.0, 215.0), (285.0, 315.0)]
+    assert sample_windows(20, 3, 30) == [(0.0, 20)]
+    assert sample_windows(60, 3, 30) == [(0.0, 30.0), (30.0, 60.0)]
+
+
+def test_detect_language_weights_samples_by_speech_and_ignores_silence(fake_whisper, monkeypatch):
+    silence = np.zeros(30 * SAMPLE_RATE, dtype=np.float32)
+    # 영어 샘플: 25초 음성 / 한국어 샘플: 5초 음성 / 무음 샘플은 판정에서 제외
+    english = np.concatenate([_speech(25, 0.1), silence[:5 * SAMPLE_RATE]])
+    korean = np.concatenate([_speech(5, 0.5), silence[:25 * SAMPLE_RATE]])
+    calls = _fake_movie(monkeypatch, [english, silence, korean])
+
+    result = detect_language_in_samples("movie.mkv", "tiny", "openai", samples=3, sample_seconds=30)
+    assert calls == [(85.0, 30.0), (185.0, 30.0), (285.0, 30.0)]
+    assert [sample["language"] for sample in result["samples"]] == ["en", "ko"]
+    assert result["language"] == "en"
+    assert abs(result["probability"] - (0.9 * 25 + 0.1 * 5) / 30) < 0.01
+    assert list(result["languages"]) == ["en", "ko", "ja"]
+
+
+def test_detect_language_without_speech_is_undecided(fake_whisper, monkeypatch):
+    silence = np.zeros(30 * SAMPLE_RATE, dtype=np.float32)
+    _fake_movie(monkeypatch, [silence] * 3)
+    result = detect_language_in_samples("movie.mkv", "tiny", "openai")
+    assert result["language"] is None and result["probability"] == 0.0 and result["samples"] == []
+
+
+def test_pool_detect_language_in_process(fake_whisper, monkeypatch):
+    _fake_movie(monkeypatch, [_speech(30, 0.5)] * 3)
+    pool = TranscriptionPool(workers=0, threads_per_worker=1)
+    result = asyncio.run(pool.detect_language("movie.mkv", "tiny", "openai", samples=2))
+    assert result["language"] == "ko" and len(result["samples"]) == 2
+
+
+def test_language_cache_is_invalidated_when_file_changes(tmp_path):
+    media = tmp_path / "movie.mkv"
+    media.write_bytes(b"x" * 10)
+    index = MediaIndex(str(tmp_path / "index.db"))
+    assert index.cached_language(str(media), "base") is None
+
+    index.store_language(str(media), "base", {"language": "ko", "probability": 0.9})
+    assert index.cached_language(str(media), "base") == {"language": "ko", "probability": 0.9}
+    # 디렉토리를 다시 스캔해도 유지
+    index.refresh(str(tmp_path))
+    assert index.cached_language(str(media), "base")["language"] == "ko"
+    # 다른 모델로 요청하면 저장된 결과를 쓰지 않고, 모델별 결과는 따로 유지
+    assert index.cached_language(str(media), "large") is None
+    index.store_language(str(media), "large", {"language": "ja", "probability": 0.7})
+    assert index.cached_language(str(media), "large")["language"] == "ja"
+    assert index.cached_language(str(media), "base")["language"] == "ko"
+
+    media.write_bytes(b"y" * 20)
+    assert index.cached_language(str(media), "base") is None
+    assert index.cached_language(str(tmp_path / "missing.mkv"), "base") is None
+    index.close()
@@ -0,0 +1,70 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import pytest
+from fastapi.testclient import TestClient
+from backend import main
+from backend.services.media_index import MediaIndex
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """NAS_BASE_PATH를 임시 폴더로 바꾸고 미디어 인덱스도 임시 DB로 (lifespan은 실행하지 않음)"""
+    root = (tmp_path / "nas").resolve()
+    (root / "Show" / "Season 1").mkdir(parents=True)
+    for name in ("e01.mkv", "e01.srt", "e02.mkv"):
+        (root / "Show" / "Season 1" / name).write_bytes(b"x")
+    (root / "Show" / "intro.mp4").write_bytes(b"x")
+    (root / "song.mp3").write_bytes(b"x")
+    monkeypatch.setattr(main, "NAS_BASE_PATH", root)
+    monkeypatch.setattr(main, "media_index", MediaIndex(str(tmp_path / "index.db")))
+    return root
+
+
+def _stream(client, **params):
+    with client.stream("GET", "/api/scan_directory/stream", params=params) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_scan_stream_sends_parent_folders_first_and_ends_with_summary(library):
+    client = TestClient(main.app)
+    records = _stream(client)
+    files, summary = records[:-1], records[-1]
+    assert all(record["type"] == "file" for record in files)
+    paths = [os.path.relpath(record["file"]["path"], library) for record in files]
+    assert sorted(paths) == sorted(["song.mp3", os.path.join("Show", "intro.mp4"),
+                                    os.path.join("Show", "Season 1", "e01.mkv"), os.path.join("Show", "Season 1", "e02.mkv")])
+    # 디렉토리는 부모를 읽은 뒤에 하위를 읽으므로 상위 폴더의 파일이 먼저 도착
+    depths = [path.count(os.sep) for path in paths]
+    assert depths == sorted(depths)
+    assert summary["type"] == "summary"
+    assert {key: summary[key] for key in ("current_path", "total", "video_count", "audio_count", "with_subtitle_count", "directory_count")} == {
+        "current_path": "", "total": 4, "video_count": 3, "audio_count": 1, "with_subtitle_count": 1, "directory_count": 3,
+    }
+
+    # 하위 경로 + 타입 필터, 두 번째 요청은 인덱스의 증분 스캔 결과로 같은 목록
+    records = _stream(client, path="Show", filter_audio=False)
+    assert [record["type"] for record in records] == ["file"] * 3 + ["summary"]
+    assert records[-1]["current_path"] == "Show" and records[-1]["total"] == 3
+
+
+def test_scan_stream_rejects_paths_outside_the_library(library):
+    response = TestClient(main.app).get("/api/scan_directory/stream", params={"path": "../.."})
+    assert response.status_code == 400
+
+
+def test_files_type_filter_and_cursor_bound_to_its_query(library):
+    client = TestClient(main.app)
+    response = client.get("/api/files", params={"type": "video", "sort": "name", "limit": 2})
+    page = response.json()
+    assert response.status_code == 200 and page["total"] == 3
+    assert [f["name"] for f in page["files"]] == ["e01.mkv", "e02.mkv"]
+    assert client.get("/api/files", params={"type": "subtitle"}).status_code == 400
+
+    # 같은 조건으로는 다음 페이지, 정렬이나 필터를 바꾸면 400
+    params = {"type": "video", "sort": "name", "limit": 2, "cursor": page["next_cursor"]}
+    assert [f["name"] for f in client.get("/api/files", params=params).json()["files"]] == ["intro.mp4"]
+    assert client.get("/api/files", params=dict(params, sort="size")).status_code == 400
+    assert client.get("/api/files", params=dict(params, type="audio")).status_code == 400
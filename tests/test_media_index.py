@@ -0,0 +1,180 @@
+import sys, os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.media_index import MediaIndex
+from backend.services.file_scanner import scan_media_files
+
+
+def _make_library(root):
+    (root / "Movies").mkdir()
+    (root / "Music").mkdir()
+    (root / "Movies" / "a.mkv").write_bytes(b"x" * 10)
+    (root / "Movies" / "a.srt").write_text("1\n")
+    (root / "Movies" / "b.mp4").write_bytes(b"x" * 20)
+    (root / "Music" / "song.mp3").write_bytes(b"x" * 5)
+    (root / "Music" / "cover.jpg").write_bytes(b"x")
+
+
+def test_index_matches_scanner(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    index = MediaIndex(str(tmp_path / "index.db"))
+    assert index.last_scanned(str(library)) is None
+
+    files = index.get_media_files(str(library))
+    assert files == scan_media_files(str(library))
+    assert index.last_scanned(str(library / "Movies")) is not None
+
+    videos = index.query(str(library), filter_video=True, filter_audio=False)
+    assert [f["name"] for f in videos] == ["a.mkv", "b.mp4"]
+    assert videos[0]["has_subtitle"] and videos[0]["subtitle_files"] == ["a.srt"]
+    assert [f["name"] for f in index.query(str(library / "Music"))] == ["song.mp3"]
+
+
+def test_index_persists_and_refreshes(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    db_path = str(tmp_path / "index.db")
+    index = MediaIndex(db_path)
+    index.refresh(str(library))
+    index.close()
+
+    # 새 인스턴스에서도 파일시스템 접근 없이 결과가 남아 있어야 한다
+    reopened = MediaIndex(db_path)
+    (library / "Movies" / "b.mp4").unlink()
+    assert len(reopened.query(str(library))) == 3
+    assert len(reopened.get_media_files(str(library), refresh=True)) == 2
+
+
+def test_incremental_refresh_only_lists_changed_dirs(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    (library / "Movies" / "Extras").mkdir()
+    index = MediaIndex(str(tmp_path / "index.db"))
+    assert index.refresh(str(library))["dirs_listed"] == 4
+
+    result = index.refresh(str(library), incremental=True)
+    assert result == {"files": 3, "dirs_listed": 0, "dirs_reused": 4, "dirs_removed": 0}
+
+    # 하위 디렉토리에 자막이 추가되면 그 디렉토리만 다시 읽는다
+    (library / "Movies" / "b.srt").write_text("1\n")
+    (library / "Music").rename(library / "Audio")
+    result = index.refresh(str(library), incremental=True)
+    assert result["dirs_listed"] == 3  # library(이름 변경), Movies, Audio
+    assert result["dirs_removed"] == 1
+    files = {f["name"]: f for f in index.query(str(library))}
+    assert files["b.mp4"]["has_subtitle"]
+    assert files["song.mp3"]["path"] == str((library / "Audio" / "song.mp3").resolve())
+
+
+def test_update_paths_flips_has_subtitle_without_rescan(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    index = MediaIndex(str(tmp_path / "index.db"))
+    index.refresh(str(library))
+
+    srt_path = library / "Movies" / "b_en.srt"
+    srt_path.write_text("1\n")
+    assert index.update_paths([str(srt_path)]) == 1
+    files = {f["name"]: f for f in index.query(str(library))}
+    assert files["b.mp4"]["subtitle_files"] == ["b_en.srt"]
+
+    # 인덱스 밖 경로는 무시, 사라진 디렉토리는 하위 항목까지 제거
+    assert index.update_paths([str(tmp_path / "elsewhere" / "x.srt")]) == 0
+    for item in (library / "Music").iterdir():
+        item.unlink()
+    (library / "Music").rmdir()
+    index.update_paths([str(library / "Music")])
+    assert [f["name"] for f in index.query(str(library))] == ["a.mkv", "b.mp4"]
+
+
+def test_query_page_filters_sorts_and_paginates(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    (library / "Movies" / "c_50%.mkv").write_bytes(b"x" * 20)
+    (library / "Movies" / "c_50%.ko.srt").write_text("1\n")
+    (library / "Movies" / "b_pt-BR.srt").write_text("1\n")
+    index = MediaIndex(str(tmp_path / "index.db"))
+    index.refresh(str(library))
+
+    # size 정렬 + 동률(b.mp4, c_50%.mkv)은 path로, 커서로 끝까지 순회
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = index.query_page(str(library), limit=2, cursor=cursor, sort="size", order="desc")
+        assert (page["total"] == 4) if cursor is None else page["total"] is None
+        seen += [f["name"] for f in page["files"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["c_50%.mkv", "b.mp4", "a.mkv", "song.mp3"]
+    assert pages == 2
+
+    names = lambda **kw: [f["name"] for f in index.query_page(str(library), sort="name", **kw)["files"]]
+    assert names(types=["video"], has_subtitle=False) == []
+    assert names(types=["audio"]) == ["song.mp3"]
+    assert names(subtitle_lang="pt") == ["b.mp4"]
+    assert names(subtitle_lang="PT_br") == ["b.mp4"]
+    assert names(subtitle_lang="ko") == ["c_50%.mkv"]
+    assert names(name_contains="50%") == ["c_50%.mkv"]
+    assert names(name_contains="_") == ["c_50%.mkv"]
+    assert names(min_size=10, max_size=10) == ["a.mkv"]
+
+    with pytest.raises(ValueError):
+        index.query_page(str(library), sort="bogus")
+    with pytest.raises(ValueError):
+        index.query_page(str(library), cursor="not-a-cursor")
+    # 커서는 발급한 정렬/필터에서만 유효 (바꾸면 행이 중복되거나 빠지므로 거부)
+    cursor = index.query_page(str(library), limit=1, sort="size", order="desc")["next_cursor"]
+    assert index.query_page(str(library), limit=1, cursor=cursor, sort="size", order="desc")["files"][0]["name"] == "b.mp4"
+    for changed in (dict(sort="name", order="desc"), dict(sort="size", order="asc"), dict(sort="size", order="desc", types=["video"])):
+        with pytest.raises(ValueError):
+            index.query_page(str(library), limit=1, cursor=cursor, **changed)
+
+
+def test_iter_refresh_yields_each_directory_and_records_it(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    (library / "Movies" / "Extras").mkdir()
+    (library / "Movies" / "Extras" / "trailer.mkv").write_bytes(b"x")
+    index = MediaIndex(str(tmp_path / "index.db"))
+
+    stats = {}
+    yielded = {directory: sorted(entry["name"] for entry in entries) for directory, entries in index.iter_refresh(str(library), stats=stats)}
+    assert yielded == {
+        str(library): [],
+        str(library / "Movies"): ["a.mkv", "b.mp4"],
+        str(library / "Movies" / "Extras"): ["trailer.mkv"],
+        str(library / "Music"): ["song.mp3"],
+    }
+    assert stats == {"files": 4, "dirs_listed": 4, "dirs_reused": 0, "dirs_removed": 0}
+    assert index.last_scanned(str(library)) is not None
+    assert sorted(f["name"] for f in index.query(str(library))) == ["a.mkv", "b.mp4", "song.mp3", "trailer.mkv"]
+
+    # 증분 스캔: 바뀐 디렉토리만 다시 읽고, include_reused면 나머지는 인덱스에서 읽어 생성
+    (library / "Music" / "new.flac").write_bytes(b"x")
+    stats = {}
+    incremental = dict(index.iter_refresh(str(library), incremental=True, include_reused=True, stats=stats))
+    assert sorted(f["name"] for f in incremental[str(library / "Music")]) == ["new.flac", "song.mp3"]
+    assert [f["name"] for f in incremental[str(library / "Movies" / "Extras")]] == ["trailer.mkv"]
+    assert stats == {"files": 5, "dirs_listed": 1, "dirs_reused": 3, "dirs_removed": 0}
+
+
+def test_iter_refresh_stopped_early_keeps_directories_already_read(tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    _make_library(library)
+    index = MediaIndex(str(tmp_path / "index.db"))
+    walk = index.iter_refresh(str(library))
+    first_dirs = [next(walk)[0], next(walk)[0]]
+    walk.close()
+    # 끝까지 돌지 않았으므로 스캔 시각은 남기지 않지만, 읽은 디렉토리의 결과는 인덱스에 기록됨
+    assert index.last_scanned(str(library)) is None
+    stored = {os.path.dirname(f["path"]) for f in index.query(str(library))}
+    assert stored == {d for d in first_dirs if d != str(library)}
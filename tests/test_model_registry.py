@@ -0,0 +1,62 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import threading
+import time
+from backend.services.model_registry import ModelRegistry
+
+MB = 1024 * 1024
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+    def transcribe(self, audio, **kwargs):
+        return {"text": f"{self.name}:{audio}", "kwargs": kwargs}
+
+
+def _registry(budget_mb, sizes, loads):
+    def loader(name, device, dtype):
+        loads.append((name, device, dtype))
+        time.sleep(0.02)
+        return FakeModel(name)
+    return ModelRegistry(budget_mb, loader=loader, size_estimator=lambda name, model, dtype: sizes[name] * MB)
+
+
+def test_registry_reuses_models_and_loads_once_under_concurrency():
+    loads = []
+    registry = _registry(1000, {"base": 100, "tiny": 50}, loads)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("base", "cpu"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loads == [("base", "cpu", "float32")]
+    assert all(model is results[0] for model in results)
+
+    # device/dtype가 다르면 별도 모델
+    registry.get("base", "cpu", "float16")
+    assert len(loads) == 2
+    assert registry.transcribe("base", "a.wav", device="cpu", language="en")["kwargs"] == {"language": "en", "fp16": False}
+    assert len(loads) == 2
+
+
+def test_registry_evicts_least_recently_used_but_not_models_in_use():
+    loads = []
+    registry = _registry(250, {"base": 100, "tiny": 50, "small": 150}, loads)
+    registry.get("base", "cpu")
+    registry.get("tiny", "cpu")
+    registry.get("base", "cpu")  # base가 최근 사용
+
+    registry.get("small", "cpu")  # 300MB > 250MB → tiny 해제
+    assert {m["name"] for m in registry.stats()["models"]} == {"base", "small"}
+    assert registry.evictions == 1
+
+    with registry.use("base", "cpu"):
+        registry.get("tiny", "cpu")  # base는 사용 중이라 small이 해제됨
+        assert {m["name"] for m in registry.stats()["models"]} == {"base", "tiny"}
+    assert registry.stats()["total_mb"] <= 250
+
+    registry.warm_up(["small"], "cpu")
+    assert registry.stats()["models"][-1]["name"] == "small"
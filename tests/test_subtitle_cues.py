@@ -0,0 +1,63 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
+import numpy as np
+import pysrt
+from backend.services.subtitle_cues import CueStore
+
+SAMPLE_SRT = (
+    "\ufeff1\r\n00:00:01,000 --> 00:00:02,500\r\n첫 번째 줄\r\n둘째 줄\r\n\r\n"
+    "3\r\n00:00:10,000 --> 00:00:12,000\r\nthird\r\n\r\n"
+    "2\r\n00:00:03,000 --> 00:00:11,000\r\nlong overlap\r\n"
+)
+
+
+def test_parse_handles_bom_crlf_multiline_and_unsorted_cues():
+    cues = CueStore.from_srt(SAMPLE_SRT)
+    assert len(cues) == 3
+    assert cues.starts.dtype == np.int32 and cues.starts.tolist() == [1000, 3000, 10000]
+    assert cues.ends.tolist() == [2500, 11000, 12000]
+    assert [cues.text(i) for i in range(3)] == ["첫 번째 줄\n둘째 줄", "long overlap", "third"]
+
+
+def test_window_finds_cues_overlapping_range_including_long_earlier_cue():
+    cues = CueStore.from_srt(SAMPLE_SRT)
+    # 3초에 시작한 긴 자막은 10.5초 구간과도 겹침 (끝 시각 누적 최댓값으로 찾음)
+    assert cues.window(10.5, 10.8).tolist() == [1, 2]
+    assert cues.window(2.5, 3.0).tolist() == []
+    assert cues.text_in(0, 3.5) == "첫 번째 줄 둘째 줄 long overlap"
+
+
+def test_shift_set_times_and_save_round_trip_through_pysrt(tmp_path):
+    cues = CueStore.from_srt(SAMPLE_SRT)
+    cues.shift(-1.5)
+    assert cues.starts.tolist() == [0, 1500, 8500] and cues.ends.tolist() == [1000, 9500, 10500]
+    # 재타이밍으로 순서가 바뀌면 텍스트와 함께 다시 정렬
+    cues.set_times(np.array([20.0, 5.0, 7.0]), np.array([21.0, 6.0, 8.0]))
+    assert [cues.text(i) for i in range(3)] == ["long overlap", "third", "첫 번째 줄\n둘째 줄"]
+    path = str(tmp_path / "out.srt")
+    cues.save_srt(path)
+    saved = pysrt.open(path, encoding='utf-8')
+    assert [(s.index, s.start.ordinal, s.end.ordinal, s.text) for s in saved] == [
+        (1, 5000, 6000, "long overlap"), (2, 7000, 8000, "third"), (3, 20000, 21000, "첫 번째 줄\n둘째 줄"),
+    ]
+
+
+def test_large_srt_parses_and_queries_quickly():
+    count = 20000
+    starts = np.arange(count) * 3000
+    content = ''.join(
+        f"{i + 1}\n{pysrt.SubRipTime.from_ordinal(int(s))} --> {pysrt.SubRipTime.from_ordinal(int(s) + 2000)}\nline {i}\n\n"
+        for i, s in enumerate(starts)
+    )
+    began = time.perf_counter()
+    cues = CueStore.from_srt(content)
+    parsed = time.perf_counter() - began
+    assert len(cues) == count and cues.starts.tolist() == starts.tolist()
+
+    began = time.perf_counter()
+    for k in range(2000):
+        cues.window(k * 30.0, k * 30.0 + 10.0)
+    queried = time.perf_counter() - began
+    assert cues.text_in(30.0, 35.5) == "line 10 line 11"
+    assert parsed < 1.0 and queried < 0.5
@@ -0,0 +1,135 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import pysrt
+from backend.services import subtitle_io
+from backend.services.file_scanner import SUBTITLE_EXTENSIONS, convert_and_save_subtitle
+from backend.services.subtitle_io import (
+    detect_encoding, load_subtitle, save_subtitle, convert_subtitle, cues_from_segments, parse_vtt, parse_smi, parse_ass,
+)
+
+SMI = """<SAMI>
+<HEAD><TITLE>test</TITLE>
+<STYLE TYPE="text/css"><!--
+.KRCC { Name: 한국어; lang: ko-KR; }
+.ENCC { Name: English; lang: en-US; }
+--></STYLE></HEAD>
+<BODY>
+<SYNC Start=1000><P Class=KRCC>안녕하세요<br>반갑습니다
+<SYNC Start=1000><P Class=ENCC>Hello
+<SYNC Start=2500><P Class=KRCC>&nbsp;
+<SYNC Start=4000><P Class=KRCC><font color="#ffff00">노란</font> &amp; 글자
+<SYNC Start=6000><P Class=KRCC>마지막
+</BODY>
+</SAMI>
+"""
+
+ASS = """[Script Info]
+Title: test
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize
+Style: Default,Arial,20
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+Comment: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,주석
+Dialogue: 0,0:00:03.50,0:00:05.00,Default,,0,0,0,,{\\i1}second{\\i0}, with comma
+Dialogue: 0,0:00:01.00,0:00:02.25,Default,,0,0,0,,first\\Nline two
+"""
+
+VTT = """WEBVTT
+
+NOTE 주석은 무시
+
+intro
+00:01.000 --> 00:02.500 align:center
+<v Roger>Hi <i>there</i>
+
+01:00:00.000 --> 01:00:01.000
+<c.yellow>late</c>
+"""
+
+
+def _cue_list(cues):
+    return [(int(s), int(e), cues.text(i)) for i, (s, e) in enumerate(zip(cues.starts, cues.ends))]
+
+
+def test_every_scanned_subtitle_extension_has_a_parser_and_writer():
+    assert set(subtitle_io.PARSERS) == SUBTITLE_EXTENSIONS == set(subtitle_io.FORMATTERS)
+
+
+def test_parse_smi_picks_first_language_and_ends_cues_at_next_sync():
+    assert _cue_list(parse_smi(SMI)) == [
+        (1000, 2500, "안녕하세요\n반갑습니다"), (4000, 6000, "노란 & 글자"), (6000, 10000, "마지막"),
+    ]
+    assert _cue_list(parse_smi(SMI, language_class="ENCC")) == [(1000, 5000, "Hello")]
+
+
+def test_parse_ass_follows_format_line_and_strips_override_tags():
+    assert _cue_list(parse_ass(ASS)) == [(1000, 2250, "first\nline two"), (3500, 5000, "second, with comma")]
+
+
+def test_parse_vtt_accepts_short_timestamps_and_keeps_basic_tags():
+    assert _cue_list(parse_vtt(VTT)) == [(1000, 2500, "Hi <i>there</i>"), (3600000, 3601000, "late")]
+
+
+def test_detects_cp949_korean_and_utf8_bom(tmp_path):
+    korean = "1\r\n00:00:01,000 --> 00:00:02,000\r\n한국어 자막\r\n"
+    (tmp_path / "euc.srt").write_bytes(korean.encode("cp949"))
+    (tmp_path / "bom.srt").write_bytes(korean.encode("utf-8-sig"))
+    assert detect_encoding(korean.encode("cp949")) == "cp949"
+    assert detect_encoding(korean.encode("utf-8")) == "utf-8"
+    assert _cue_list(load_subtitle(str(tmp_path / "euc.srt"))) == [(1000, 2000, "한국어 자막")]
+    assert _cue_list(load_subtitle(str(tmp_path / "bom.srt"))) == [(1000, 2000, "한국어 자막")]
+
+
+def test_round_trip_through_every_format(tmp_path):
+    cues = cues_from_segments([
+        {"start": 0.5, "end": 1.75, "text": " 첫 줄"},
+        {"start": 2.0, "end": 3.0, "text": "two\nlines"},
+        {"start": 3600.25, "end": 3602.0, "text": "<i>late</i>"},
+    ])
+    expected = _cue_list(cues)
+    for ext in SUBTITLE_EXTENSIONS:
+        path = str(tmp_path / f"out{ext}")
+        save_subtitle(cues, path)
+        assert _cue_list(load_subtitle(path)) == expected, ext
+    # 저장한 SRT는 pysrt로도 그대로 읽힘
+    saved = pysrt.open(str(tmp_path / "out.srt"), encoding="utf-8")
+    assert [(s.start.ordinal, s.end.ordinal, s.text) for s in saved] == expected
+
+
+def test_convert_and_save_subtitle_runs_in_process(tmp_path, monkeypatch):
+    (tmp_path / "movie.smi").write_bytes(SMI.encode("cp949"))
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("ffmpeg를 실행하면 안 됨")
+    monkeypatch.setattr("backend.services.file_scanner.subprocess.run", no_subprocess)
+
+    result = convert_and_save_subtitle(str(tmp_path / "movie.smi"), str(tmp_path / "movie.srt"))
+    assert result == {"success": True, "output_path": str(tmp_path / "movie.srt"), "error": None}
+    assert [s.text for s in pysrt.open(str(tmp_path / "movie.srt"), encoding="utf-8")] == ["안녕하세요\n반갑습니다", "노란 & 글자", "마지막"]
+    assert convert_subtitle(str(tmp_path / "movie.srt"), str(tmp_path / "movie.ass")) == 3
+    assert np.array_equal(load_subtitle(str(tmp_path / "movie.ass")).starts, [1000, 4000, 6000])
+
+
+def test_blank_cues_are_dropped_the_same_way_in_every_format(tmp_path):
+    segments = [{"start": 1.0, "end": 2.0, "text": "말"}, {"start": 2.0, "end": 3.0, "text": "  "}, {"start": 3.0, "end": 4.0, "text": "end"}]
+    cues = cues_from_segments(segments)
+    assert len(cues) == 2
+    srt = "1\n00:00:01,000 --> 00:00:02,000\n말\n\n2\n00:00:02,000 --> 00:00:03,000\n\n3\n00:00:03,000 --> 00:00:04,000\nend\n"
+    vtt = "WEBVTT\n\n00:01.000 --> 00:02.000\n말\n\n00:02.000 --> 00:03.000\n<c></c>\n\n00:03.000 --> 00:04.000\nend\n"
+    assert _cue_list(subtitle_io.parse_srt(srt)) == _cue_list(parse_vtt(vtt)) == _cue_list(cues)
+    for ext in SUBTITLE_EXTENSIONS:
+        save_subtitle(cues, str(tmp_path / f"out{ext}"))
+        assert len(load_subtitle(str(tmp_path / f"out{ext}"))) == 2, ext
+
+
+def test_times_past_99_hours_keep_every_hour_digit(tmp_path):
+    late = 100 * 3600000 + 5
+    assert subtitle_io.format_srt_times(np.array([late, 5025])) == ["100:00:00,005", "00:00:05,025"]
+    cues = cues_from_segments([{"start": late / 1000, "end": late / 1000 + 1, "text": "long"}])
+    for ext in (".srt", ".vtt"):
+        save_subtitle(cues, str(tmp_path / f"late{ext}"))
+        assert load_subtitle(str(tmp_path / f"late{ext}")).starts.tolist() == [late], ext
@@ -0,0 +1,81 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import numpy as np
+import pysrt
+from backend.services import sync_checker
+from backend.services.sync_batch import SyncBatchRunner, find_sync_pairs
+from backend.services.sync_checker import ENVELOPE_RESOLUTION, interval_envelope
+from backend.services.subtitle_cues import CueStore
+from backend.services.subtitle_io import save_subtitle
+from backend.services.transcription_pool import TranscriptionPool
+
+
+class FakeConnectionManager:
+    def __init__(self):
+        self.messages = []
+
+    async def send_personal_message(self, message, client_id):
+        self.messages.append((client_id, message))
+
+
+def _cues(seed, seconds=1800, count=350):
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(1.0, 4.0, count)
+    starts = np.cumsum(rng.exponential(seconds / count - 2.5, count) + 0.1 + np.concatenate(([0.0], durations[:-1])))
+    return starts, starts + durations
+
+
+def _write_srt(path, starts, ends):
+    pysrt.SubRipFile(items=[
+        pysrt.SubRipItem(i + 1, start=pysrt.SubRipTime.from_ordinal(int(s * 1000)), end=pysrt.SubRipTime.from_ordinal(int(e * 1000)), text=f"line {i}")
+        for i, (s, e) in enumerate(zip(starts, ends))
+    ]).save(str(path), encoding='utf-8')
+
+
+def test_batch_scores_every_subtitle_format_pair_in_a_season_folder(tmp_path, monkeypatch):
+    season = tmp_path / "Show" / "Season 1"
+    season.mkdir(parents=True)
+    # 에피소드별 (실제 대사 위치를 만든 시드, 자막을 만든 시드, 자막 대비 대사 위치 차이)
+    episodes = {"ep1": (1, 1, 0.0), "ep2": (2, 2, 3.0), "ep3": (3, 30, 0.0), "ep4": (4, 4, 0.0)}
+    speech = {}
+    for name, (speech_seed, subtitle_seed, shift) in episodes.items():
+        (season / f"{name}.mkv").write_bytes(b"media")
+        starts, ends = _cues(speech_seed)
+        speech[str(season / f"{name}.mkv")] = interval_envelope(starts + shift, ends + shift, int(1900 / ENVELOPE_RESOLUTION))
+        if name == "ep4":
+            # SRT가 아닌 자막도 변환 없이 검사 (CP949 SAMI)
+            starts, ends = _cues(subtitle_seed)
+            cues = CueStore(np.rint(starts * 1000), np.rint(ends * 1000), (f"line {i}" for i in range(len(starts))))
+            save_subtitle(cues, str(season / f"{name}.smi"), encoding="cp949")
+            continue
+        subtitle_name = f"{name}.en.srt" if name == "ep2" else f"{name}.srt"
+        _write_srt(season / subtitle_name, *_cues(subtitle_seed))
+    (season / "ep5.mkv").write_bytes(b"media")  # 자막 없음
+    (season / "ep5.txt").write_text("notes")  # 자막이 아닌 파일은 무시
+
+    pairs = find_sync_pairs(str(tmp_path / "Show"))
+    assert [(os.path.basename(m), os.path.basename(s)) for m, s in pairs] == [
+        ("ep1.mkv", "ep1.srt"), ("ep2.mkv", "ep2.en.srt"), ("ep3.mkv", "ep3.srt"), ("ep4.mkv", "ep4.smi"),
+    ]
+
+    monkeypatch.setattr(sync_checker, "speech_envelope", lambda media_path: speech[media_path])
+    runner = SyncBatchRunner(TranscriptionPool(workers=0, threads_per_worker=1))
+    connections = FakeConnectionManager()
+
+    async def main():
+        batch_id = runner.start(connections, "c1", pairs)
+        await runner.batches[batch_id]
+        return batch_id
+
+    batch_id = asyncio.run(main())
+    messages = [message for _, message in connections.messages]
+    assert messages[0] == {"type": "sync_batch_start", "batch_id": batch_id, "total": 4}
+    results = {os.path.basename(m["media_path"]): m for m in messages if m["type"] == "sync_result"}
+    assert results["ep1.mkv"]["status"] == "synced" and results["ep1.mkv"]["max_shift"] < 0.5
+    assert results["ep2.mkv"]["status"] == "shifted" and abs(results["ep2.mkv"]["offset"] - 3.0) < 0.1
+    assert results["ep3.mkv"]["status"] == "unmatched"
+    assert results["ep4.mkv"]["status"] == "synced" and results["ep4.mkv"]["subtitle_path"].endswith("ep4.smi")
+    assert all(m["batch_id"] == batch_id for m in results.values())
+    assert messages[-1] == {"type": "sync_batch_complete", "batch_id": batch_id, "total": 4, "synced": 2, "shifted": 1, "unmatched": 1}
+    assert runner.batches == {}
@@ -0,0 +1,128 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
+import numpy as np
+import pysrt
+from backend.services import sync_checker
+from backend.services.sync_checker import (
+    ENVELOPE_RESOLUTION, estimate_offset, interval_envelope, fit_time_map, apply_time_map, advanced_sync_and_save,
+)
+
+
+def _film_cues(seconds=2 * 3600, count=1500, seed=0):
+    """영화 한 편 분량의 자막 구간 (1~4초 길이, 겹치지 않음)"""
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(1.0, 4.0, count)
+    gaps = rng.exponential(seconds / count - 2.5, count) + 0.1
+    starts = np.cumsum(gaps + np.concatenate(([0.0], durations[:-1])))
+    return starts, starts + durations
+
+
+def _speech_for(starts, ends, ratio, offset, seconds, seed=1):
+    """자막과 같은 대사가 ratio/offset만큼 어긋난 발화 포락선 (일부 대사 누락, 자막 없는 소리·경계 오차 포함)"""
+    rng = np.random.default_rng(seed)
+    keep = rng.random(len(starts)) > 0.15
+    jitter = rng.normal(0, 0.15, (2, keep.sum()))
+    noise_starts = rng.uniform(0, seconds, 200)
+    speech_starts = np.concatenate((starts[keep] * ratio + offset + jitter[0], noise_starts))
+    speech_ends = np.concatenate((ends[keep] * ratio + offset + jitter[1], noise_starts + rng.uniform(0.5, 3, 200)))
+    return interval_envelope(speech_starts, speech_ends, int(seconds / ENVELOPE_RESOLUTION))
+
+
+def test_interval_envelope_marks_covered_bins():
+    envelope = interval_envelope(np.array([0.25, 0.5, 2.0]), np.array([0.45, 0.85, 9.0]), 10, resolution=0.1)
+    assert envelope.tolist() == [0, 0, 1, 1, 1, 1, 1, 1, 1, 0]
+
+
+def test_estimate_offset_finds_shift_and_framerate_on_whole_film():
+    seconds = 2 * 3600
+    starts, ends = _film_cues(seconds)
+    speech = _speech_for(starts, ends, 1.0, 7.3, seconds)
+    began = time.perf_counter()
+    estimate = estimate_offset(speech, starts, ends)
+    elapsed = time.perf_counter() - began
+    assert abs(estimate['offset'] - 7.3) < 0.1 and estimate['ratio'] == 1.0
+    assert estimate['score'] > 0.5 and estimate['aligned_score'] < 0.1
+    assert elapsed < 1.0
+
+    # 23.976fps 자막을 25fps 영상에 맞추는 경우: 비율 후보 중 올바른 것을 고름
+    ratio = 23.976 / 25
+    speech = _speech_for(starts, ends, ratio, -2.0, seconds)
+    estimate = estimate_offset(speech, starts, ends)
+    assert estimate['ratio'] == ratio and abs(estimate['offset'] + 2.0) < 0.2
+
+
+def test_unrelated_subtitle_scores_low():
+    seconds = 3600
+    starts, ends = _film_cues(seconds, count=700, seed=2)
+    other_starts, other_ends = _film_cues(seconds, count=700, seed=3)
+    speech = _speech_for(other_starts, other_ends, 1.0, 0.0, seconds)
+    assert estimate_offset(speech, starts, ends)['score'] < sync_checker.SYNC_MIN_SCORE
+
+
+def _speech_for_map(time_map, starts, ends, seconds, seed=1):
+    """자막 시각을 time_map으로 옮긴 위치에 대사가 있는 발화 포락선 (누락·잡음·경계 오차 포함)"""
+    rng = np.random.default_rng(seed)
+    keep = rng.random(len(starts)) > 0.15
+    jitter = rng.normal(0, 0.15, (2, keep.sum()))
+    noise_starts = rng.uniform(0, seconds, 200)
+    mapped_starts = time_map(starts[keep])
+    speech_starts = np.concatenate((mapped_starts + jitter[0], noise_starts))
+    speech_ends = np.concatenate((mapped_starts + (ends[keep] - starts[keep]) * 1.04 + jitter[1], noise_starts + rng.uniform(0.5, 3, 200)))
+    return interval_envelope(speech_starts, speech_ends, int(seconds / ENVELOPE_RESOLUTION))
+
+
+def test_time_map_finds_splices_in_a_different_cut():
+    # 23.976fps 자막을 25fps 영상에: 3000초(자막 기준)에 12.5초 장면이 추가되고, 5000초에 30초가 잘린 편집본
+    ratio = 25 / 23.976
+    def true_map(t):
+        return t * ratio + 2.0 + np.where(t >= 3000, 12.5, 0.0) + np.where(t >= 5000, -30.0, 0.0)
+    starts, ends = _film_cues()
+    speech = _speech_for_map(true_map, starts, ends, seconds=7800)
+
+    began = time.perf_counter()
+    segments = fit_time_map(speech, starts, ends)
+    new_starts, _ = apply_time_map(starts, ends, segments)
+    elapsed = time.perf_counter() - began
+
+    assert len(segments) == 3
+    assert [round(segment['offset'] - 2.0, 1) for segment in segments] == [0.0, 12.5, -17.5]
+    assert all(segment['ratio'] == round(ratio, 7) for segment in segments)
+    # 경계는 편집점 직후의 자막 (편집점 바로 옆 자막 하나는 양쪽 사상 모두 다른 대사와 겹칠 수 있음)
+    for segment, splice in zip(segments[1:], (3000, 5000)):
+        after = starts[starts >= splice]
+        assert starts[starts < splice].max() < segment['start'] <= after[1]
+    assert segments[2]['end'] is None
+    assert all(segment['residual_rms'] < 0.1 and segment['anchors'] > 50 for segment in segments)
+    errors = np.abs(new_starts - true_map(starts))
+    assert np.percentile(errors, 99) < 0.1 and np.sum(errors > 1.0) <= 2
+    assert elapsed < 2.0
+
+
+def test_time_map_follows_drift_that_is_not_a_framerate_ratio():
+    starts, ends = _film_cues()
+    speech = _speech_for_map(lambda t: t * 1.0007 - 1.5, starts, ends, seconds=7300)
+    (segment,) = fit_time_map(speech, starts, ends)
+    assert abs(segment['ratio'] - 1.0007) < 2e-5 and abs(segment['offset'] + 1.5) < 0.1
+    assert segment['residual_max'] < 0.3
+
+
+def test_advanced_sync_shifts_every_cue_and_saves(tmp_path, monkeypatch):
+    seconds = 1800
+    starts, ends = _film_cues(seconds, count=350, seed=4)
+    speech = _speech_for(starts, ends, 1.0, 4.2, seconds)
+    subs = pysrt.SubRipFile(items=[
+        pysrt.SubRipItem(i + 1, start=pysrt.SubRipTime.from_ordinal(int(s * 1000)), end=pysrt.SubRipTime.from_ordinal(int(e * 1000)), text=f"line {i}")
+        for i, (s, e) in enumerate(zip(starts, ends))
+    ])
+    subtitle_path = str(tmp_path / "download.srt")
+    subs.save(subtitle_path, encoding='utf-8')
+    monkeypatch.setattr(sync_checker, "speech_envelope", lambda media_path: speech)
+    monkeypatch.setattr(sync_checker.media_index, "update_paths", lambda paths: None)
+
+    result = advanced_sync_and_save(str(tmp_path / "movie.mkv"), subtitle_path)
+    assert result['success'] and not result['sync'] and abs(result['avg_offset'] - 4.2) < 0.1
+    assert result['save_path'] == str(tmp_path / "movie.srt")
+    saved = pysrt.open(result['save_path'], encoding='utf-8')
+    shifts = np.array([new.start.ordinal - old.start.ordinal for new, old in zip(saved, subs)])
+    assert len(saved) == len(subs) and np.all(shifts == shifts[0]) and abs(shifts[0] - 4200) <= 100
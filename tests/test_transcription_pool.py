@@ -0,0 +1,159 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import time
+import numpy as np
+import pytest
+from backend.services.audio_cache import SAMPLE_RATE
+from backend.services.transcription_pool import TranscriptionPool
+from backend.services.whisper_engines import TranscriptionPaused
+
+
+def test_pool_runs_files_concurrently_in_worker_processes(fake_whisper):
+    pool = TranscriptionPool(workers=2, threads_per_worker=1)
+    events = []
+
+    async def main():
+        pool.start()
+        # 워커 기동(spawn) 시간을 측정에서 제외
+        await pool.transcribe("warmup-a", "tiny")
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            pool.transcribe(f"file{i}_4w", "tiny", {"language": "ko"}, on_event=events.append) for i in range(4)
+        ])
+        elapsed = time.perf_counter() - start
+        with pytest.raises(RuntimeError, match="bad audio"):
+            await pool.transcribe("fail.wav", "tiny")
+        return results, elapsed
+
+    try:
+        results, elapsed = asyncio.run(main())
+    finally:
+        pool.stop()
+    assert [r["segments"][0]["text"] for r in results] == [f" file{i}_4w 0" for i in range(4)]
+    assert all(r["language"] == "ko" for r in results)
+    assert len({r["pid"] for r in results}) == 2 and os.getpid() not in {r["pid"] for r in results}
+    assert elapsed < 4 * 0.4  # 워커 2개가 동시에 처리
+    # 윈도우마다 진행 이벤트 (파일 4개 × 윈도우 4개)
+    assert len(events) == 16 and {e["duration"] for e in events} == {120.0}
+    assert sorted(e["processed"] for e in events)[-4:] == [120.0] * 4
+
+
+def test_pool_cancels_pending_job_without_blocking_others(fake_whisper):
+    pool = TranscriptionPool(workers=1, threads_per_worker=1)
+
+    async def main():
+        first = asyncio.ensure_future(pool.transcribe("a_4w", "tiny"))
+        second = asyncio.ensure_future(pool.transcribe("b_4w", "tiny"))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["pending"] == 1
+        second.cancel()
+        result = await first
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        return result, pool.stats()
+
+    try:
+        result, stats = asyncio.run(main())
+    finally:
+        pool.stop()
+    assert result["segments"][0]["text"] == " a_4w 0"
+    assert stats["pending"] == 0 and stats["workers"][0]["file_path"] is None
+
+
+def test_running_job_stops_at_next_window_when_cancelled(fake_whisper):
+    pool = TranscriptionPool(workers=1, threads_per_worker=1)
+    events = []
+
+    async def main():
+        started = asyncio.Event()
+        def on_event(event):
+            events.append(event)
+            started.set()
+        long_job = asyncio.ensure_future(pool.transcribe("movie_50w", "tiny", on_event=on_event))
+        await started.wait()
+        cancelled_at = time.perf_counter()
+        long_job.cancel()
+        # 취소 후 같은 워커가 바로 다음 작업을 받는다 (50개 윈도우를 끝까지 디코딩하지 않음)
+        result = await pool.transcribe("next_1w", "tiny")
+        return result, time.perf_counter() - cancelled_at
+
+    try:
+        result, latency = asyncio.run(main())
+    finally:
+        pool.stop()
+    assert result["segments"][0]["text"] == " next_1w 0"
+    assert latency < 1.0
+    assert len(events) < 10
+
+
+def test_paused_job_frees_worker_and_resumes_from_checkpoint(fake_whisper, tmp_path):
+    # 300초 오디오 = 30초 윈도우 10개
+    pcm_path = str(tmp_path / "movie.s16")
+    np.zeros(300 * SAMPLE_RATE, dtype=np.int16).tofile(pcm_path)
+    pool = TranscriptionPool(workers=1, threads_per_worker=1)
+    first_events, resumed_events = [], []
+
+    async def main():
+        started = asyncio.Event()
+        def on_event(event):
+            first_events.append(event)
+            if len(first_events) >= 3:
+                started.set()
+        job = asyncio.ensure_future(pool.transcribe("movie.mkv", "tiny", on_event=on_event, clip=(pcm_path, 0.0, None), tag="job-1"))
+        await started.wait()
+        pool.pause("job-1")
+        with pytest.raises(TranscriptionPaused) as paused:
+            await job
+        # 멈춘 워커는 바로 다른 작업을 받음
+        other = await pool.transcribe("next_1w", "tiny")
+        # clear_pause 전에는 같은 tag의 새 작업도 바로 일시정지
+        with pytest.raises(TranscriptionPaused):
+            await pool.transcribe("movie.mkv", "tiny", clip=(pcm_path, 0.0, None), tag="job-1")
+        pool.clear_pause("job-1")
+        result = await pool.transcribe("movie.mkv", "tiny", {"language": "en"}, on_event=resumed_events.append,
+                                       clip=(pcm_path, 0.0, None), tag="job-1", resume_from=paused.value.checkpoint)
+        return paused.value.checkpoint, other, result
+
+    try:
+        checkpoint, other, result = asyncio.run(main())
+    finally:
+        pool.stop()
+    done = len(checkpoint["segments"])
+    assert 3 <= done < 10 and checkpoint["offset"] == done * 30.0
+    assert other["segments"][0]["text"] == " next_1w 0"
+    # 앞 구간은 다시 디코딩하지 않고, 나머지만 변환해 원본 시간축으로 이어 붙임
+    assert [s["start"] for s in result["segments"]] == [i * 30.0 for i in range(10)]
+    assert [s["id"] for s in result["segments"]] == list(range(10))
+    assert result["segments"][done]["text"] == f" array{(300 - done * 30) * SAMPLE_RATE} 0"
+    assert len(resumed_events) == 10 - done
+    assert resumed_events[0]["processed"] == (done + 1) * 30.0 and resumed_events[-1]["duration"] == 300.0
+
+
+def test_cancelling_one_job_keeps_sibling_running_and_records_latency(fake_whisper):
+    pool = TranscriptionPool(workers=2, threads_per_worker=1)
+
+    async def main():
+        started = asyncio.Event()
+        target = asyncio.ensure_future(pool.transcribe("target_50w", "tiny", on_event=lambda event: started.set(), tag="job-1"))
+        sibling = asyncio.ensure_future(pool.transcribe("sibling_8w", "tiny", tag="job-2"))
+        await started.wait()
+        target.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await target
+        result = await sibling
+        # 리스너가 취소된 작업의 워커 반환을 기록할 때까지 대기
+        for _ in range(100):
+            if pool.stats()["cancel_latency"]["count"]:
+                break
+            await asyncio.sleep(0.02)
+        return result, pool.stats()
+
+    try:
+        result, stats = asyncio.run(main())
+    finally:
+        pool.stop()
+    assert [s["text"] for s in result["segments"]] == [f" sibling_8w {i}" for i in range(8)]
+    latency = stats["cancel_latency"]
+    assert latency["count"] == 1 and 0 <= latency["last"] < 1.0
+    assert all(w["file_path"] is None for w in stats["workers"])
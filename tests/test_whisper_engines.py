@@ -0,0 +1,80 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from types import SimpleNamespace
+import pytest
+from backend.services.model_registry import ModelRegistry
+from backend.services.whisper_engines import FasterWhisperEngine, TranscriptionCancelled, WhisperEngine, get_engine
+
+
+class FakeCT2Model:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        segments = (
+            SimpleNamespace(id=i + 1, seek=0, start=float(i), end=i + 0.5, text=f" line {i}", tokens=[1, 2],
+                            temperature=0.0, avg_logprob=-0.2, compression_ratio=1.1, no_speech_prob=0.01, words=None)
+            for i in range(2)
+        )
+        return segments, SimpleNamespace(language="en", duration=2.0)
+
+
+def test_faster_whisper_output_matches_openai_format():
+    model = FakeCT2Model()
+    engine = FasterWhisperEngine()
+    engine.models = ModelRegistry(1000, loader=lambda name, device, dtype: model)
+
+    result = engine.transcribe("base", "clip.wav", verbose=False, fp16=False, language="en", logprob_threshold=-1.0)
+    # openai-whisper 전용 옵션은 버리고 이름이 다른 옵션은 변환
+    assert model.calls == [{"language": "en", "log_prob_threshold": -1.0}]
+    assert result["language"] == "en"
+    assert result["text"] == " line 0 line 1"
+    assert result["segments"][0] == {
+        "id": 0, "seek": 0, "start": 0.0, "end": 0.5, "text": " line 0", "tokens": [1, 2], "temperature": 0.0,
+        "avg_logprob": -0.2, "compression_ratio": 1.1, "no_speech_prob": 0.01,
+    }
+
+
+def test_unknown_engine_is_rejected():
+    assert get_engine("openai").name == "openai"
+    with pytest.raises(ValueError):
+        get_engine("bogus")
+
+
+def test_engine_without_language_detection_cannot_be_created():
+    class TranscribeOnly(WhisperEngine):
+        name = "partial"
+
+        def transcribe(self, model_size, audio, on_progress=None, **options):
+            return {"text": "", "segments": [], "language": "en"}
+
+    with pytest.raises(TypeError):
+        TranscribeOnly()
+
+
+def test_openai_engine_reports_each_decoding_window(fake_whisper, capfd):
+    engine = get_engine("openai")
+    windows = []
+    result = engine.transcribe("tiny", "clip_3w", on_progress=lambda done, total, new: windows.append((done, total, [s["id"] for s in new])), verbose=False)
+    assert windows == [(30.0, 90.0, [0]), (60.0, 90.0, [1]), (90.0, 90.0, [2])]
+    assert len(result["segments"]) == 3
+    # 윈도우를 세는 진행 막대는 서버 로그(stderr)에 그리지 않음
+    assert capfd.readouterr().err == ""
+
+    # 콜백에서 취소하면 남은 윈도우를 디코딩하지 않는다
+    def cancel_after_first(done, total, new):
+        if done >= 30.0:
+            raise TranscriptionCancelled("취소")
+    with pytest.raises(TranscriptionCancelled):
+        engine.transcribe("tiny", "clip_50w", on_progress=cancel_after_first, verbose=False)
+
+
+def test_openai_engine_falls_back_when_whisper_loop_changed(fake_whisper, caplog):
+    # 지역 변수 이름이 바뀐 whisper: 훅을 걸지 않고 변환이 끝난 뒤 한 번에 진행 상황을 알림
+    transcribe_py = fake_whisper / "transcribe.py"
+    transcribe_py.write_text(transcribe_py.read_text().replace("all_segments", "decoded_segments"))
+    windows = []
+    result = get_engine("openai").transcribe("tiny", "clip_3w", on_progress=lambda done, total, new: windows.append((done, total, len(new))), verbose=False)
+    assert windows == [(90.0, 90.0, 3)] and len(result["segments"]) == 3
+    assert "디코딩 루프 구조" in caplog.text